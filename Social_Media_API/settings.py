@@ -44,7 +44,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "debug_toolbar",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework.authtoken",
     "drf_spectacular",
@@ -53,16 +53,25 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "social_media.metrics.PrometheusMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "social_media.db_router.ReplicaRoutingMiddleware",
 ]
 
+# The toolbar middleware is sync-only, so it runs the async views nested
+# in async_to_sync
+DEBUG_TOOLBAR = DEBUG and os.environ.get("DEBUG_TOOLBAR") == "1"
+
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(2, "debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "Social_Media_API.urls"
 
 TEMPLATES = [
@@ -97,6 +106,44 @@ DATABASES = {
     }
 }
 
+# Read replicas of the primary, as comma-separated hosts (ex. replica1,replica2)
+for index, host in enumerate(
+    filter(None, os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(","))
+):
+    DATABASES[f"replica{index + 1}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["social_media.db_router.ReplicaRouter"]
+# Seconds a user reads from the primary after a write
+REPLICA_PIN_SECONDS = 10
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+if os.environ.get("CACHE_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["CACHE_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+RESPONSE_CACHE_TIMEOUT = 60
+RESPONSE_CACHE_STALE_TIMEOUT = 24 * 60 * 60
+RESPONSE_CACHE_LOCK_TIMEOUT = 10
+RESPONSE_CACHE_VERSION_TIMEOUT = 30 * 24 * 60 * 60
+RELATIONSHIPS_CACHE_TIMEOUT = 15 * 60
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -137,6 +184,12 @@ MEDIA_URL = "/media/"
 
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Bounding boxes of the resized copies made of every uploaded image
+IMAGE_VARIANTS = {
+    "thumbnail": (150, 150),
+    "medium": (800, 800),
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -146,20 +199,70 @@ AUTH_USER_MODEL = "users.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        "users.authentication.SignedTokenAuthentication",
         "rest_framework.authentication.TokenAuthentication",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "social_media.pagination.KeysetPagination",
+    "PAGE_SIZE": 20,
 }
 
+ACCESS_TOKEN_LIFETIME = 5 * 60
+REFRESH_TOKEN_LIFETIME = 7 * 24 * 60 * 60
+
 CELERY_BROKER_URL = os.environ["CELERY_BROKER_URL"]
 CELERY_RESULT_BACKEND = os.environ["CELERY_RESULT_BACKEND"]
 CELERY_TIMEZONE = "Europe/Kyiv"
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
+CELERY_METRICS_PORT = int(os.environ.get("CELERY_METRICS_PORT", 0))
+# Client networks allowed to scrape /metrics, besides staff sessions
+METRICS_ALLOWED_NETWORKS = os.environ.get(
+    "METRICS_ALLOWED_NETWORKS", "127.0.0.0/8,::1/128"
+).split(",")
+# CPU-bound and forking, so kept off the eventlet worker of the other tasks
+CELERY_TASK_ROUTES = {
+    "social_media.tasks.refresh_follow_suggestions": {"queue": "suggestions"},
+}
+CELERY_BEAT_SCHEDULE = {
+    "publish-scheduled-posts": {
+        "task": "social_media.tasks.publish_scheduled_posts",
+        "schedule": 30.0,
+    },
+    "update-trending-scores": {
+        "task": "social_media.tasks.update_trending_scores",
+        "schedule": 60.0,
+    },
+    "refresh-follow-suggestions": {
+        "task": "social_media.tasks.refresh_follow_suggestions",
+        "schedule": 60 * 60.0,
+    },
+}
+
+BATCH_MAX_OPERATIONS = 500
+
+TIMELINE_MAX_LENGTH = 800
+# Timelines are trimmed back to TIMELINE_MAX_LENGTH once they have grown
+# this many entries past it
+TIMELINE_TRIM_SLACK = 100
+TIMELINE_FANOUT_LIMIT = 10_000
+TIMELINE_FANOUT_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 2000
+SCHEDULED_POSTS_BATCH_SIZE = 500
+TRENDING_HALF_LIFE = 6 * 60 * 60
+TRENDING_MIN_SCORE = 0.05
+TRENDING_SETTLE_TIME = 30
+TRENDING_BATCH_SIZE = 5000
+SUGGESTIONS_LIMIT = 20
+SUGGESTIONS_MAX_FOLLOWED = 200
+SUGGESTIONS_WORKERS = 4
+SUGGESTIONS_CHUNK_SIZE = 1000
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "Social Media API",
     "DESCRIPTION": "Social Media API to follow, like, comment, create posts and profiles",
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
+    # The async read views are listed with their format suffixes too
+    "PREPROCESSING_HOOKS": ["drf_spectacular.hooks.preprocess_exclude_path_format"],
 }
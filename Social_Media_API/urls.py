@@ -1,15 +1,17 @@
 from django.conf.urls.static import static
 from django.contrib import admin
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
 from Social_Media_API import settings
+from social_media.metrics import metrics_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/users/", include("users.urls", namespace="users")),
     path("api/social-media/", include("social_media.urls", namespace="social_media")),
-    path("__debug__/", include("debug_toolbar.urls")),
+    path("metrics", metrics_view, name="metrics"),
     path("api/doc/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/doc/swagger/",
@@ -17,3 +19,8 @@ urlpatterns = [
         name="swagger",
     ),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# runserver serves the static files itself in DEBUG, uvicorn does not
+urlpatterns += staticfiles_urlpatterns()
+
+if settings.DEBUG_TOOLBAR:
+    urlpatterns.append(path("__debug__/", include("debug_toolbar.urls")))
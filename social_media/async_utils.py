@@ -0,0 +1,2 @@
+async def alist(queryset):
+    return [row async for row in queryset]
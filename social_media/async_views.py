@@ -0,0 +1,329 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.views.decorators.csrf import csrf_exempt
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from social_media import conditional, metrics, relationships, response_cache, timeline
+from social_media.async_utils import alist
+from social_media.models import Profile, Follow, Post, Like, Commentary
+from social_media.pagination import KeysetPagination
+from social_media.permissions import IsOwnerOrReadOnly
+from social_media.serializers import (
+    ProfileDetailSerializer,
+    FollowProfileSerializer,
+    FollowingSerializer,
+    PostListSerializer,
+    CommentaryListSerializer,
+    PostDetailSerializer,
+    ValuesSerializer,
+)
+from social_media.views import ProfileViewSet, PostViewSet
+
+WRITE_ACTIONS = {"put": "update", "patch": "partial_update", "delete": "destroy"}
+
+
+async def aget_or_404(queryset, **kwargs):
+    instance = await queryset.filter(**kwargs).afirst()
+
+    if instance is None:
+        raise Http404
+    return instance
+
+
+def prefetched(instance, **related):
+    """Hand rows fetched separately to the serializer as prefetched relations"""
+    instance._prefetched_objects_cache = related
+    return instance
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView with coroutine handlers.
+    Authentication and permissions run in the request's sync thread, the
+    handler itself runs on the event loop with the async ORM.
+    """
+
+    permission_classes = (IsAuthenticated, IsOwnerOrReadOnly)
+    pagination_class = KeysetPagination
+    # Viewset and actions, by method, whose routes the view serves: its
+    # requests share their metrics labels
+    viewset = None
+    actions = {}
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            handler = getattr(
+                self, request.method.lower(), self.http_method_not_allowed
+            )
+            response = handler(request, *args, **kwargs)
+
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+def reads_async(async_view, sync_view):
+    """Serve GET requests with the async view and writes with the viewset"""
+
+    async def view(request, *args, **kwargs):
+        if request.method in ("GET", "HEAD"):
+            return await async_view(request, *args, **kwargs)
+        return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+    view.view_class = async_view.cls
+    view.actions = {**async_view.cls.actions, **sync_view.actions}
+    return csrf_exempt(view)
+
+
+class CachedDetailView(AsyncAPIView):
+    """
+    Detail served from the response cache, with an ETag made of the cache
+    version, which writes bump, and the number of related rows.
+    A poll compares it against the counter columns of the object, so an
+    unchanged object costs one primary key lookup and no serialization.
+    Media URLs are made absolute with the request that fills the cache.
+    """
+
+    kind = None
+    model = None
+    # counter column -> payload list it counts
+    counters = {}
+
+    def etag(self, version, counts):
+        return conditional.make_etag(self.kind, self.kwargs["pk"], version, counts)
+
+    async def current_etag(self, pk):
+        version = await response_cache.aget_version(self.kind, pk)
+        counts = await (
+            self.model.objects.filter(pk=pk).values_list(*self.counters).afirst()
+        )
+        return counts and self.etag(version, counts)
+
+    async def get(self, request, pk, format=None):
+        if conditional.is_conditional(request):
+            etag = await self.current_etag(pk)
+
+            if etag and (response := conditional.not_modified(request, etag)):
+                return response
+
+        version, payload = await response_cache.aget_versioned(
+            self.kind, pk, self.serialize
+        )
+        counts = tuple(len(payload[key]) for key in self.counters.values())
+        return conditional.with_validators(
+            Response(payload), self.etag(version, counts)
+        )
+
+
+class ProfileDetailView(CachedDetailView):
+    kind = "profile"
+    model = Profile
+    viewset = ProfileViewSet
+    actions = {"get": "retrieve"}
+    counters = {"followers_count": "followers"}
+
+    async def serialize(self):
+        pk = self.kwargs["pk"]
+        profile = await aget_or_404(Profile.objects.select_related("user"), pk=pk)
+        self.check_object_permissions(self.request, profile)
+        follows = await alist(
+            Follow.objects.filter(following_id=pk).select_related("user")
+        )
+
+        with metrics.observe_serialization(self.request, ProfileDetailSerializer):
+            return ProfileDetailSerializer(
+                prefetched(profile, follows=follows), context={"request": self.request}
+            ).data
+
+
+class ProfileFollowersView(AsyncAPIView):
+    viewset = ProfileViewSet
+    actions = {"get": "followers"}
+
+    @extend_schema(responses=FollowProfileSerializer(many=True))
+    async def get(self, request, pk, format=None):
+        """Followers of the profile owner, newest first"""
+        paginator = self.pagination_class()
+        serializer = ValuesSerializer(FollowProfileSerializer, {"request": request})
+        followers = serializer.values(
+            Follow.objects.filter(
+                following__user__in=Profile.objects.filter(pk=pk).values("user")
+            ),
+            *paginator.get_keys(self),
+        )
+
+        profile = await aget_or_404(Profile.objects.all(), pk=pk)
+        self.check_object_permissions(request, profile)
+        page = await paginator.apaginate_queryset(followers, request)
+
+        return paginator.get_paginated_response(serializer.serialize(page))
+
+
+class ProfileFollowingView(AsyncAPIView):
+    viewset = ProfileViewSet
+    actions = {"get": "following"}
+
+    @extend_schema(responses=FollowingSerializer(many=True))
+    async def get(self, request, pk, format=None):
+        """Profiles the profile owner follows, newest first"""
+        paginator = self.pagination_class()
+        serializer = ValuesSerializer(FollowingSerializer, {"request": request})
+        following_profiles = serializer.values(
+            Follow.objects.filter(
+                user__in=Profile.objects.filter(pk=pk).values("user")
+            ),
+            *paginator.get_keys(self),
+        )
+
+        profile = await aget_or_404(Profile.objects.all(), pk=pk)
+        self.check_object_permissions(request, profile)
+        page = await paginator.apaginate_queryset(following_profiles, request)
+
+        return paginator.get_paginated_response(serializer.serialize(page))
+
+
+class PostDetailView(CachedDetailView):
+    kind = "post"
+    model = Post
+    viewset = PostViewSet
+    actions = {"get": "retrieve"}
+    counters = {"likes_count": "likes", "comments_count": "commentaries"}
+
+    async def serialize(self):
+        pk = self.kwargs["pk"]
+        post = await aget_or_404(Post.objects.all(), pk=pk)
+        self.check_object_permissions(self.request, post)
+        likes = await alist(Like.objects.filter(post_id=pk))
+        commentaries = await alist(Commentary.objects.filter(post_id=pk))
+        post = prefetched(post, post_likes=likes, post_commentary=commentaries)
+
+        with metrics.observe_serialization(self.request, PostDetailSerializer):
+            return PostDetailSerializer(post, context={"request": self.request}).data
+
+
+class PostCommentsView(AsyncAPIView):
+    viewset = PostViewSet
+    actions = {"get": "comments"}
+
+    @extend_schema(responses=CommentaryListSerializer(many=True))
+    async def get(self, request, pk, format=None):
+        """Comments of the post, newest first"""
+        paginator = self.pagination_class()
+        serializer = ValuesSerializer(CommentaryListSerializer, {"request": request})
+        comments = serializer.values(
+            Commentary.objects.filter(post_id=pk), *paginator.get_keys(self)
+        )
+
+        page = await paginator.apaginate_queryset(comments, request)
+        # Only an empty page needs the post, to tell a missing one from a quiet one
+        if not page and not await Post.objects.filter(pk=pk).aexists():
+            raise Http404
+        return paginator.get_paginated_response(serializer.serialize(page))
+
+
+class MyPostsView(AsyncAPIView):
+    viewset = PostViewSet
+    actions = {"get": "my_posts"}
+
+    @extend_schema(responses=PostListSerializer(many=True))
+    async def get(self, request, format=None):
+        """Posts of the current user, newest first"""
+        paginator = self.pagination_class()
+        posts = Post.objects.filter(user=request.user)
+
+        viewer = await relationships.Relationships.aload(request.user.id)
+        page = await paginator.apaginate_queryset(
+            ValuesSerializer(PostListSerializer).values(
+                posts, *paginator.get_keys(self)
+            ),
+            request,
+        )
+        serializer = ValuesSerializer(
+            PostListSerializer, {"request": request, "relationships": viewer}
+        )
+        return paginator.get_paginated_response(serializer.serialize(page))
+
+
+class FollowingPostsView(AsyncAPIView):
+    viewset = PostViewSet
+    actions = {"get": "following_posts"}
+
+    @extend_schema(responses=PostListSerializer(many=True))
+    async def get(self, request, format=None):
+        """Posts of the followed profiles, newest first"""
+        paginator = self.pagination_class()
+        polled = paginator.cursor_query_param not in request.query_params
+
+        if polled and conditional.is_conditional(request):
+            post_ids = await timeline.afirst_page_ids(
+                request.user, paginator.get_page_size(request)
+            )
+            versions = await relationships.aversions(request.user.id)
+            response = conditional.not_modified(
+                request, await self.etag(post_ids, versions)
+            )
+            if response:
+                return response
+
+        posts = ValuesSerializer(PostListSerializer).values(Post.objects.all())
+
+        viewer = await relationships.Relationships.aload(request.user.id)
+        page = await paginator.apaginate_fetch(
+            lambda position, limit: timeline.aread_timeline(
+                request.user, limit, before=position, posts=posts
+            ),
+            request,
+        )
+        serializer = ValuesSerializer(
+            PostListSerializer, {"request": request, "relationships": viewer}
+        )
+        response = paginator.get_paginated_response(serializer.serialize(page))
+
+        if polled:
+            post_ids = [row["id"] for row in page]
+            conditional.with_validators(
+                response, await self.etag(post_ids, viewer.versions)
+            )
+        return response
+
+    async def etag(self, post_ids, versions):
+        """
+        The first page is validated by the ids and cache versions of its
+        posts, which edits, likes and comments bump, and the versions of the
+        viewer's likes and follows. There is no Last-Modified: a date would
+        miss edits and posts created within the same second.
+        """
+        return conditional.make_etag(
+            "timeline",
+            self.request.user.pk,
+            post_ids,
+            await response_cache.aget_versions("post", post_ids),
+            versions,
+        )
+
+
+profile_detail = reads_async(
+    ProfileDetailView.as_view(),
+    ProfileViewSet.as_view(WRITE_ACTIONS, basename="profile", detail=True),
+)
+post_detail = reads_async(
+    PostDetailView.as_view(),
+    PostViewSet.as_view(WRITE_ACTIONS, basename="post", detail=True),
+)
@@ -0,0 +1,157 @@
+from django.db import transaction
+from django.db.models import F
+
+from social_media import relationships, response_cache, timeline, toggles
+from social_media.models import Profile, Follow, Post, Like
+from social_media.tasks import (
+    backfill_timeline,
+    backfill_follower_timelines,
+    remove_from_timeline,
+)
+
+STATUSES = {
+    "like": "liked",
+    "unlike": "unliked",
+    "follow": "followed",
+    "unfollow": "unfollowed",
+}
+
+
+def _replay(operations, key, errors, state, enable):
+    """
+    Replay the operations in order on a copy of the current state.
+    Return the per-item results and the final state to persist.
+    """
+    state = set(state)
+    results = []
+
+    for operation in operations:
+        target = operation[key]
+
+        if target in errors:
+            status = errors[target]
+        elif (operation["action"] == enable) == (target in state):
+            status = "unchanged"
+        else:
+            status = STATUSES[operation["action"]]
+            state.symmetric_difference_update({target})
+        results.append({key: target, "status": status})
+    return results, state
+
+
+def _write(model, user, field, existing, final):
+    """
+    Insert and delete the rows of the user to go from the `existing`
+    targets, locked by the caller, to the `final` ones. Return the targets
+    whose row this call actually inserted and deleted: a conflicting row
+    inserted concurrently is left to the request that inserted it.
+    """
+    rows = [model(user=user, **{field: target}) for target in final - existing]
+    model.objects.bulk_create(rows, ignore_conflicts=True)
+
+    inserted = set()
+    if rows:
+        stamps = {getattr(row, field): row.created_at for row in rows}
+        inserted = {
+            target
+            for target, created_at in model.objects.filter(
+                user=user, **{f"{field}__in": stamps}
+            ).values_list(field, "created_at")
+            if stamps[target] == created_at
+        }
+
+    deleted = existing - final
+    if deleted:
+        model.objects.filter(user=user, **{f"{field}__in": deleted}).delete()
+    return inserted, deleted
+
+
+def _shift(queryset, field, inserted, deleted):
+    """Move the counter column of the targets by the rows written"""
+    if inserted:
+        queryset.filter(id__in=inserted).update(**{field: F(field) + 1})
+    if deleted:
+        queryset.filter(id__in=deleted).update(**{field: toggles.shifted(field, -1)})
+
+
+def apply_likes(user, operations):
+    """Apply like/unlike operations with one bulk insert and one bulk delete"""
+    post_ids = {operation["post"] for operation in operations}
+
+    with transaction.atomic():
+        found = set(Post.objects.filter(id__in=post_ids).values_list("id", flat=True))
+        liked = set(
+            Like.objects.select_for_update()
+            .filter(user=user, post_id__in=found)
+            .values_list("post_id", flat=True)
+        )
+
+        results, final = _replay(
+            operations,
+            "post",
+            dict.fromkeys(post_ids - found, "not_found"),
+            liked,
+            "like",
+        )
+        created, deleted = _write(Like, user, "post_id", liked, final)
+
+        _shift(Post.objects.all(), "likes_count", created, deleted)
+        for post_id in created | deleted:
+            response_cache.bump_version("post", post_id)
+        if created or deleted:
+            relationships.invalidate(relationships.LIKES, user.id)
+    return results
+
+
+def apply_follows(user, operations):
+    """Apply follow/unfollow operations with one bulk insert and one bulk delete"""
+    profile_ids = {operation["profile"] for operation in operations}
+
+    with transaction.atomic():
+        profiles = Profile.objects.filter(id__in=profile_ids).values_list(
+            "id", "user_id", "followers_count"
+        )
+        authors, followers_counts = {}, {}
+        for profile_id, author_id, followers_count in profiles:
+            authors[profile_id] = author_id
+            followers_counts[profile_id] = followers_count
+        followed = set(
+            Follow.objects.select_for_update()
+            .filter(user=user, following_id__in=authors)
+            .values_list("following_id", flat=True)
+        )
+
+        errors = dict.fromkeys(profile_ids - set(authors), "not_found")
+        errors.update(
+            (profile_id, "cannot_follow_self")
+            for profile_id, author_id in authors.items()
+            if author_id == user.id
+        )
+        results, final = _replay(operations, "profile", errors, followed, "follow")
+        created, deleted = _write(Follow, user, "following_id", followed, final)
+
+        _shift(Profile.objects.all(), "followers_count", created, deleted)
+        for profile_id in created | deleted:
+            response_cache.bump_version("profile", profile_id)
+        if created or deleted:
+            relationships.invalidate(relationships.FOLLOWS, user.id)
+
+        for author_id in {authors[profile_id] for profile_id in created}:
+            transaction.on_commit(
+                lambda author_id=author_id: backfill_timeline.delay(user.id, author_id)
+            )
+        for author_id in {authors[profile_id] for profile_id in deleted}:
+            transaction.on_commit(
+                lambda author_id=author_id: remove_from_timeline.delay(
+                    user.id, author_id
+                )
+            )
+        for author_id in {
+            authors[profile_id]
+            for profile_id in deleted
+            if timeline.crosses_fanout_limit(followers_counts[profile_id], 1)
+        }:
+            transaction.on_commit(
+                lambda author_id=author_id: backfill_follower_timelines.delay(author_id)
+            )
+    return results
@@ -0,0 +1,29 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+
+
+def make_etag(*parts):
+    """Weak ETag over the validator values; the payload is never hashed"""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def is_conditional(request):
+    return bool(request.META.get("HTTP_IF_NONE_MATCH"))
+
+
+def not_modified(request, etag):
+    """
+    The 304 response when the client's If-None-Match still matches the
+    ETag, None when the full response is needed.
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        return None
+    return with_validators(response, etag)
+
+
+def with_validators(response, etag):
+    response["ETag"] = etag
+    return response
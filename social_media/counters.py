@@ -0,0 +1,51 @@
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from social_media import response_cache
+from social_media.models import Profile, Follow, Post, Like, Commentary
+
+
+def _count(queryset, field):
+    counts = (
+        queryset.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def actual_counts(model):
+    """Expressions computing the true value of every counter column of the model"""
+    if model is Post:
+        return {
+            "likes_count": _count(Like.objects.all(), "post"),
+            "comments_count": _count(Commentary.objects.all(), "post"),
+        }
+    if model is Profile:
+        return {"followers_count": _count(Follow.objects.all(), "following")}
+    raise ValueError(f"{model.__name__} has no counter columns")
+
+
+def recount(queryset):
+    """Repair the counter columns of the queryset rows, return repaired rows"""
+    counts = actual_counts(queryset.model)
+    drifted = Q()
+
+    for field in counts:
+        drifted |= ~Q(**{field: F(f"actual_{field}")})
+
+    ids = list(
+        queryset.annotate(
+            **{f"actual_{field}": expression for field, expression in counts.items()}
+        )
+        .filter(drifted)
+        .values_list("id", flat=True)
+    )
+    if ids:
+        queryset.model.objects.filter(id__in=ids).update(**counts)
+    # Cached payloads and ETags of the repaired rows are stale as well
+    for pk in ids:
+        response_cache.bump_version(queryset.model._meta.model_name, pk)
+    return len(ids)
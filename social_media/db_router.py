@@ -0,0 +1,116 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.permissions import SAFE_METHODS
+
+# Authentication reads stay on the primary: a token or session created a
+# moment ago may not have reached the replicas yet
+PRIMARY_APPS = {"authtoken", "sessions", "users"}
+
+_route = ContextVar("replica_route", default=None)
+
+
+def _pin_key(user_id):
+    return f"replica-pin:{user_id}"
+
+
+def pin(user_id):
+    """Send the reads of the user to the primary until their writes replicate"""
+    cache.set(_pin_key(user_id), True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+class Route:
+    """Replica the reads of one request or job go to, if any"""
+
+    def __init__(self, request=None):
+        self.request = request
+        self.replica = random.choice(settings.DATABASE_REPLICAS)
+        self.pinned = {}
+
+    def alias(self):
+        if self.request is None:
+            return self.replica
+        if self.request.method not in SAFE_METHODS:
+            return None
+
+        user = getattr(self.request, "user", None)
+        if user is None or not user.is_authenticated:
+            return self.replica
+        if user.pk not in self.pinned:
+            self.pinned[user.pk] = bool(cache.get(_pin_key(user.pk)))
+        return None if self.pinned[user.pk] else self.replica
+
+
+@contextmanager
+def _routed(route):
+    token = _route.set(route)
+    try:
+        yield
+    finally:
+        _route.reset(token)
+
+
+def replica_reads():
+    """Read from a replica in a job that can live with replication lag"""
+    return _routed(Route() if settings.DATABASE_REPLICAS else None)
+
+
+def primary_reads():
+    """Read from the primary, e.g. to compute a payload that gets cached"""
+    return _routed(None)
+
+
+class ReplicaRouter:
+    """
+    Writes go to the primary. Reads outside transactions go to a replica
+    inside replica_reads() and in safe-method requests, unless the user
+    wrote within the last REPLICA_PIN_SECONDS.
+    """
+
+    def db_for_read(self, model, **hints):
+        route = _route.get()
+
+        if route is None or model._meta.app_label in PRIMARY_APPS:
+            return "default"
+        # Reads inside a transaction must see its writes
+        if connections["default"].in_atomic_block:
+            return "default"
+        return route.alias() or "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """Route the reads of each request and pin users after a successful write"""
+
+    def process_request(self, request):
+        if settings.DATABASE_REPLICAS:
+            _route.set(Route(request))
+
+    def process_response(self, request, response):
+        # Set rather than reset: async requests run the two hooks in
+        # different threads, whose context changes asgiref copies back
+        _route.set(None)
+
+        user = getattr(request, "user", None)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and user is not None
+            and user.is_authenticated
+        ):
+            pin(user.pk)
+        return response
@@ -0,0 +1,115 @@
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+from social_media.models import Follow, Post, Like
+
+
+def encode_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot export {type(value).__name__}")
+
+
+def encode(row):
+    return (json.dumps(row, default=encode_value) + "\n").encode()
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Lets clients ask for NDJSON; error responses are rendered as one line"""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b"" if data is None else encode(data)
+
+
+def lines(queryset, convert):
+    for row in queryset.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        yield encode(convert(row))
+
+
+async def alines(queryset, convert):
+    async for row in queryset.aiterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        yield encode(convert(row))
+
+
+def stream(request, queryset, filename, convert=dict):
+    """
+    Stream the rows of a values() queryset as NDJSON, one chunk of rows in
+    memory at a time. ASGI servers get an async iterator, since they would
+    read a sync one into a list first.
+    """
+    if isinstance(request._request, ASGIRequest):
+        content = alines(queryset, convert)
+    else:
+        content = lines(queryset, convert)
+
+    response = StreamingHttpResponse(content, content_type="application/x-ndjson")
+    response["Content-Disposition"] = f'attachment; filename="{filename}.ndjson"'
+    return response
+
+
+def posts(request, user):
+    def convert(row):
+        if row["image"]:
+            url = default_storage.url(row["image"])
+            row["image"] = request.build_absolute_uri(url)
+        else:
+            row["image"] = None
+        return row
+
+    queryset = (
+        Post.objects.filter(user=user)
+        .order_by("id")
+        .values(
+            "id",
+            "title",
+            "content",
+            "image",
+            "created_at",
+            "likes_count",
+            "comments_count",
+            owner=F("user__email"),
+        )
+    )
+    return stream(request, queryset, "posts", convert)
+
+
+def likes(request, user):
+    queryset = (
+        Like.objects.filter(user=user)
+        .order_by("id")
+        .values("post_id", "created_at", post_title=F("post__title"))
+    )
+    return stream(request, queryset, "likes")
+
+
+def followers(request, profile):
+    queryset = (
+        Follow.objects.filter(following__user=profile.user)
+        .order_by("id")
+        .values("user__email", "created_at")
+    )
+    return stream(
+        request,
+        queryset,
+        "followers",
+        lambda row: {"user": row["user__email"], "created_at": row["created_at"]},
+    )
+
+
+def following(request, profile):
+    queryset = (
+        Follow.objects.filter(user=profile.user)
+        .order_by("id")
+        .values("created_at", profile=F("following__user__email"))
+    )
+    return stream(request, queryset, "following")
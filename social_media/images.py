@@ -0,0 +1,83 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# Formats that cannot store an alpha channel or a palette
+RGB_ONLY_FORMATS = ("JPEG",)
+
+
+def encode(image, image_format):
+    """Encode the pixels only, so no EXIF, XMP, ICC or text chunk is kept"""
+    if image_format in RGB_ONLY_FORMATS and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, optimize=True)
+    return ContentFile(buffer.getvalue())
+
+
+def process(field_file):
+    """
+    Store a metadata-free copy of the image and its resized variants,
+    each in the original format and as WebP.
+    Return the stripped image name and a variant name -> file name dict.
+    """
+    storage = field_file.storage
+    base, extension = os.path.splitext(field_file.name)
+
+    with field_file.open("rb"), Image.open(field_file) as source:
+        image_format = source.format
+        image = ImageOps.exif_transpose(source)
+        image.info = {}
+
+    stripped = storage.save(field_file.name, encode(image, image_format))
+    variants = {}
+
+    for variant, size in settings.IMAGE_VARIANTS.items():
+        resized = image.copy()
+        resized.thumbnail(size, Image.LANCZOS)
+
+        variants[variant] = storage.save(
+            f"{base}-{variant}{extension}", encode(resized, image_format)
+        )
+        variants[f"{variant}_webp"] = storage.save(
+            f"{base}-{variant}.webp", encode(resized, "WEBP")
+        )
+    return stripped, variants
+
+
+def delete(storage, names):
+    for name in names:
+        storage.delete(name)
+
+
+def stored_names(instance, field_name):
+    """Names of the stored image of a row and of its variants"""
+    field_file = getattr(instance, field_name)
+    variants = list(getattr(instance, f"{field_name}_variants").values())
+    return [field_file.name, *variants] if field_file else variants
+
+
+def process_row(model, pk, field_name, name):
+    """
+    Process the image stored in `field_name` of a row and record the variants.
+    Nothing is recorded if the image was replaced in the meantime.
+    """
+    variants_field = f"{field_name}_variants"
+    current = model.objects.filter(pk=pk, **{field_name: name})
+    instance = current.first()
+
+    if instance is None:
+        return None
+
+    field_file = getattr(instance, field_name)
+    stripped, variants = process(field_file)
+
+    if not current.update(**{field_name: stripped, variants_field: variants}):
+        delete(field_file.storage, [stripped, *variants.values()])
+        return None
+    delete(field_file.storage, [name, *getattr(instance, variants_field).values()])
+    return variants
@@ -0,0 +1,105 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from social_media.models import Profile, Follow, Post
+from social_media.serializers import (
+    ValuesSerializer,
+    ProfileListSerializer,
+    FollowProfileSerializer,
+    FollowingSerializer,
+    PostListSerializer,
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """Django command to compare list serializers with their values() fast path"""
+
+    help = (
+        "Serialize N posts, profiles and follows with the model serializers "
+        "and with ValuesSerializer, fetch included. The rows are created in a "
+        "transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            action="append",
+            help="Number of rows per serializer (repeatable, default 1000 and 10000)",
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        sizes = options["rows"] or [1000, 10_000]
+        self.repeat = options["repeat"]
+
+        try:
+            with transaction.atomic():
+                self.seed(max(sizes))
+                for rows in sizes:
+                    self.benchmark(rows)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, rows):
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(email=f"benchmark-{i}@example.com") for i in range(rows)
+        )
+        profiles = Profile.objects.bulk_create(
+            Profile(
+                user=user,
+                bio="Bio",
+                profile_picture=f"uploads/{i}.jpg",
+                profile_picture_variants={"thumbnail": f"uploads/{i}-thumbnail.jpg"},
+            )
+            for i, user in enumerate(users)
+        )
+        Post.objects.bulk_create(
+            Post(user=user, title="Title", content="Text") for user in users
+        )
+        Follow.objects.bulk_create(
+            Follow(user=user, following=profiles[i - 1]) for i, user in enumerate(users)
+        )
+
+    def time(self, serialize):
+        best = None
+
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            data = serialize()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, data
+
+    def benchmark(self, rows):
+        for serializer_class, queryset in (
+            (PostListSerializer, Post.objects.select_related("user")),
+            (ProfileListSerializer, Profile.objects.select_related("user")),
+            (FollowProfileSerializer, Follow.objects.select_related("user")),
+            (FollowingSerializer, Follow.objects.select_related("following__user")),
+        ):
+            queryset = queryset.order_by("id")[:rows]
+            values = ValuesSerializer(serializer_class)
+
+            model_time, expected = self.time(
+                lambda: serializer_class(queryset.all(), many=True).data
+            )
+            values_time, data = self.time(
+                lambda: values.serialize(values.values(queryset))
+            )
+            if data != expected:
+                raise CommandError(f"{serializer_class.__name__} output differs")
+
+            self.stdout.write(
+                f"{serializer_class.__name__:<24} {rows:>7} rows: "
+                f"{model_time * 1000:8.1f} ms -> {values_time * 1000:8.1f} ms "
+                f"({model_time / values_time:.1f}x)"
+            )
@@ -0,0 +1,92 @@
+import random
+import time
+import tracemalloc
+from itertools import accumulate
+
+from django.core.management.base import BaseCommand
+
+from social_media import suggestions
+
+
+class Command(BaseCommand):
+    """Django command to measure the follow suggestion engine on a synthetic graph"""
+
+    help = (
+        "Build a random power-law follow graph in memory, compare the size of "
+        "its CSR buffers with a dict of lists and time the suggestion pass "
+        "for every worker count. The database is not touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--follows-per-user", type=int, default=20)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            action="append",
+            help="Number of worker processes (repeatable, default 1 and 4)",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.options = options
+        users = options["users"]
+
+        started = time.perf_counter()
+        graph = self.build()
+        build_time = time.perf_counter() - started
+
+        tracemalloc.start()
+        self.build()
+        build_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        adjacency = {}
+        for follower, followed in self.edges():
+            adjacency.setdefault(follower, []).append(followed)
+        dict_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del adjacency
+
+        self.stdout.write(
+            f"{users} users, {len(graph.targets)} edges: CSR buffers "
+            f"{graph.nbytes / 2**20:.1f} MiB (build peak {build_peak / 2**20:.1f} "
+            f"MiB, {build_time:.1f} s), dict of lists {dict_size / 2**20:.1f} MiB"
+        )
+
+        for workers in options["workers"] or [1, 4]:
+            started = time.perf_counter()
+            stored = sum(len(chunk) for chunk in suggestions.compute(graph, workers))
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{workers:>3} workers: {stored} users with suggestions "
+                f"in {elapsed:.1f} s ({users / elapsed:,.0f} users/s)"
+            )
+
+    def build(self):
+        users = range(1, self.options["users"] + 1)
+        return suggestions.FollowGraph.build(
+            users, ((user_id, user_id) for user_id in users), self.edges()
+        )
+
+    def edges(self):
+        """
+        Yield (follower id, followed id) pairs grouped by follower and skewed
+        towards popular users, identical on every call
+        """
+        options = self.options
+        rng = random.Random(options["seed"])
+        population = range(1, options["users"] + 1)
+        popularity = list(accumulate(rng.paretovariate(2.0) for _ in population))
+
+        for follower in population:
+            targets = set(
+                rng.choices(
+                    population, cum_weights=popularity, k=options["follows_per_user"]
+                )
+            )
+            targets.discard(follower)
+
+            for followed in sorted(targets):
+                yield follower, followed
@@ -0,0 +1,28 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from social_media import timeline
+
+
+class Command(BaseCommand):
+    """Django command to rebuild home timelines from the follow graph"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="users",
+            help="Rebuild only the timeline of this user id (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by("id").values_list("id", flat=True)
+
+        if options["users"]:
+            users = users.filter(id__in=options["users"])
+
+        for user_id in users.iterator():
+            entries = timeline.rebuild(user_id)
+            self.stdout.write(f"User {user_id}: {entries} timeline entries")
+        self.stdout.write(self.style.SUCCESS("Timelines rebuilt"))
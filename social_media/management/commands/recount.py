@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from social_media import counters
+from social_media.models import Profile, Post
+
+
+class Command(BaseCommand):
+    """Django command to repair drift in denormalized counter columns"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows checked per query",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        for model in (Post, Profile):
+            repaired = 0
+            last_id = 0
+
+            while True:
+                ids = list(
+                    model.objects.filter(id__gt=last_id)
+                    .order_by("id")
+                    .values_list("id", flat=True)[:batch_size]
+                )
+                if not ids:
+                    break
+                repaired += counters.recount(
+                    model.objects.filter(id__gt=last_id, id__lte=ids[-1])
+                )
+                last_id = ids[-1]
+
+            self.stdout.write(f"{model.__name__}: {repaired} rows repaired")
+        self.stdout.write(self.style.SUCCESS("Counters are up to date"))
@@ -0,0 +1,230 @@
+import random
+from array import array
+from itertools import accumulate, islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from social_media import timeline
+from social_media.models import Profile, Follow, Post, Like, Commentary
+
+WORDS = (
+    "news war peace city travel food music sport science art history "
+    "python django weather family friends photo video summer winter "
+    "coffee book movie game team life work study idea story"
+).split()
+
+
+def power_law(rng, mean, alpha, cap):
+    """Integer drawn from a Pareto distribution with the given mean"""
+    value = mean * (alpha - 1) / alpha * rng.paretovariate(alpha)
+    return min(int(value), cap)
+
+
+def sentence(rng, length):
+    return " ".join(rng.choice(WORDS) for _ in range(length)).capitalize()
+
+
+class Command(BaseCommand):
+    """Django command to generate a large, realistic social graph"""
+
+    help = (
+        "Generate users, profiles, posts, likes, comments and follows. "
+        "Follower, post, like and comment counts follow a power law and the "
+        "same seed always produces the same graph."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--posts-per-user", type=float, default=10)
+        parser.add_argument("--follows-per-user", type=float, default=20)
+        parser.add_argument("--likes-per-post", type=float, default=5)
+        parser.add_argument("--comments-per-post", type=float, default=2)
+        parser.add_argument(
+            "--alpha",
+            type=float,
+            default=2.0,
+            help="Pareto shape; lower values give heavier tails (must be > 1)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Number of rows inserted per bulk_create",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--password", default="password")
+        parser.add_argument(
+            "--with-timelines",
+            action="store_true",
+            help="Also build the home timeline of every generated user",
+        )
+
+    def handle(self, *args, **options):
+        if options["alpha"] <= 1:
+            raise CommandError("--alpha must be greater than 1")
+
+        self.options = options
+        self.chunk_size = options["chunk_size"]
+        self.email_prefix = f"seed{options['seed']}-"
+
+        if (
+            get_user_model()
+            .objects.filter(email__startswith=self.email_prefix)
+            .exists()
+        ):
+            raise CommandError(
+                f"Users of seed {options['seed']} already exist, use another --seed"
+            )
+
+        user_ids = self.create_users()
+        popularity = self.popularity(user_ids)
+        in_degree = self.count_followers(user_ids, popularity)
+        profile_ids = self.create_profiles(user_ids, in_degree)
+        self.create_follows(user_ids, profile_ids, popularity)
+        self.create_posts(user_ids)
+
+        if options["with_timelines"]:
+            for user_id in user_ids:
+                timeline.rebuild(user_id)
+            self.stdout.write("Timelines built")
+        self.stdout.write(self.style.SUCCESS("Social graph generated"))
+
+    def bulk_create(self, model, objects):
+        """Insert a stream of objects and yield the saved ones chunk by chunk"""
+        objects = iter(objects)
+
+        while chunk := list(islice(objects, self.chunk_size)):
+            with transaction.atomic():
+                yield model.objects.bulk_create(chunk)
+
+    def insert(self, model, objects):
+        return sum(len(chunk) for chunk in self.bulk_create(model, objects))
+
+    def rng(self, stream):
+        """Independent generator per stream, so every stream can be replayed"""
+        return random.Random(f"{self.options['seed']}-{stream}")
+
+    def create_users(self):
+        password = make_password(self.options["password"])
+        users = (
+            get_user_model()(
+                email=f"{self.email_prefix}{index}@example.com", password=password
+            )
+            for index in range(self.options["users"])
+        )
+        user_ids = array("q")
+
+        for chunk in self.bulk_create(get_user_model(), users):
+            user_ids.extend(user.id for user in chunk)
+        self.stdout.write(f"{len(user_ids)} users created")
+        return user_ids
+
+    def popularity(self, user_ids):
+        """Cumulative power-law weights making a few users attract most follows"""
+        rng = self.rng("popularity")
+        alpha = self.options["alpha"]
+        return list(accumulate(rng.paretovariate(alpha) for _ in user_ids))
+
+    def follow_edges(self, user_ids, popularity):
+        """Yield (follower index, followed index) pairs, identical on every call"""
+        rng = self.rng("follows")
+        population = range(len(user_ids))
+
+        for follower in population:
+            count = power_law(
+                rng,
+                self.options["follows_per_user"],
+                self.options["alpha"],
+                len(user_ids) - 1,
+            )
+            targets = set(rng.choices(population, cum_weights=popularity, k=count))
+            targets.discard(follower)
+
+            for followed in sorted(targets):
+                yield follower, followed
+
+    def count_followers(self, user_ids, popularity):
+        in_degree = array("q", bytes(len(user_ids) * array("q").itemsize))
+
+        for _, followed in self.follow_edges(user_ids, popularity):
+            in_degree[followed] += 1
+        return in_degree
+
+    def create_profiles(self, user_ids, in_degree):
+        rng = self.rng("profiles")
+        profiles = (
+            Profile(
+                user_id=user_id,
+                bio=sentence(rng, rng.randint(3, 12)),
+                followers_count=in_degree[index],
+            )
+            for index, user_id in enumerate(user_ids)
+        )
+        profile_ids = array("q")
+
+        for chunk in self.bulk_create(Profile, profiles):
+            profile_ids.extend(profile.id for profile in chunk)
+        self.stdout.write(f"{len(profile_ids)} profiles created")
+        return profile_ids
+
+    def create_follows(self, user_ids, profile_ids, popularity):
+        follows = (
+            Follow(user_id=user_ids[follower], following_id=profile_ids[followed])
+            for follower, followed in self.follow_edges(user_ids, popularity)
+        )
+        self.stdout.write(f"{self.insert(Follow, follows)} follows created")
+
+    def generate_posts(self, user_ids):
+        rng = self.rng("posts")
+        options = self.options
+
+        for user_id in user_ids:
+            count = power_law(rng, options["posts_per_user"], options["alpha"], 10**6)
+
+            for _ in range(count):
+                yield Post(
+                    user_id=user_id,
+                    title=sentence(rng, rng.randint(2, 8)),
+                    content=sentence(rng, rng.randint(10, 60)),
+                    likes_count=power_law(
+                        rng, options["likes_per_post"], options["alpha"], len(user_ids)
+                    ),
+                    comments_count=power_law(
+                        rng, options["comments_per_post"], options["alpha"], 10**4
+                    ),
+                )
+
+    def create_posts(self, user_ids):
+        """Insert posts with exactly the likes and comments their counters promise"""
+        rng = self.rng("reactions")
+        population = range(len(user_ids))
+        posts = likes = comments = 0
+
+        for chunk in self.bulk_create(Post, self.generate_posts(user_ids)):
+            posts += len(chunk)
+            likes += self.insert(
+                Like,
+                (
+                    Like(user_id=user_ids[index], post_id=post.id)
+                    for post in chunk
+                    for index in rng.sample(population, post.likes_count)
+                ),
+            )
+            comments += self.insert(
+                Commentary,
+                (
+                    Commentary(
+                        user_id=user_ids[rng.choice(population)],
+                        post_id=post.id,
+                        content=sentence(rng, rng.randint(2, 20)),
+                    )
+                    for post in chunk
+                    for _ in range(post.comments_count)
+                ),
+            )
+        self.stdout.write(
+            f"{posts} posts, {likes} likes and {comments} comments created"
+        )
@@ -0,0 +1,211 @@
+import ipaddress
+import time
+from contextlib import ExitStack, contextmanager
+
+from celery.signals import task_failure, task_postrun, task_prerun, worker_ready
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.deprecation import MiddlewareMixin
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Histogram,
+    generate_latest,
+    start_http_server,
+)
+
+LABELS = ("view", "action")
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling a request",
+    LABELS + ("method", "status"),
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Number of database queries per request",
+    LABELS,
+    buckets=QUERY_BUCKETS,
+)
+DB_TIME = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in database queries per request",
+    LABELS,
+)
+RENDERER_TIME = Histogram(
+    "http_response_renderer_duration_seconds",
+    "Time spent by the renderer encoding the serialized data into the body",
+    LABELS,
+)
+SERIALIZATION_TIME = Histogram(
+    "http_response_serialization_duration_seconds",
+    "Time spent by a serializer turning objects or rows into primitives",
+    LABELS + ("serializer",),
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Size of the response body",
+    LABELS,
+    buckets=SIZE_BUCKETS,
+)
+TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Time spent running a Celery task",
+    ("task", "state"),
+)
+TASK_FAILURES = Counter(
+    "celery_task_failures_total",
+    "Number of Celery tasks that raised an exception",
+    ("task",),
+)
+
+
+class QueryStats:
+    """Database execute wrapper counting queries and their duration"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+def view_labels(view_func, method):
+    """
+    (viewset, action) of a resolved view, falling back to the view name.
+    An async view declares the viewset and actions it serves the routes of,
+    so that its requests share their series.
+    """
+    view_class = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", None
+    )
+
+    if view_class is None:
+        return view_func.__name__, ""
+    viewset = getattr(view_class, "viewset", None) or view_class
+    actions = (
+        getattr(view_func, "actions", None)
+        or getattr(view_class, "actions", None)
+        or {}
+    )
+    return viewset.__name__, actions.get(method.lower(), method.lower())
+
+
+@contextmanager
+def observe_serialization(request, serializer_class):
+    """Time the serialization of a response under the labels of its view"""
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        labels = getattr(request, "metrics_labels", None)
+
+        if labels is not None:
+            SERIALIZATION_TIME.labels(*labels, serializer_class.__name__).observe(
+                time.perf_counter() - start
+            )
+
+
+class PrometheusMiddleware(MiddlewareMixin):
+    """
+    Export latency, database and response metrics of every request.
+    Database hooks are installed from process_request, which Django runs in
+    the thread serving the request's ORM calls, so async views are measured
+    as well.
+    """
+
+    def process_request(self, request):
+        request.metrics_labels = ("unresolved", "")
+        request.metrics_queries = QueryStats()
+        request.metrics_hooks = ExitStack()
+        request.metrics_started = time.perf_counter()
+
+        for connection in connections.all():
+            request.metrics_hooks.enter_context(
+                connection.execute_wrapper(request.metrics_queries)
+            )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics_labels = view_labels(view_func, request.method)
+
+    def process_template_response(self, request, response):
+        start = time.perf_counter()
+        labels = request.metrics_labels
+
+        response.add_post_render_callback(
+            lambda rendered: RENDERER_TIME.labels(*labels).observe(
+                time.perf_counter() - start
+            )
+        )
+        return response
+
+    def process_response(self, request, response):
+        request.metrics_hooks.close()
+        labels = request.metrics_labels
+        stats = request.metrics_queries
+
+        REQUEST_LATENCY.labels(*labels, request.method, response.status_code).observe(
+            time.perf_counter() - request.metrics_started
+        )
+        DB_QUERIES.labels(*labels).observe(stats.count)
+        DB_TIME.labels(*labels).observe(stats.duration)
+
+        if not response.streaming:
+            RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+        return response
+
+
+def is_internal(address):
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network.strip(), strict=False)
+        for network in settings.METRICS_ALLOWED_NETWORKS
+        if network.strip()
+    )
+
+
+def metrics_view(request):
+    """Prometheus exposition, for the scraper's network and staff sessions only"""
+    if not (request.user.is_staff or is_internal(request.META.get("REMOTE_ADDR"))):
+        return HttpResponseForbidden()
+    return HttpResponse(generate_latest(), content_type=CONTENT_TYPE_LATEST)
+
+
+@task_prerun.connect
+def task_started(task=None, **kwargs):
+    # Kept on the request of the run, which is dropped with it even if the
+    # task never reaches postrun
+    task.request.metrics_started = time.perf_counter()
+
+
+@task_postrun.connect
+def task_finished(task=None, state=None, **kwargs):
+    start = getattr(task.request, "metrics_started", None)
+
+    if start is not None:
+        TASK_DURATION.labels(task.name, state).observe(time.perf_counter() - start)
+
+
+@task_failure.connect
+def task_failed(sender=None, **kwargs):
+    TASK_FAILURES.labels(sender.name).inc()
+
+
+@worker_ready.connect
+def serve_worker_metrics(**kwargs):
+    if settings.CELERY_METRICS_PORT:
+        start_http_server(settings.CELERY_METRICS_PORT)
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.1 on 2026-10-18 17:49
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_of(model, field):
+    counts = (
+        model.objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def fill_counters(apps, schema_editor):
+    Post = apps.get_model("social_media", "Post")
+    Profile = apps.get_model("social_media", "Profile")
+    Like = apps.get_model("social_media", "Like")
+    Commentary = apps.get_model("social_media", "Commentary")
+    Follow = apps.get_model("social_media", "Follow")
+
+    Post.objects.update(
+        likes_count=count_of(Like, "post"),
+        comments_count=count_of(Commentary, "post"),
+    )
+    Profile.objects.update(followers_count=count_of(Follow, "following"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("social_media", "0008_recent_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comments_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="likes_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="followers_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
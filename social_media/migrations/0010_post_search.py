@@ -0,0 +1,113 @@
+# Generated by Django 5.0.1 on 2026-10-18 17:51
+
+import re
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+POSTGRES_FORWARD = """
+CREATE FUNCTION social_media_post_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.content, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER social_media_post_search_vector_trigger
+BEFORE INSERT OR UPDATE OF title, content ON social_media_post
+FOR EACH ROW EXECUTE FUNCTION social_media_post_search_vector_update();
+
+UPDATE social_media_post SET
+    search_vector =
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B');
+
+CREATE INDEX social_media_post_search_vector_gin
+ON social_media_post USING gin (search_vector);
+"""
+
+POSTGRES_BACKWARD = """
+DROP INDEX IF EXISTS social_media_post_search_vector_gin;
+DROP TRIGGER IF EXISTS social_media_post_search_vector_trigger ON social_media_post;
+DROP FUNCTION IF EXISTS social_media_post_search_vector_update();
+"""
+
+
+def index_posts(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(POSTGRES_FORWARD)
+        return
+
+    Post = apps.get_model("social_media", "Post")
+    PostSearchTerm = apps.get_model("social_media", "PostSearchTerm")
+
+    for post in Post.objects.iterator():
+        weights = {}
+
+        for text, weight in ((post.title, 1.0), (post.content, 0.4)):
+            for term in re.findall(r"\w+", text.lower()):
+                weights[term[:64]] = weights.get(term[:64], 0) + weight
+        PostSearchTerm.objects.bulk_create(
+            PostSearchTerm(post=post, term=term, weight=weight)
+            for term, weight in weights.items()
+        )
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(POSTGRES_BACKWARD)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("social_media", "0009_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.CreateModel(
+            name="PostSearchTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=64)),
+                ("weight", models.FloatField()),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_terms",
+                        to="social_media.post",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["term", "post"], name="post_search_term_idx")
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="postsearchterm",
+            constraint=models.UniqueConstraint(
+                fields=("post", "term"), name="unique_post_search_term"
+            ),
+        ),
+        migrations.RunPython(index_posts, drop_search_trigger),
+    ]
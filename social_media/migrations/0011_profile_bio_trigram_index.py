@@ -0,0 +1,28 @@
+# Generated by Django 5.0.1 on 2026-10-18 18:02
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+def create_bio_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX social_media_profile_bio_trgm ON social_media_profile "
+            "USING gin ((UPPER(bio::text)) gin_trgm_ops)"
+        )
+
+
+def drop_bio_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS social_media_profile_bio_trgm")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("social_media", "0010_post_search"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_bio_trigram_index, drop_bio_trigram_index),
+    ]
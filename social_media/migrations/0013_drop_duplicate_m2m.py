@@ -0,0 +1,169 @@
+# Generated by Django 5.0.1 on 2026-10-18 18:22
+
+from itertools import islice
+
+from django.db import migrations
+from django.db.models import Count, Exists, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 1000
+
+
+def count_of(model, field):
+    counts = (
+        model.objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def through(model, field):
+    return model._meta.get_field(field).remote_field.through
+
+
+def insert(model, objects, key):
+    """Insert in batches, return the `key` values of the inserted rows"""
+    objects = iter(objects)
+    inserted = set()
+
+    while batch := list(islice(objects, BATCH_SIZE)):
+        model.objects.bulk_create(batch)
+        inserted.update(getattr(obj, key) for obj in batch)
+    return inserted
+
+
+def materialize_links(apps, schema_editor):
+    """
+    Links of the join tables normally duplicate a foreign key. Like and
+    follow links that do not are turned into rows of their own before the
+    tables are dropped, as a (user, target) pair is all such a row holds.
+    A comment belongs to the one post of its foreign key, so its links to
+    other posts are stale and are dropped with the table: copying them
+    would make up comments the user never wrote on those posts.
+    """
+    Post = apps.get_model("social_media", "Post")
+    Profile = apps.get_model("social_media", "Profile")
+    Like = apps.get_model("social_media", "Like")
+    Follow = apps.get_model("social_media", "Follow")
+
+    likes = (
+        through(Post, "likes")
+        .objects.exclude(like__post=F("post"))
+        .exclude(
+            Exists(
+                Like.objects.filter(user=OuterRef("like__user"), post=OuterRef("post"))
+            )
+        )
+        .values_list("post_id", "like__user_id")
+        .distinct()
+    )
+    follows = (
+        through(Profile, "followers")
+        .objects.exclude(follow__following=F("profile"))
+        .exclude(follow__user=F("profile__user"))
+        .exclude(
+            Exists(
+                Follow.objects.filter(
+                    user=OuterRef("follow__user"), following=OuterRef("profile")
+                )
+            )
+        )
+        .values_list("profile_id", "follow__user_id")
+        .distinct()
+    )
+
+    posts = insert(
+        Like,
+        (
+            Like(post_id=post_id, user_id=user_id)
+            for post_id, user_id in likes.iterator(chunk_size=BATCH_SIZE)
+        ),
+        "post_id",
+    )
+    profiles = insert(
+        Follow,
+        (
+            Follow(following_id=profile_id, user_id=user_id)
+            for profile_id, user_id in follows.iterator(chunk_size=BATCH_SIZE)
+        ),
+        "following_id",
+    )
+
+    Post.objects.filter(pk__in=posts).update(likes_count=count_of(Like, "post"))
+    Profile.objects.filter(pk__in=profiles).update(
+        followers_count=count_of(Follow, "following")
+    )
+
+
+def restore_links(apps, schema_editor):
+    """Fill the recreated join tables from the foreign keys"""
+    Post = apps.get_model("social_media", "Post")
+    Profile = apps.get_model("social_media", "Profile")
+    Like = apps.get_model("social_media", "Like")
+    Commentary = apps.get_model("social_media", "Commentary")
+    Follow = apps.get_model("social_media", "Follow")
+
+    for model, field, source, target, rows in (
+        (Post, "likes", "post_id", "like_id", Like.objects.values_list("post", "id")),
+        (
+            Post,
+            "commentaries",
+            "post_id",
+            "commentary_id",
+            Commentary.objects.values_list("post", "id"),
+        ),
+        (
+            Profile,
+            "followers",
+            "profile_id",
+            "follow_id",
+            Follow.objects.values_list("following", "id"),
+        ),
+        (
+            Profile,
+            "posts",
+            "profile_id",
+            "post_id",
+            Post.objects.filter(user__profile__isnull=False).values_list(
+                "user__profile", "id"
+            ),
+        ),
+    ):
+        link = through(model, field)
+        insert(
+            link,
+            (
+                link(**{source: owner_id, target: target_id})
+                for owner_id, target_id in rows.iterator(chunk_size=BATCH_SIZE)
+            ),
+            source,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("social_media", "0012_image_variants"),
+    ]
+
+    operations = [
+        migrations.RunPython(materialize_links, restore_links),
+        migrations.RemoveField(
+            model_name="post",
+            name="commentaries",
+        ),
+        migrations.RemoveField(
+            model_name="post",
+            name="likes",
+        ),
+        migrations.RemoveField(
+            model_name="profile",
+            name="followers",
+        ),
+        migrations.RemoveField(
+            model_name="profile",
+            name="posts",
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.0.1 on 2026-10-18 18:32
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_of(model, field):
+    counts = (
+        model.objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def dedupe(model, owner, target):
+    """Keep the oldest row of every (owner, target) pair, return affected targets"""
+    pairs = model.objects.order_by().values(owner, target)
+    duplicated = set(
+        pairs.annotate(total=Count("id"))
+        .filter(total__gt=1)
+        .values_list(target, flat=True)
+    )
+    if duplicated:
+        model.objects.filter(**{f"{target}__in": duplicated}).exclude(
+            id__in=pairs.annotate(keep=Min("id")).values("keep")
+        ).delete()
+    return duplicated
+
+
+def dedupe_likes_and_follows(apps, schema_editor):
+    Post = apps.get_model("social_media", "Post")
+    Profile = apps.get_model("social_media", "Profile")
+    Like = apps.get_model("social_media", "Like")
+    Follow = apps.get_model("social_media", "Follow")
+
+    posts = dedupe(Like, "user", "post")
+    profiles = dedupe(Follow, "user", "following")
+
+    Post.objects.filter(pk__in=posts).update(likes_count=count_of(Like, "post"))
+    Profile.objects.filter(pk__in=profiles).update(
+        followers_count=count_of(Follow, "following")
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("social_media", "0014_scheduled_post"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_likes_and_follows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="follow",
+            constraint=models.UniqueConstraint(
+                fields=("user", "following"), name="unique_follow"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="like",
+            constraint=models.UniqueConstraint(
+                fields=("user", "post"), name="unique_like"
+            ),
+        ),
+    ]
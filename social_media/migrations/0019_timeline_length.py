@@ -0,0 +1,31 @@
+# Generated by Django 5.0.1 on 2026-10-18 20:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("social_media", "0018_follow_suggestions"),
+        ("users", "0002_user_email_trigram_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimelineLength",
+            fields=[
+                (
+                    "owner",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="timeline_length",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("length", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
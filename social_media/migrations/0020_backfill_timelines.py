@@ -0,0 +1,56 @@
+from itertools import groupby, islice
+
+from django.conf import settings
+from django.db import migrations
+
+
+def backfill_timelines(apps, schema_editor):
+    """
+    Fill the home timeline of every user from the follow graph, as
+    `rebuild_timelines` does, so that following_posts is not empty after deploy
+    """
+    Follow = apps.get_model("social_media", "Follow")
+    Post = apps.get_model("social_media", "Post")
+    Profile = apps.get_model("social_media", "Profile")
+    TimelineEntry = apps.get_model("social_media", "TimelineEntry")
+    TimelineLength = apps.get_model("social_media", "TimelineLength")
+
+    # Popular authors are pulled at read time, never fanned out
+    popular = Profile.objects.filter(
+        followers_count__gte=settings.TIMELINE_FANOUT_LIMIT
+    ).values("user_id")
+    follows = (
+        Follow.objects.exclude(following__user_id__in=popular)
+        .order_by("user_id")
+        .values_list("user_id", "following__user_id")
+        .iterator(chunk_size=settings.TIMELINE_FANOUT_BATCH_SIZE)
+    )
+
+    for user_id, rows in groupby(follows, key=lambda row: row[0]):
+        author_ids = {author_id for _, author_id in rows}
+        posts = (
+            Post.objects.filter(user_id__in=author_ids)
+            .order_by("-created_at", "-id")
+            .values_list("id", "created_at")[: settings.TIMELINE_MAX_LENGTH]
+        )
+        entries = (
+            TimelineEntry(owner_id=user_id, post_id=post_id, created_at=created_at)
+            for post_id, created_at in posts
+        )
+        while batch := list(islice(entries, settings.TIMELINE_FANOUT_BATCH_SIZE)):
+            TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+        TimelineLength.objects.update_or_create(
+            owner_id=user_id,
+            defaults={"length": TimelineEntry.objects.filter(owner_id=user_id).count()},
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("social_media", "0019_timeline_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_timelines, migrations.RunPython.noop),
+    ]
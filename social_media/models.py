@@ -1,6 +1,7 @@
 import os
 import uuid
 
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils.text import slugify
 
@@ -26,38 +27,88 @@ class Profile(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     bio = models.TextField(blank=True)
     profile_picture = models.ImageField(null=True, upload_to=profile_image_file_path)
+    profile_picture_variants = models.JSONField(default=dict, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
-    followers = models.ManyToManyField("Follow", related_name="profiles")
-    posts = models.ManyToManyField("Post", related_name="profiles")
+    followers_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="profile_recent_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.user.email
 
 
 class Follow(models.Model):
+    # Both foreign keys lead a composite index below
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="follows",
+        db_index=False,
     )
     following = models.ForeignKey(
         Profile,
         on_delete=models.CASCADE,
         related_name="follows",
+        db_index=False,
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "following"], name="unique_follow"),
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-id"], name="follow_user_recent_idx"
+            ),
+            models.Index(
+                fields=["following", "-created_at", "-id"],
+                name="follow_following_recent_idx",
+            ),
+        ]
+
 
 class Post(models.Model):
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False
+    )
     title = models.CharField(max_length=255, blank=False, null=False)
     content = models.TextField(blank=False, null=False)
     image = models.ImageField(null=True, upload_to=post_image_file_path)
+    image_variants = models.JSONField(default=dict, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
-    likes = models.ManyToManyField("Like", related_name="post_likes")
-    commentaries = models.ManyToManyField(
-        "Commentary", related_name="post_commentaries"
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="post_recent_idx"),
+            models.Index(
+                fields=["user", "-created_at", "-id"], name="post_user_recent_idx"
+            ),
+        ]
+
+
+class PostSearchTerm(models.Model):
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="search_terms"
     )
+    term = models.CharField(max_length=64)
+    weight = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "term"], name="unique_post_search_term"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["term", "post"], name="post_search_term_idx"),
+        ]
 
 
 class Like(models.Model):
@@ -65,10 +116,16 @@ class Like(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="like_users",
+        db_index=False,
     )
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="post_likes")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "post"], name="unique_like"),
+        ]
+
 
 class Commentary(models.Model):
     user = models.ForeignKey(
@@ -77,7 +134,133 @@ class Commentary(models.Model):
         related_name="commentary_users",
     )
     post = models.ForeignKey(
-        Post, on_delete=models.CASCADE, related_name="post_commentary"
+        Post, on_delete=models.CASCADE, related_name="post_commentary", db_index=False
     )
     content = models.TextField(null=False, blank=False)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="commentary_recent_idx"),
+            models.Index(
+                fields=["post", "-created_at", "-id"],
+                name="commentary_post_recent_idx",
+            ),
+        ]
+
+
+class TimelineEntry(models.Model):
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+    )
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="timeline_entries"
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "post"], name="unique_timeline_entry"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["owner", "-created_at", "-post"],
+                name="timeline_owner_recent_idx",
+            ),
+        ]
+
+
+class TimelineLength(models.Model):
+    """
+    Entries added to a timeline since it was last trimmed, an upper bound
+    of its length: duplicates and removed entries are still counted
+    """
+
+    owner = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="timeline_length",
+    )
+    length = models.PositiveIntegerField(default=0)
+
+
+class ScheduledPost(models.Model):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="scheduled_posts",
+    )
+    title = models.CharField(max_length=255)
+    content = models.TextField()
+    publish_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["publish_at", "id"], name="scheduled_post_due_idx"),
+            models.Index(
+                fields=["user", "publish_at", "id"], name="scheduled_post_user_idx"
+            ),
+        ]
+
+
+class TrendingScore(models.Model):
+    post = models.OneToOneField(
+        Post, on_delete=models.CASCADE, primary_key=True, related_name="trending"
+    )
+    # Natural log of the time-decayed engagement, scaled to a fixed epoch
+    score = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-score", "-post"], name="trending_score_idx"),
+        ]
+
+
+class TrendingLike(models.Model):
+    """Liker of a trending post, so that re-liking is not folded in again"""
+
+    # Indexed by the unique constraint, which it leads
+    trending = models.ForeignKey(
+        TrendingScore,
+        on_delete=models.CASCADE,
+        related_name="likers",
+        db_index=False,
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        db_index=False,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["trending", "user"], name="unique_trending_like"
+            ),
+        ]
+
+
+class TrendingState(models.Model):
+    """Last like and commentary folded into the trending scores"""
+
+    last_like_id = models.BigIntegerField(default=0)
+    last_commentary_id = models.BigIntegerField(default=0)
+
+
+class FollowSuggestions(models.Model):
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="follow_suggestions",
+    )
+    # Suggested profile ids, best first
+    profile_ids = models.JSONField(default=list)
+    computed_at = models.DateTimeField()
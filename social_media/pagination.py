@@ -0,0 +1,202 @@
+import base64
+import binascii
+import json
+import math
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on (created_at, id).
+    Every page is a range scan from the last seen key, so deep pages
+    cost the same as the first one.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+    invalid_cursor_message = "Invalid cursor"
+    # Type of the cursor value of each key, by the last field of the key
+    value_types = {
+        "created_at": datetime,
+        "publish_at": datetime,
+        "id": int,
+        "post": int,
+        "rank": float,
+        "score": float,
+    }
+
+    def get_ordering(self, view):
+        return getattr(view, "keyset_ordering", self.ordering)
+
+    def get_keys(self, view):
+        """Columns a row needs for the cursor to be built from it"""
+        return [field.lstrip("-") for field in self.get_ordering(view)]
+
+    def get_page_size(self, request):
+        page_size = api_settings.PAGE_SIZE or self.max_page_size
+
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (binascii.Error, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.keys):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return tuple(map(self.parse_value, self.keys, values))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def encode_value(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+    def parse_value(self, key, value):
+        """Check a cursor value has the type of its key, as a client may forge it"""
+        value_type = self.value_types[key.rsplit("__", 1)[-1]]
+
+        if value_type is datetime:
+            moment = parse_datetime(value) if isinstance(value, str) else None
+            if moment is None:
+                raise ValueError(f"Invalid {key} in cursor")
+            return moment
+        if isinstance(value, bool) or not isinstance(value, (int, value_type)):
+            raise TypeError(f"Invalid {key} in cursor")
+        if value_type is float and not math.isfinite(value):
+            raise ValueError(f"Invalid {key} in cursor")
+        return value_type(value)
+
+    def encode_cursor(self, row):
+        values = [
+            row[key] if isinstance(row, dict) else getattr(row, key)
+            for key in self.keys
+        ]
+        encoded = json.dumps(values, default=self.encode_value)
+        return base64.urlsafe_b64encode(encoded.encode()).decode()
+
+    def after(self, position):
+        """Filter selecting the rows that come after the given key"""
+        condition = Q()
+
+        for index, field in enumerate(self.ordering):
+            lookup = "lt" if field.startswith("-") else "gt"
+            step = Q(**{f"{self.keys[index]}__{lookup}": position[index]})
+
+            for key, value in zip(self.keys[:index], position):
+                step &= Q(**{key: value})
+            condition |= step
+        return condition
+
+    def prepare(self, request, view):
+        """Read the page size and cursor; return the position to continue from"""
+        self.request = request
+        self.ordering = self.get_ordering(view)
+        self.keys = self.get_keys(view)
+        self.page_size = self.get_page_size(request)
+        return self.decode_cursor(request)
+
+    def set_page(self, rows):
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def slice_queryset(self, queryset, position, limit):
+        page = queryset.order_by(*self.ordering)
+
+        if position:
+            page = page.filter(self.after(position))
+        return page[:limit]
+
+    def paginate_fetch(self, fetch, request, view=None):
+        """
+        Paginate a custom data source.
+        `fetch(position, limit)` must return up to `limit` rows ordered by
+        the keyset and starting right after `position`.
+        """
+        position = self.prepare(request, view)
+        return self.set_page(list(fetch(position, self.page_size + 1)))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_fetch(
+            lambda position, limit: self.slice_queryset(queryset, position, limit),
+            request,
+            view,
+        )
+
+    async def apaginate_fetch(self, fetch, request, view=None):
+        """Same as paginate_fetch for a coroutine `fetch`"""
+        position = self.prepare(request, view)
+        return self.set_page(list(await fetch(position, self.page_size + 1)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        async def fetch(position, limit):
+            page = self.slice_queryset(queryset, position, limit)
+            return [row async for row in page]
+
+        return await self.apaginate_fetch(fetch, request, view)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
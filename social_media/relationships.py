@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+
+from social_media import response_cache
+from social_media.async_utils import alist
+from social_media.db_router import primary_reads
+from social_media.models import Follow, Like
+
+# Version kinds, bumped by every write to the user's likes or follows
+LIKES = "liked-posts"
+FOLLOWS = "followed-profiles"
+
+
+def _ids_key(kind, user_id, version):
+    return f"{kind}:{user_id}:{version}:ids"
+
+
+def _query(kind, user_id):
+    """One scan of the (user, ...) unique index of the relation"""
+    if kind == LIKES:
+        return Like.objects.filter(user_id=user_id).values_list("post_id", flat=True)
+    return Follow.objects.filter(user_id=user_id).values_list(
+        "following_id", "following__user_id"
+    )
+
+
+def _ids(kind, rows):
+    """Liked post ids as a set, followed profile ids mapped to their owner"""
+    return frozenset(rows) if kind == LIKES else dict(rows)
+
+
+def invalidate(kind, user_id):
+    response_cache.bump_version(kind, user_id)
+
+
+def get(kind, user_id):
+    version = response_cache.get_version(kind, user_id)
+    key = _ids_key(kind, user_id, version)
+    ids = cache.get(key)
+
+    if ids is None:
+        # Cached under the current version, so it must not lag behind it
+        with primary_reads():
+            ids = _ids(kind, _query(kind, user_id))
+        cache.set(key, ids, timeout=settings.RELATIONSHIPS_CACHE_TIMEOUT)
+    return ids
+
+
+async def aget_versioned(kind, user_id):
+    """Async get, returning the ids with the version they were cached for"""
+    version = await response_cache.aget_version(kind, user_id)
+    key = _ids_key(kind, user_id, version)
+    ids = await cache.aget(key)
+
+    if ids is None:
+        with primary_reads():
+            ids = _ids(kind, await alist(_query(kind, user_id)))
+        await cache.aset(key, ids, timeout=settings.RELATIONSHIPS_CACHE_TIMEOUT)
+    return version, ids
+
+
+async def aversions(user_id):
+    return (
+        await response_cache.aget_version(LIKES, user_id),
+        await response_cache.aget_version(FOLLOWS, user_id),
+    )
+
+
+class Relationships:
+    """
+    What a user likes and follows, for serializers to flag rows with.
+    Each relation is read from the cache once, on first use.
+    """
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+
+    @cached_property
+    def liked_post_ids(self):
+        return get(LIKES, self.user_id)
+
+    @cached_property
+    def followed_profiles(self):
+        return get(FOLLOWS, self.user_id)
+
+    @cached_property
+    def followed_user_ids(self):
+        return frozenset(self.followed_profiles.values())
+
+    @classmethod
+    async def aload(cls, user_id):
+        relationships = cls(user_id)
+        likes_version, liked = await aget_versioned(LIKES, user_id)
+        follows_version, followed = await aget_versioned(FOLLOWS, user_id)
+        relationships.liked_post_ids = liked
+        relationships.followed_profiles = followed
+        relationships.versions = (likes_version, follows_version)
+        return relationships
@@ -0,0 +1,111 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from social_media.db_router import primary_reads
+
+
+def _version_key(kind, pk):
+    return f"{kind}:{pk}:version"
+
+
+def _response_key(kind, pk):
+    return f"{kind}:{pk}:response"
+
+
+def _lock_key(kind, pk):
+    return f"{kind}:{pk}:lock"
+
+
+def _new_version():
+    """Value and timeout of a version key that does not exist yet"""
+    return time.time_ns(), settings.RESPONSE_CACHE_VERSION_TIMEOUT
+
+
+def get_version(kind, pk):
+    """
+    Current version of an object.
+    Unknown versions start from the clock so that they never collide with
+    a version that existed before the cache was flushed or the key expired.
+    """
+    key = _version_key(kind, pk)
+    version = cache.get(key)
+
+    if version is None:
+        cache.add(key, *_new_version())
+        version = cache.get(key)
+    return version
+
+
+def bump_version(kind, pk):
+    """Invalidate every cached response of the object once the transaction commits"""
+
+    def bump():
+        try:
+            cache.incr(_version_key(kind, pk))
+        except ValueError:
+            cache.set(_version_key(kind, pk), *_new_version())
+
+    transaction.on_commit(bump)
+
+
+async def aget_version(kind, pk):
+    key = _version_key(kind, pk)
+    version = await cache.aget(key)
+
+    if version is None:
+        await cache.aadd(key, *_new_version())
+        version = await cache.aget(key)
+    return version
+
+
+async def aget_versions(kind, pks):
+    """Current versions of several objects, in the order of `pks`"""
+    keys = [_version_key(kind, pk) for pk in pks]
+    versions = await cache.aget_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, *_new_version())
+            versions[key] = await cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+async def aget_versioned(kind, pk, compute):
+    """
+    Cached response of the object, with the version it was computed for.
+    The coroutine `compute` fills a miss. Outdated entries keep being
+    served, with their older version, while a single caller holds the lock
+    and recomputes them, so a hot object never causes a stampede.
+    """
+    version = await aget_version(kind, pk)
+    entry = await cache.aget(_response_key(kind, pk))
+    # A cold miss has nothing to serve meanwhile and is computed unlocked
+    locked = False
+
+    if entry is not None:
+        entry_version, fresh_until, payload = entry
+
+        if entry_version == version and fresh_until > time.time():
+            return entry_version, payload
+        locked = await cache.aadd(
+            _lock_key(kind, pk), True, timeout=settings.RESPONSE_CACHE_LOCK_TIMEOUT
+        )
+        if not locked:
+            return entry_version, payload
+
+    try:
+        # A lagging replica would cache an old payload under the new version
+        with primary_reads():
+            payload = await compute()
+        await cache.aset(
+            _response_key(kind, pk),
+            (version, time.time() + settings.RESPONSE_CACHE_TIMEOUT, payload),
+            timeout=settings.RESPONSE_CACHE_STALE_TIMEOUT,
+        )
+    finally:
+        if locked:
+            await cache.adelete(_lock_key(kind, pk))
+    return version, payload
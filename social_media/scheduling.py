@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.utils import timezone
+
+from social_media import search
+from social_media.models import Post, ScheduledPost
+
+
+def publish_due(batch_size):
+    """
+    Turn up to `batch_size` due scheduled posts into posts and return them.
+    Rows are claimed with SKIP LOCKED, so concurrent publishers never wait
+    for each other nor publish a post twice.
+    """
+    with transaction.atomic():
+        due = list(
+            ScheduledPost.objects.select_for_update(skip_locked=True)
+            .filter(publish_at__lte=timezone.now())
+            .order_by("publish_at", "id")[:batch_size]
+        )
+        if not due:
+            return []
+
+        posts = Post.objects.bulk_create(
+            Post(
+                user_id=scheduled.user_id,
+                title=scheduled.title,
+                content=scheduled.content,
+            )
+            for scheduled in due
+        )
+        ScheduledPost.objects.filter(
+            id__in=[scheduled.id for scheduled in due]
+        ).delete()
+
+        for post in posts:
+            search.index_post(post)
+    return posts
@@ -0,0 +1,85 @@
+import re
+from collections import Counter
+from functools import reduce
+from operator import or_
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections, transaction
+from django.db.models import F, FloatField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Cast
+
+from social_media.models import PostSearchTerm
+
+SEARCH_CONFIG = "english"
+MAX_TERM_LENGTH = 64
+# Same values PostgreSQL's ts_rank uses for the A (title) and B (content) weights
+TITLE_WEIGHT = 1.0
+CONTENT_WEIGHT = 0.4
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return [token[:MAX_TERM_LENGTH] for token in TOKEN_RE.findall(text.lower())]
+
+
+def has_native_search(using):
+    return connections[using].vendor == "postgresql"
+
+
+def index_post(post):
+    """
+    Refresh the in-app inverted index of a post.
+    PostgreSQL keeps `Post.search_vector` up to date with a trigger instead.
+    """
+    if has_native_search(post._state.db):
+        return
+
+    weights = Counter()
+
+    for term in tokenize(post.title):
+        weights[term] += TITLE_WEIGHT
+    for term in tokenize(post.content):
+        weights[term] += CONTENT_WEIGHT
+
+    with transaction.atomic(using=post._state.db):
+        PostSearchTerm.objects.filter(post=post).delete()
+        PostSearchTerm.objects.bulk_create(
+            PostSearchTerm(post=post, term=term, weight=weight)
+            for term, weight in weights.items()
+        )
+
+
+def search_posts(queryset, query):
+    """
+    Filter the posts with a term starting with each word of the query,
+    and annotate them with a relevance `rank`.
+    """
+    terms = tokenize(query)
+
+    if not terms:
+        return queryset.none().annotate(rank=Value(0.0, output_field=FloatField()))
+
+    if has_native_search(queryset.db):
+        search = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            search_type="raw",
+            config=SEARCH_CONFIG,
+        )
+        return queryset.filter(search_vector=search).annotate(
+            rank=Cast(SearchRank(F("search_vector"), search), FloatField())
+        )
+
+    for term in terms:
+        queryset = queryset.filter(
+            id__in=PostSearchTerm.objects.filter(term__startswith=term).values("post")
+        )
+    rank = (
+        PostSearchTerm.objects.filter(post=OuterRef("pk"))
+        .filter(reduce(or_, (Q(term__startswith=term) for term in terms)))
+        .order_by()
+        .values("post")
+        .annotate(total=Sum("weight"))
+        .values("total")
+    )
+    return queryset.annotate(rank=Subquery(rank, output_field=FloatField()))
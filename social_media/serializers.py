@@ -1,6 +1,113 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import models
+from django.utils import timezone
 from rest_framework import serializers
-
-from social_media.models import Profile, Follow, Post, Like, Commentary
+from rest_framework.relations import PKOnlyObject
+
+from social_media import metrics
+from social_media.models import (
+    Profile,
+    Follow,
+    Post,
+    Like,
+    Commentary,
+    ScheduledPost,
+)
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """URLs of the resized variants of an image, null until they are processed"""
+
+    def to_representation(self, variants):
+        if not variants:
+            return None
+
+        request = self.context.get("request")
+        urls = {}
+
+        for variant, name in variants.items():
+            url = default_storage.url(name)
+            urls[variant] = request.build_absolute_uri(url) if request else url
+        return urls
+
+
+class RelationshipField(serializers.ReadOnlyField):
+    """
+    Whether the viewer likes or follows the id, looked up in the
+    `relationships` of the context; null without one.
+    """
+
+    def __init__(self, relation, **kwargs):
+        self.relation = relation
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        relationships = self.context.get("relationships")
+
+        if relationships is None:
+            return None
+        return value in getattr(relationships, self.relation)
+
+
+class ValuesSerializer:
+    """
+    Read-only fast path of a flat list serializer for values() rows.
+    The column and to_representation of every field are looked up once,
+    then each row is turned into a dict directly, with the same output as
+    `serializer_class(rows, many=True).data` on model instances.
+    """
+
+    def __init__(self, serializer_class, context=None):
+        serializer = serializer_class(context=context or {})
+        self.serializer_class = serializer_class
+        self.request = serializer.context.get("request")
+        model = serializer.Meta.model
+        self.columns = []
+        self.accessors = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            column = "__".join(field.source_attrs)
+            self.columns.append(column)
+            self.accessors.append(
+                (name, column, self.converter(model, field.source_attrs, field))
+            )
+
+    @staticmethod
+    def converter(model, source_attrs, field):
+        """
+        values() gives file names where the field expects a FieldFile, and
+        primary keys where it expects a related object
+        """
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            return lambda pk: field.to_representation(PKOnlyObject(pk))
+
+        for attr in source_attrs[:-1]:
+            model = model._meta.get_field(attr).related_model
+        model_field = model._meta.get_field(source_attrs[-1])
+
+        if isinstance(model_field, models.FileField):
+            attr_class = model_field.attr_class
+            return lambda name: field.to_representation(
+                attr_class(None, model_field, name)
+            )
+        return field.to_representation
+
+    def values(self, queryset, *extra):
+        """The queryset as dict rows holding the serialized columns and `extra`"""
+        return queryset.values(*dict.fromkeys([*self.columns, *extra]))
+
+    def to_representation(self, row):
+        return {
+            name: None if row[column] is None else convert(row[column])
+            for name, column, convert in self.accessors
+        }
+
+    def serialize(self, rows):
+        with metrics.observe_serialization(self.request, self.serializer_class):
+            return [self.to_representation(row) for row in rows]
 
 
 class ProfileSerializer(serializers.ModelSerializer):
@@ -11,7 +118,7 @@ class ProfileSerializer(serializers.ModelSerializer):
     def validate(self, data):
         user = self.context["request"].user
 
-        if Profile.objects.filter(user=user).exists():
+        if self.instance is None and Profile.objects.filter(user=user).exists():
             raise serializers.ValidationError("Profile already exists for this user")
 
         return data
@@ -19,10 +126,20 @@ class ProfileSerializer(serializers.ModelSerializer):
 
 class ProfileListSerializer(ProfileSerializer):
     user_email = serializers.CharField(source="user.email")
+    profile_picture_variants = ImageVariantsField()
 
     class Meta:
         model = Profile
-        fields = ("id", "bio", "user_email", "profile_picture", "created_at")
+        fields = (
+            "id",
+            "bio",
+            "user_email",
+            "profile_picture",
+            "profile_picture_variants",
+            "created_at",
+            "followers_count",
+        )
+        read_only_fields = ("followers_count",)
 
 
 class FollowProfileSerializer(serializers.ModelSerializer):
@@ -65,10 +182,26 @@ class PostSerializer(serializers.ModelSerializer):
 
 class PostListSerializer(serializers.ModelSerializer):
     owner = serializers.CharField(source="user.email")
+    image_variants = ImageVariantsField()
+    is_liked = RelationshipField("liked_post_ids", source="id")
+    is_following = RelationshipField("followed_user_ids", source="user_id")
 
     class Meta:
         model = Post
-        fields = ("id", "owner", "title", "content", "image", "created_at")
+        fields = (
+            "id",
+            "owner",
+            "title",
+            "content",
+            "image",
+            "image_variants",
+            "created_at",
+            "likes_count",
+            "comments_count",
+            "is_liked",
+            "is_following",
+        )
+        read_only_fields = ("likes_count", "comments_count")
 
 
 class LikePostSerializer(serializers.ModelSerializer):
@@ -83,6 +216,12 @@ class CommentaryPostSerializer(serializers.ModelSerializer):
         fields = ("user", "content", "created_at")
 
 
+class CommentaryListSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Commentary
+        fields = ("id", "user", "content", "created_at")
+
+
 class PostDetailSerializer(serializers.ModelSerializer):
     likes = LikePostSerializer(many=True, read_only=True, source="post_likes")
     commentaries = CommentaryPostSerializer(
@@ -106,3 +245,53 @@ class CommentarySerializer(serializers.ModelSerializer):
     class Meta:
         model = Commentary
         fields = ("id", "user", "post", "content", "created_at")
+
+
+class BatchLikeOperationSerializer(serializers.Serializer):
+    post = serializers.IntegerField()
+    action = serializers.ChoiceField(choices=("like", "unlike"))
+
+
+class BatchLikeSerializer(serializers.Serializer):
+    operations = BatchLikeOperationSerializer(
+        many=True, allow_empty=False, max_length=settings.BATCH_MAX_OPERATIONS
+    )
+
+
+class BatchFollowOperationSerializer(serializers.Serializer):
+    profile = serializers.IntegerField()
+    action = serializers.ChoiceField(choices=("follow", "unfollow"))
+
+
+class BatchFollowSerializer(serializers.Serializer):
+    operations = BatchFollowOperationSerializer(
+        many=True, allow_empty=False, max_length=settings.BATCH_MAX_OPERATIONS
+    )
+
+
+class RelationshipLookupSerializer(serializers.Serializer):
+    posts = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        max_length=settings.BATCH_MAX_OPERATIONS,
+    )
+    profiles = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        max_length=settings.BATCH_MAX_OPERATIONS,
+    )
+
+
+class ScheduledPostSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ScheduledPost
+        fields = ("id", "title", "content", "publish_at", "created_at")
+
+
+class RescheduleSerializer(serializers.Serializer):
+    publish_at = serializers.DateTimeField()
+
+    def validate_publish_at(self, value):
+        if value < timezone.now():
+            raise serializers.ValidationError("Scheduled data must be in the future")
+        return value
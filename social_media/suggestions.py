@@ -0,0 +1,183 @@
+import heapq
+from array import array
+from bisect import bisect_left
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from eventlet import patcher
+
+from social_media.db_router import replica_reads
+
+from social_media.models import Profile, Follow, FollowSuggestions
+
+# Graph shared with forked workers; array buffers are never touched by
+# reference counting, so the pages stay shared copy-on-write
+_graph = None
+
+
+class FollowGraph:
+    """
+    Follows in compressed sparse row form over dense user indexes.
+    The users followed by the user at index i are the indexes
+    targets[offsets[i]:offsets[i + 1]], most recently followed first.
+    """
+
+    def __init__(self, user_ids, profile_ids, offsets, targets):
+        self.user_ids = user_ids
+        self.profile_ids = profile_ids
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def build(cls, user_ids, profiles, edges):
+        """
+        Build the graph from sorted `user_ids`, (user id, profile id) pairs
+        and (follower id, followed user id) pairs grouped by follower in
+        ascending order. Pairs naming unknown users are skipped.
+        """
+        user_ids = array("q", user_ids)
+        size = len(user_ids)
+        graph = cls(
+            user_ids,
+            array("q", bytes(size * array("q").itemsize)),
+            array("q", bytes((size + 1) * array("q").itemsize)),
+            array("i"),
+        )
+
+        for user_id, profile_id in profiles:
+            index = graph.index(user_id)
+            if index is not None:
+                graph.profile_ids[index] = profile_id
+
+        offsets, targets = graph.offsets, graph.targets
+        follower = source = None
+        for user_id, followed in edges:
+            if user_id != follower:
+                follower, source = user_id, graph.index(user_id)
+            target = graph.index(followed)
+            if source is not None and target is not None:
+                offsets[source + 1] += 1
+                targets.append(target)
+
+        for index in range(size):
+            offsets[index + 1] += offsets[index]
+        return graph
+
+    @classmethod
+    def load(cls):
+        chunk_size = settings.SUGGESTIONS_CHUNK_SIZE
+        return cls.build(
+            get_user_model()
+            .objects.order_by("id")
+            .values_list("id", flat=True)
+            .iterator(chunk_size=chunk_size),
+            Profile.objects.values_list("user_id", "id").iterator(
+                chunk_size=chunk_size
+            ),
+            Follow.objects.order_by("user_id", "-created_at", "-id")
+            .values_list("user_id", "following__user_id")
+            .iterator(chunk_size=chunk_size),
+        )
+
+    @property
+    def nbytes(self):
+        return sum(
+            buffer.buffer_info()[1] * buffer.itemsize
+            for buffer in (self.user_ids, self.profile_ids, self.offsets, self.targets)
+        )
+
+    def index(self, user_id):
+        index = bisect_left(self.user_ids, user_id)
+        if index < len(self.user_ids) and self.user_ids[index] == user_id:
+            return index
+        return None
+
+    def followed(self, index, limit=None):
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        if limit is not None:
+            stop = min(stop, start + limit)
+        return self.targets[start:stop]
+
+    def suggest(self, index, limit, max_followed):
+        """
+        Profile ids of the users followed by most of the users `index`
+        follows, ties broken by the lower user id. Only the `max_followed`
+        most recent follows of every user are walked, which bounds the
+        work spent on accounts following thousands of others.
+        """
+        excluded = set(self.followed(index))
+        excluded.add(index)
+        shared = {}
+
+        for friend in self.followed(index, max_followed):
+            for candidate in self.followed(friend, max_followed):
+                if candidate not in excluded:
+                    shared[candidate] = shared.get(candidate, 0) + 1
+
+        best = heapq.nlargest(
+            limit, shared, key=lambda candidate: (shared[candidate], -candidate)
+        )
+        return [self.profile_ids[candidate] for candidate in best]
+
+
+def _suggest_range(bounds):
+    start, stop = bounds
+    limit = settings.SUGGESTIONS_LIMIT
+    max_followed = settings.SUGGESTIONS_MAX_FOLLOWED
+    return [
+        (_graph.user_ids[index], profile_ids)
+        for index in range(start, stop)
+        if (profile_ids := _graph.suggest(index, limit, max_followed))
+    ]
+
+
+def compute(graph, workers):
+    """
+    Yield lists of (user id, suggested profile ids), spread over `workers`
+    forked processes that share the graph buffers. Under an eventlet
+    worker, where a forked pool hangs, they are computed inline.
+    """
+    global _graph
+
+    _graph = graph
+    chunk_size = settings.SUGGESTIONS_CHUNK_SIZE
+    ranges = [
+        (start, min(start + chunk_size, len(graph.user_ids)))
+        for start in range(0, len(graph.user_ids), chunk_size)
+    ]
+    try:
+        if workers <= 1 or patcher.is_monkey_patched("thread"):
+            yield from map(_suggest_range, ranges)
+            return
+
+        with get_context("fork").Pool(workers) as pool:
+            yield from pool.imap_unordered(_suggest_range, ranges)
+    finally:
+        _graph = None
+
+
+def refresh(workers=None):
+    """Recompute the suggestions of every user and return how many were stored"""
+    started = timezone.now()
+    with replica_reads():
+        graph = FollowGraph.load()
+    stored = 0
+
+    for chunk in compute(graph, workers or settings.SUGGESTIONS_WORKERS):
+        FollowSuggestions.objects.bulk_create(
+            [
+                FollowSuggestions(
+                    user_id=user_id, profile_ids=profile_ids, computed_at=started
+                )
+                for user_id, profile_ids in chunk
+            ],
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=["profile_ids", "computed_at"],
+        )
+        stored += len(chunk)
+
+    FollowSuggestions.objects.filter(computed_at__lt=started).delete()
+    return stored
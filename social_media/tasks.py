@@ -1,13 +1,104 @@
 from celery import shared_task
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from .models import Post
+from django.core.files.storage import default_storage
+
+from social_media import (
+    images,
+    response_cache,
+    scheduling,
+    search,
+    suggestions,
+    timeline,
+    trending,
+)
+from .models import Profile, Post
 
 
 @shared_task
 def create_post(user_id, title, content, scheduled_time):
     user = get_user_model().objects.get(id=user_id)
 
-    Post.objects.create(
+    post = Post.objects.create(
         user=user, title=title, content=content, created_at=scheduled_time
     )
+    search.index_post(post)
+    timeline.fan_out(post)
     return f"Post '{title}' scheduled for {scheduled_time}"
+
+
+@shared_task
+def fan_out_post(post_id):
+    post = Post.objects.filter(id=post_id).first()
+
+    if post is None:
+        return 0
+    return timeline.fan_out(post)
+
+
+@shared_task
+def backfill_timeline(user_id, author_id):
+    return timeline.backfill(user_id, author_id)
+
+
+@shared_task
+def backfill_follower_timelines(author_id):
+    return timeline.backfill_followers(author_id)
+
+
+@shared_task
+def remove_from_timeline(user_id, author_id):
+    return timeline.remove_author(user_id, author_id)
+
+
+@shared_task
+def rebuild_timeline(user_id):
+    return timeline.rebuild(user_id)
+
+
+@shared_task
+def process_post_image(post_id, name):
+    variants = images.process_row(Post, post_id, "image", name)
+
+    if variants is not None:
+        response_cache.bump_version("post", post_id)
+    return variants
+
+
+@shared_task
+def delete_images(names):
+    images.delete(default_storage, names)
+
+
+@shared_task
+def process_profile_picture(profile_id, name):
+    variants = images.process_row(Profile, profile_id, "profile_picture", name)
+
+    if variants is not None:
+        response_cache.bump_version("profile", profile_id)
+    return variants
+
+
+@shared_task
+def publish_scheduled_posts():
+    published = 0
+
+    while posts := scheduling.publish_due(settings.SCHEDULED_POSTS_BATCH_SIZE):
+        for post in posts:
+            fan_out_post.delay(post.id)
+        published += len(posts)
+    return published
+
+
+@shared_task
+def update_trending_scores():
+    folded = 0
+
+    while events := trending.update_scores(settings.TRENDING_BATCH_SIZE):
+        folded += events
+    return folded
+
+
+@shared_task
+def refresh_follow_suggestions():
+    return suggestions.refresh()
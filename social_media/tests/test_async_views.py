@@ -0,0 +1,270 @@
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from social_media.models import Profile, Follow, Post, Like, TimelineEntry
+from social_media.serializers import (
+    FollowProfileSerializer,
+    PostListSerializer,
+    PostDetailSerializer,
+)
+
+
+class AsyncReadViewsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.author = get_user_model().objects.create_user(
+            "author@user.com", "testpassword"
+        )
+        self.profile = Profile.objects.create(user=self.author, bio="Author")
+        Follow.objects.create(user=self.user, following=self.profile)
+        self.post = Post.objects.create(user=self.author, title="Title", content="Text")
+        Like.objects.create(user=self.user, post=self.post)
+        TimelineEntry.objects.create(
+            owner=self.user, post=self.post, created_at=self.post.created_at
+        )
+
+        token = Token.objects.create(user=self.user)
+        self.headers = {"authorization": f"Token {token}"}
+
+    def test_read_endpoints_are_coroutines(self):
+        for name, args in (
+            ("post-detail", [1]),
+            ("post-my-posts", []),
+            ("post-following-posts", []),
+            ("profile-detail", [1]),
+            ("profile-followers", [1]),
+            ("profile-following", [1]),
+        ):
+            with self.subTest(name):
+                url = reverse(f"social_media:{name}", args=args)
+                self.assertTrue(iscoroutinefunction(resolve(url).func))
+
+    def test_format_suffixes_are_served_async(self):
+        for name, args in (
+            ("post-detail", [self.post.id]),
+            ("post-comments", [self.post.id]),
+            ("post-my-posts", []),
+            ("post-following-posts", []),
+            ("profile-detail", [self.profile.id]),
+            ("profile-followers", [self.profile.id]),
+            ("profile-following", [self.profile.id]),
+        ):
+            with self.subTest(name):
+                url = reverse(f"social_media:{name}", args=args)
+                suffixed = url.rstrip("/") + ".json"
+                self.assertTrue(iscoroutinefunction(resolve(suffixed).func))
+
+                response = self.client.get(suffixed, headers=self.headers)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    response.json(),
+                    self.client.get(url, headers=self.headers).json(),
+                )
+
+        response = self.client.get(
+            reverse("social_media:post-detail", args=[self.post.id]).rstrip("/")
+            + ".json",
+            headers=self.headers,
+        )
+        self.assertIn("ETag", response)
+
+    def test_media_urls_are_absolute(self):
+        Post.objects.filter(pk=self.post.pk).update(
+            image="posts/photo.jpg", image_variants={"thumbnail": "posts/thumb.jpg"}
+        )
+        Profile.objects.filter(pk=self.profile.pk).update(
+            profile_picture="profiles/photo.jpg"
+        )
+        host = "http://testserver/media/"
+
+        post = self.client.get(
+            reverse("social_media:post-detail", args=[self.post.id]),
+            headers=self.headers,
+        ).json()
+        profile = self.client.get(
+            reverse("social_media:profile-detail", args=[self.profile.id]),
+            headers=self.headers,
+        ).json()
+        self.assertEqual(post["image"], f"{host}posts/photo.jpg")
+        self.assertEqual(profile["profile_picture"], f"{host}profiles/photo.jpg")
+
+        Post.objects.filter(pk=self.post.pk).update(user=self.user)
+        for name in ("post-my-posts", "post-following-posts"):
+            with self.subTest(name):
+                response = self.client.get(
+                    reverse(f"social_media:{name}"), headers=self.headers
+                )
+                row = response.json()["results"][0]
+                self.assertEqual(row["image"], f"{host}posts/photo.jpg")
+                self.assertEqual(
+                    row["image_variants"], {"thumbnail": f"{host}posts/thumb.jpg"}
+                )
+
+    async def test_post_detail(self):
+        url = reverse("social_media:post-detail", args=[self.post.id])
+
+        response = await AsyncClient().get(url, headers=self.headers)
+
+        post = await Post.objects.prefetch_related(
+            "post_likes", "post_commentary"
+        ).aget(id=self.post.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["likes"], PostDetailSerializer(post).data["likes"]
+        )
+
+    async def test_following_posts(self):
+        url = reverse("social_media:post-following-posts")
+
+        response = await AsyncClient().get(url, headers=self.headers)
+
+        post = await Post.objects.select_related("user").aget(id=self.post.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"][0]["id"], post.id)
+        self.assertEqual(
+            response.json()["results"][0]["owner"],
+            PostListSerializer(post).data["owner"],
+        )
+
+    async def test_followers(self):
+        url = reverse("social_media:profile-followers", args=[self.profile.id])
+
+        response = await AsyncClient().get(url, headers=self.headers)
+
+        follow = await Follow.objects.select_related("user").aget()
+        self.assertEqual(
+            response.json()["results"], [FollowProfileSerializer(follow).data]
+        )
+
+    async def test_missing_profile(self):
+        url = reverse("social_media:profile-followers", args=[self.profile.id + 1])
+
+        response = await AsyncClient().get(url, headers=self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_auth_required(self):
+        response = await AsyncClient().get(reverse("social_media:post-my-posts"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_writes_go_to_viewset(self):
+        url = reverse("social_media:post-detail", args=[self.post.id])
+
+        response = await AsyncClient().delete(url, headers=self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(await Post.objects.filter(id=self.post.id).aexists())
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.author = get_user_model().objects.create_user(
+            "author@user.com", "testpassword"
+        )
+        self.profile = Profile.objects.create(user=self.author, bio="Author")
+        self.post = Post.objects.create(user=self.author, title="Title", content="Text")
+        TimelineEntry.objects.create(
+            owner=self.user, post=self.post, created_at=self.post.created_at
+        )
+
+        token = Token.objects.create(user=self.user)
+        self.headers = {"authorization": f"Token {token}"}
+
+    async def poll(self, url, response):
+        headers = {**self.headers, "if-none-match": response["ETag"]}
+        return await AsyncClient().get(url, headers=headers)
+
+    def test_post_detail(self):
+        url = reverse("social_media:post-detail", args=[self.post.id])
+        response = self.client.get(url, headers=self.headers)
+        headers = {**self.headers, "if-none-match": response["ETag"]}
+
+        with self.assertNumQueries(2):
+            polled = self.client.get(url, headers=headers)
+
+        self.assertEqual(polled.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(polled["ETag"], response["ETag"])
+        self.assertEqual(polled.content, b"")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("social_media:post-like-toggle", args=[self.post.id]),
+                headers=self.headers,
+            )
+        polled = self.client.get(url, headers=headers)
+
+        self.assertEqual(polled.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(polled.json()["likes"]), 1)
+
+    def test_profile_detail(self):
+        url = reverse("social_media:profile-detail", args=[self.profile.id])
+        response = self.client.get(url, headers=self.headers)
+        headers = {**self.headers, "if-none-match": response["ETag"]}
+
+        polled = self.client.get(url, headers=headers)
+        self.assertEqual(polled.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with mock.patch(
+            "social_media.views.backfill_timeline.delay"
+        ), self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("social_media:profile-follow-toggle", args=[self.profile.id]),
+                headers=self.headers,
+            )
+        polled = self.client.get(url, headers=headers)
+
+        self.assertEqual(polled.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(polled.json()["followers"]), 1)
+
+    async def test_following_posts(self):
+        url = reverse("social_media:post-following-posts")
+        response = await AsyncClient().get(url, headers=self.headers)
+        self.assertNotIn("Last-Modified", response)
+
+        polled = await self.poll(url, response)
+        self.assertEqual(polled.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        post = await Post.objects.acreate(
+            user=self.author, title="Newer", content="Text"
+        )
+        await TimelineEntry.objects.acreate(
+            owner=self.user, post=post, created_at=post.created_at
+        )
+        polled = await self.poll(url, response)
+
+        self.assertEqual(polled.status_code, status.HTTP_200_OK)
+        self.assertEqual(polled.json()["results"][0]["title"], "Newer")
+
+    def test_following_posts_after_older_post_changes(self):
+        url = reverse("social_media:post-following-posts")
+        post = Post.objects.create(user=self.author, title="Newer", content="Text")
+        TimelineEntry.objects.create(
+            owner=self.user, post=post, created_at=post.created_at
+        )
+        response = self.client.get(url, headers=self.headers)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("social_media:post-like-toggle", args=[self.post.id]),
+                headers=self.headers,
+            )
+        polled = self.client.get(
+            url, headers={**self.headers, "if-none-match": response["ETag"]}
+        )
+
+        self.assertEqual(polled.status_code, status.HTTP_200_OK)
+        self.assertEqual(polled.json()["results"][-1]["likes_count"], 1)
@@ -0,0 +1,158 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from social_media.models import Profile, Follow, Post, Like
+
+BATCH_LIKE_URL = reverse("social_media:post-batch-like")
+BATCH_FOLLOW_URL = reverse("social_media:profile-batch-follow")
+
+
+class BatchLikeTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.posts = [
+            Post.objects.create(user=self.user, title=f"Title {i}", content="Text")
+            for i in range(3)
+        ]
+
+    def test_batch_like(self):
+        Like.objects.create(user=self.user, post=self.posts[1])
+        Post.objects.filter(pk=self.posts[1].pk).update(likes_count=1)
+        operations = [
+            {"post": self.posts[0].id, "action": "like"},
+            {"post": self.posts[1].id, "action": "unlike"},
+            {"post": self.posts[2].id, "action": "unlike"},
+            {"post": 0, "action": "like"},
+        ]
+
+        response = self.client.post(
+            BATCH_LIKE_URL, {"operations": operations}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["status"] for item in response.data["results"]],
+            ["liked", "unliked", "unchanged", "not_found"],
+        )
+        self.assertEqual(
+            list(Like.objects.values_list("post_id", flat=True)), [self.posts[0].id]
+        )
+        self.assertEqual(
+            list(Post.objects.order_by("id").values_list("likes_count", flat=True)),
+            [1, 0, 0],
+        )
+
+    def test_operations_are_replayed_in_order(self):
+        post_id = self.posts[0].id
+        operations = [
+            {"post": post_id, "action": "like"},
+            {"post": post_id, "action": "unlike"},
+            {"post": post_id, "action": "like"},
+        ]
+
+        response = self.client.post(
+            BATCH_LIKE_URL, {"operations": operations}, format="json"
+        )
+
+        self.assertEqual(
+            [item["status"] for item in response.data["results"]],
+            ["liked", "unliked", "liked"],
+        )
+        self.assertEqual(Like.objects.filter(post_id=post_id).count(), 1)
+
+    def test_counters_move_by_the_rows_written(self):
+        Post.objects.filter(pk=self.posts[0].pk).update(likes_count=5)
+        operations = [
+            {"post": self.posts[0].id, "action": "like"},
+            {"post": self.posts[0].id, "action": "like"},
+        ]
+
+        self.client.post(BATCH_LIKE_URL, {"operations": operations}, format="json")
+        self.client.post(BATCH_LIKE_URL, {"operations": operations}, format="json")
+
+        self.posts[0].refresh_from_db()
+        self.assertEqual(self.posts[0].likes_count, 6)
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        query_counts = []
+
+        for posts in (self.posts[:1], self.posts[1:]):
+            operations = [{"post": post.id, "action": "like"} for post in posts]
+
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(
+                    BATCH_LIKE_URL, {"operations": operations}, format="json"
+                )
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_batch_size_is_limited(self):
+        operations = [{"post": 1, "action": "like"}] * (
+            settings.BATCH_MAX_OPERATIONS + 1
+        )
+
+        for batch in ([], operations):
+            response = self.client.post(
+                BATCH_LIKE_URL, {"operations": batch}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BatchFollowTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.own_profile = Profile.objects.create(user=self.user, bio="Me")
+        self.profiles = [
+            Profile.objects.create(
+                user=get_user_model().objects.create_user(
+                    f"user{i}@user.com", "testpassword"
+                ),
+                bio="Bio",
+            )
+            for i in range(2)
+        ]
+
+    def test_batch_follow(self):
+        Follow.objects.create(user=self.user, following=self.profiles[1])
+        Profile.objects.filter(pk=self.profiles[1].pk).update(followers_count=1)
+        operations = [
+            {"profile": self.profiles[0].id, "action": "follow"},
+            {"profile": self.profiles[1].id, "action": "unfollow"},
+            {"profile": self.own_profile.id, "action": "follow"},
+        ]
+
+        with mock.patch("social_media.batch.backfill_timeline.delay") as backfill:
+            with mock.patch("social_media.batch.remove_from_timeline.delay") as remove:
+                with self.captureOnCommitCallbacks(execute=True):
+                    response = self.client.post(
+                        BATCH_FOLLOW_URL, {"operations": operations}, format="json"
+                    )
+
+        self.assertEqual(
+            [item["status"] for item in response.data["results"]],
+            ["followed", "unfollowed", "cannot_follow_self"],
+        )
+        self.assertEqual(
+            list(Follow.objects.values_list("following_id", flat=True)),
+            [self.profiles[0].id],
+        )
+        backfill.assert_called_once_with(self.user.id, self.profiles[0].user_id)
+        remove.assert_called_once_with(self.user.id, self.profiles[1].user_id)
+        self.profiles[0].refresh_from_db()
+        self.assertEqual(self.profiles[0].followers_count, 1)
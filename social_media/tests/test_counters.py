@@ -0,0 +1,130 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from social_media.models import Profile, Follow, Post, Like, Commentary
+from social_media.views import CommentaryViewSet
+
+
+class CounterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "test2@user.com", "testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.post = Post.objects.create(
+            user=self.other_user, title="Test Title", content="Test Content"
+        )
+        self.profile = Profile.objects.create(user=self.other_user, bio="Bio")
+
+    def test_like_toggle_updates_likes_count(self):
+        url = reverse("social_media:post-like-toggle", args=[self.post.id])
+
+        self.client.post(url)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+        self.client.post(url)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_comments_count(self):
+        url = reverse("social_media:post-add-comment", args=[self.post.id])
+
+        self.client.post(url, {"content": "Comment"})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+
+        commentary = Commentary.objects.get()
+        self.client.delete(
+            reverse("social_media:commentary-detail", args=[commentary.id])
+        )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 0)
+
+    def test_follow_toggle_updates_followers_count(self):
+        url = reverse("social_media:profile-follow-toggle", args=[self.profile.id])
+
+        self.client.post(url)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.followers_count, 1)
+
+        self.client.post(url)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.followers_count, 0)
+
+    def test_drifted_counters_do_not_go_below_zero(self):
+        Like.objects.create(user=self.user, post=self.post)
+        Follow.objects.create(user=self.user, following=self.profile)
+        commentary = Commentary.objects.create(
+            user=self.user, post=self.post, content="Comment"
+        )
+
+        responses = [
+            self.client.post(
+                reverse("social_media:post-like-toggle", args=[self.post.id])
+            ),
+            self.client.post(
+                reverse("social_media:profile-follow-toggle", args=[self.profile.id])
+            ),
+            self.client.delete(
+                reverse("social_media:commentary-detail", args=[commentary.id])
+            ),
+        ]
+        Like.objects.create(user=self.user, post=self.post)
+        responses.append(
+            self.client.post(
+                reverse("social_media:post-batch-like"),
+                {"operations": [{"post": self.post.id, "action": "unlike"}]},
+                format="json",
+            )
+        )
+
+        self.assertEqual(
+            [response.status_code for response in responses], [200, 200, 204, 200]
+        )
+        self.post.refresh_from_db()
+        self.profile.refresh_from_db()
+        self.assertEqual((self.post.likes_count, self.post.comments_count), (0, 0))
+        self.assertEqual(self.profile.followers_count, 0)
+
+    def test_comment_deleted_twice_is_counted_once(self):
+        commentary = Commentary.objects.create(
+            user=self.user, post=self.post, content="Comment"
+        )
+        Post.objects.update(comments_count=2)
+        Commentary.objects.filter(pk=commentary.pk).delete()
+
+        CommentaryViewSet().perform_destroy(commentary)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 2)
+
+    def test_counters_in_list_response(self):
+        Like.objects.create(user=self.user, post=self.post)
+        Post.objects.update(likes_count=1)
+
+        response = self.client.get(reverse("social_media:post-list"))
+
+        self.assertEqual(response.data["results"][0]["likes_count"], 1)
+        self.assertEqual(response.data["results"][0]["comments_count"], 0)
+
+    def test_recount_repairs_drift(self):
+        Like.objects.create(user=self.user, post=self.post)
+        Follow.objects.create(user=self.user, following=self.profile)
+        Post.objects.update(comments_count=5)
+
+        call_command("recount", batch_size=1, stdout=StringIO())
+
+        self.post.refresh_from_db()
+        self.profile.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(self.post.comments_count, 0)
+        self.assertEqual(self.profile.followers_count, 1)
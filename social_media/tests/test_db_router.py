@@ -0,0 +1,154 @@
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from social_media import db_router, relationships
+from social_media.models import Post
+
+REPLICA = "replica1"
+
+
+class User:
+    is_authenticated = True
+
+    def __init__(self, pk):
+        self.pk = pk
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.router = db_router.ReplicaRouter()
+
+    def route(self, method="get", user=None, status=200):
+        """Alias the router picks for a Post read inside a request"""
+        request = getattr(RequestFactory(), method)("/")
+        request.user = user or AnonymousUser()
+        aliases = []
+
+        def view(request):
+            aliases.append(self.router.db_for_read(Post))
+            aliases.append(self.router.db_for_read(Token))
+            return HttpResponse(status=status)
+
+        db_router.ReplicaRoutingMiddleware(view)(request)
+        return aliases
+
+    def test_safe_requests_read_from_replica(self):
+        self.assertEqual(self.route(), [REPLICA, "default"])
+        self.assertEqual(self.route(user=User(1)), [REPLICA, "default"])
+        self.assertEqual(self.route("post"), ["default", "default"])
+
+    def test_writes_pin_the_user(self):
+        self.route("post", user=User(1), status=400)
+        self.assertEqual(self.route(user=User(1)), [REPLICA, "default"])
+
+        self.route("post", user=User(1), status=201)
+
+        self.assertEqual(self.route(user=User(1)), ["default", "default"])
+        self.assertEqual(self.route(user=User(2)), [REPLICA, "default"])
+
+        cache.clear()
+        self.assertEqual(self.route(user=User(1)), [REPLICA, "default"])
+
+    def test_jobs_read_from_primary_unless_asked(self):
+        self.assertEqual(self.router.db_for_read(Post), "default")
+
+        with db_router.replica_reads():
+            self.assertEqual(self.router.db_for_read(Post), REPLICA)
+
+            with db_router.primary_reads():
+                self.assertEqual(self.router.db_for_read(Post), "default")
+        self.assertEqual(self.router.db_for_write(Post), "default")
+
+    def test_cached_relationships_read_from_primary(self):
+        aliases = []
+        router = self.router
+
+        class Rows:
+            """Stands for the relation query, noting where it would be read"""
+
+            def __iter__(self):
+                aliases.append(router.db_for_read(Post))
+                return iter(())
+
+            async def __aiter__(self):
+                for row in self:
+                    yield row
+
+        def query(kind, user_id):
+            return Rows()
+
+        with mock.patch("social_media.relationships._query", query):
+            with db_router.replica_reads():
+                relationships.get(relationships.LIKES, 1)
+                async_to_sync(relationships.aget_versioned)(relationships.FOLLOWS, 1)
+
+        self.assertEqual(aliases, ["default", "default"])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        self.assertEqual(self.route(), ["default", "default"])
+
+        with db_router.replica_reads():
+            self.assertEqual(self.router.db_for_read(Post), "default")
+
+
+@skipUnless(REPLICA in settings.DATABASES, "Needs a replica alias, see README")
+class ReplicaRoutingTests(TransactionTestCase):
+    """Run with POSTGRES_REPLICA_HOSTS set; the replica mirrors the test database"""
+
+    # The test runner sets up these aliases even when the class is skipped
+    databases = {"default", REPLICA} & settings.DATABASES.keys()
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.post = Post.objects.create(user=self.user, title="Title", content="Text")
+        token = Token.objects.create(user=self.user)
+        self.headers = {"authorization": f"Token {token}"}
+
+    def served_by(self, url):
+        """Alias that served the queries of the request, but the token lookup"""
+        # Cache the relationship sets first, which are read from the primary
+        self.client.get(url, headers=self.headers)
+
+        with CaptureQueriesContext(
+            connections["default"]
+        ) as primary, CaptureQueriesContext(connections[REPLICA]) as replica:
+            self.client.get(url, headers=self.headers)
+
+        self.assertTrue(len(primary) == 1 or not replica)
+        return REPLICA if replica else "default"
+
+    def test_read_your_writes(self):
+        posts_url = reverse("social_media:post-list")
+
+        self.assertEqual(self.served_by(posts_url), REPLICA)
+
+        self.client.post(
+            reverse("social_media:post-like-toggle", args=[self.post.id]),
+            headers=self.headers,
+        )
+        self.assertEqual(self.served_by(posts_url), "default")
+
+        cache.clear()
+        self.assertEqual(self.served_by(posts_url), REPLICA)
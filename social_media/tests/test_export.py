@@ -0,0 +1,95 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from rest_framework import status
+from social_media.models import Profile, Follow, Post, Like
+
+EXPORT_POSTS_URL = reverse("social_media:post-export-my-posts")
+EXPORT_LIKES_URL = reverse("social_media:post-export-my-likes")
+
+
+def export_followers_url(profile_id):
+    return reverse("social_media:profile-export-followers", args=[profile_id])
+
+
+def export_following_url(profile_id):
+    return reverse("social_media:profile-export-following", args=[profile_id])
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.profile = Profile.objects.create(user=self.user, bio="Bio")
+        self.other = get_user_model().objects.create_user(
+            "other@user.com", "testpassword"
+        )
+        self.other_profile = Profile.objects.create(user=self.other, bio="Other")
+
+    def read(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        content = b"".join(response.streaming_content).decode()
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_export_posts(self):
+        posts = [
+            Post.objects.create(user=self.user, title=f"Title {i}", content="Text")
+            for i in range(5)
+        ]
+        Post.objects.create(user=self.other, title="Not mine", content="Text")
+
+        rows = self.read(self.client.get(EXPORT_POSTS_URL))
+
+        self.assertEqual([row["id"] for row in rows], [post.id for post in posts])
+        self.assertEqual(rows[0]["owner"], "test@user.com")
+        self.assertEqual(rows[0]["created_at"], posts[0].created_at.isoformat())
+        self.assertIsNone(rows[0]["image"])
+
+    def test_export_likes(self):
+        post = Post.objects.create(user=self.other, title="Title", content="Text")
+        Like.objects.create(user=self.user, post=post)
+        Like.objects.create(user=self.other, post=post)
+
+        rows = self.read(self.client.get(EXPORT_LIKES_URL))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["post_id"], post.id)
+        self.assertEqual(rows[0]["post_title"], "Title")
+
+    def test_export_social_graph(self):
+        Follow.objects.create(user=self.other, following=self.profile)
+        Follow.objects.create(user=self.user, following=self.other_profile)
+
+        followers = self.read(self.client.get(export_followers_url(self.profile.id)))
+        following = self.read(self.client.get(export_following_url(self.profile.id)))
+
+        self.assertEqual([row["user"] for row in followers], ["other@user.com"])
+        self.assertEqual([row["profile"] for row in following], ["other@user.com"])
+
+    def test_missing_profile(self):
+        response = self.client.get(export_followers_url(self.other_profile.id + 1))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_export_is_async_under_asgi(self):
+        token = await Token.objects.acreate(user=self.user)
+        await Post.objects.acreate(user=self.user, title="Title", content="Text")
+
+        response = await AsyncClient().get(
+            EXPORT_POSTS_URL, headers={"authorization": f"Token {token}"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(json.loads(content)["title"], "Title")
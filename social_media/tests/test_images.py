@@ -0,0 +1,152 @@
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework import status
+from social_media.models import Profile, Post
+from social_media.tasks import (
+    delete_images,
+    process_post_image,
+    process_profile_picture,
+)
+
+POST_URL = reverse("social_media:post-list")
+PROFILE_URL = reverse("social_media:profile-list")
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def jpeg_with_exif(size=(1200, 900), name="photo.jpg"):
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"
+    exif[0x0132] = "2024:01:01 00:00:00"
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, format="JPEG", exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    IMAGE_VARIANTS={"thumbnail": (150, 150), "medium": (600, 600)},
+)
+class ImagePipelineTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.client.force_authenticate(self.user)
+
+    def open(self, name):
+        with default_storage.open(name) as file, Image.open(file) as image:
+            image.load()
+            return image
+
+    def test_variants_are_resized_and_stripped(self):
+        post = Post.objects.create(
+            user=self.user, title="Title", content="Text", image=jpeg_with_exif()
+        )
+        original = post.image.name
+
+        variants = process_post_image(post.id, original)
+
+        post.refresh_from_db()
+        self.assertNotEqual(post.image.name, original)
+        self.assertFalse(default_storage.exists(original))
+        self.assertEqual(dict(self.open(post.image.name).getexif()), {})
+        self.assertEqual(post.image_variants, variants)
+        self.assertEqual(
+            set(variants), {"thumbnail", "thumbnail_webp", "medium", "medium_webp"}
+        )
+        self.assertEqual(self.open(variants["thumbnail"]).size, (150, 113))
+        self.assertEqual(self.open(variants["medium"]).size, (600, 450))
+        self.assertEqual(self.open(variants["medium_webp"]).format, "WEBP")
+        self.assertEqual(dict(self.open(variants["medium"]).getexif()), {})
+
+    def test_replaced_image_is_not_recorded(self):
+        post = Post.objects.create(
+            user=self.user, title="Title", content="Text", image=jpeg_with_exif()
+        )
+        stale = post.image.name
+        post.image = jpeg_with_exif(name="other.jpg")
+        post.save()
+
+        self.assertIsNone(process_post_image(post.id, stale))
+
+        post.refresh_from_db()
+        self.assertEqual(post.image_variants, {})
+
+    def test_upload_schedules_processing(self):
+        with mock.patch("social_media.views.fan_out_post.delay"), mock.patch(
+            "social_media.views.process_post_image.delay"
+        ) as delay, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                POST_URL,
+                {"title": "Title", "content": "Text", "image": jpeg_with_exif()},
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        post = Post.objects.get()
+        delay.assert_called_once_with(post.id, post.image.name)
+
+    def test_replacing_the_image_deletes_the_old_files(self):
+        post = Post.objects.create(
+            user=self.user, title="Title", content="Text", image=jpeg_with_exif()
+        )
+        process_post_image(post.id, post.image.name)
+        post.refresh_from_db()
+        old_names = [post.image.name, *post.image_variants.values()]
+
+        with mock.patch("social_media.views.process_post_image.delay"), mock.patch(
+            "social_media.views.delete_images.delay", side_effect=delete_images
+        ), self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse("social_media:post-detail", args=[post.id]),
+                {"image": jpeg_with_exif(name="other.jpg")},
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any(default_storage.exists(name) for name in old_names))
+        post.refresh_from_db()
+        self.assertTrue(default_storage.exists(post.image.name))
+
+    def test_list_returns_variant_urls(self):
+        post = Post.objects.create(
+            user=self.user, title="Title", content="Text", image=jpeg_with_exif()
+        )
+        process_post_image(post.id, post.image.name)
+        profile = Profile.objects.create(
+            user=self.user, profile_picture=jpeg_with_exif()
+        )
+        process_profile_picture(profile.id, profile.profile_picture.name)
+
+        post_data = self.client.get(POST_URL).data["results"][0]
+        profile_data = self.client.get(PROFILE_URL).data["results"][0]
+
+        self.assertTrue(
+            post_data["image_variants"]["thumbnail_webp"].startswith("http://")
+        )
+        self.assertTrue(
+            profile_data["profile_picture_variants"]["thumbnail"].endswith(".jpg")
+        )
+
+    def test_unprocessed_image_has_no_variants(self):
+        Post.objects.create(user=self.user, title="Title", content="Text")
+
+        response = self.client.get(POST_URL)
+
+        self.assertIsNone(response.data["results"][0]["image_variants"])
@@ -0,0 +1,109 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+from social_media.models import Post
+from social_media.tasks import rebuild_timeline
+
+POST_URL = reverse("social_media:post-list")
+LABELS = {"view": "PostViewSet", "action": "list"}
+
+
+class PrometheusMetricsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        Post.objects.create(user=self.user, title="Test Title", content="Content")
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, {**LABELS, **labels}) or 0
+
+    def test_request_is_instrumented(self):
+        latency = self.sample(
+            "http_request_duration_seconds_count", method="GET", status="200"
+        )
+        queries = self.sample("http_request_db_queries_sum")
+        renders = self.sample("http_response_renderer_duration_seconds_count")
+        sizes = self.sample("http_response_size_bytes_count")
+
+        self.client.get(POST_URL)
+
+        self.assertEqual(
+            self.sample(
+                "http_request_duration_seconds_count", method="GET", status="200"
+            ),
+            latency + 1,
+        )
+        self.assertGreater(self.sample("http_request_db_queries_sum"), queries)
+        self.assertEqual(
+            self.sample("http_response_renderer_duration_seconds_count"), renders + 1
+        )
+        self.assertEqual(self.sample("http_response_size_bytes_count"), sizes + 1)
+
+    def test_serialization_is_instrumented(self):
+        name = "http_response_serialization_duration_seconds_count"
+        before = self.sample(name, serializer="PostListSerializer")
+
+        self.client.get(POST_URL)
+
+        self.assertEqual(self.sample(name, serializer="PostListSerializer"), before + 1)
+
+    def test_async_views_share_the_viewset_labels(self):
+        post = Post.objects.get()
+        requests = {
+            "my_posts": lambda: self.client.get(reverse("social_media:post-my-posts")),
+            "retrieve": lambda: self.client.get(
+                reverse("social_media:post-detail", args=[post.id])
+            ),
+            "partial_update": lambda: self.client.patch(
+                reverse("social_media:post-detail", args=[post.id]), {"title": "New"}
+            ),
+        }
+
+        for action, request in requests.items():
+            with self.subTest(action=action):
+                before = self.sample("http_request_db_queries_count", action=action)
+
+                request()
+
+                self.assertEqual(
+                    self.sample("http_request_db_queries_count", action=action),
+                    before + 1,
+                )
+
+    def test_metrics_endpoint(self):
+        self.client.get(POST_URL)
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"http_request_duration_seconds_bucket", response.content)
+
+    def test_metrics_endpoint_is_internal(self):
+        url = reverse("metrics")
+
+        response = self.client.get(url, REMOTE_ADDR="203.0.113.7")
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_login(
+            get_user_model().objects.create_user(
+                "admin@user.com", "testpassword", is_staff=True
+            )
+        )
+        response = self.client.get(url, REMOTE_ADDR="203.0.113.7")
+        self.assertEqual(response.status_code, 200)
+
+    def test_task_duration(self):
+        labels = {"task": rebuild_timeline.name, "state": "SUCCESS"}
+        before = REGISTRY.get_sample_value("celery_task_duration_seconds_count", labels)
+
+        rebuild_timeline.apply(args=[self.user.id])
+
+        self.assertEqual(
+            REGISTRY.get_sample_value("celery_task_duration_seconds_count", labels),
+            (before or 0) + 1,
+        )
@@ -0,0 +1,101 @@
+import base64
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from social_media.models import Profile, Follow, Post
+
+POST_URL = reverse("social_media:post-list")
+MY_POSTS_URL = reverse("social_media:post-my-posts")
+FOLLOWING_POSTS_URL = reverse("social_media:post-following-posts")
+TRENDING_URL = reverse("social_media:post-trending")
+
+
+def cursor(*values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.client.force_authenticate(self.user)
+
+    def collect(self, url):
+        ids = []
+
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [item["id"] for item in response.data["results"]]
+            url = response.data["next"]
+        return ids
+
+    def test_pages_walk_whole_list_newest_first(self):
+        posts = [
+            Post.objects.create(user=self.user, title=f"Title {i}", content="Text")
+            for i in range(5)
+        ]
+        Post.objects.update(created_at=timezone.now())
+
+        ids = self.collect(f"{POST_URL}?page_size=2")
+
+        self.assertEqual(ids, [post.id for post in reversed(posts)])
+
+    def test_custom_action_is_paginated(self):
+        for i in range(3):
+            Post.objects.create(user=self.user, title=f"Title {i}", content="Text")
+
+        response = self.client.get(f"{MY_POSTS_URL}?page_size=2")
+
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+        self.assertEqual(len(self.collect(f"{MY_POSTS_URL}?page_size=2")), 3)
+
+    def test_followers_are_paginated(self):
+        profile = Profile.objects.create(user=self.user, bio="Bio")
+
+        for i in range(3):
+            follower = get_user_model().objects.create_user(
+                f"follower{i}@user.com", "testpassword"
+            )
+            Follow.objects.create(user=follower, following=profile)
+
+        url = reverse("social_media:profile-followers", args=[profile.id])
+        response = self.client.get(f"{url}?page_size=2")
+
+        self.assertEqual(len(response.data["results"]), 2)
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNone(response.data["next"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f"{POST_URL}?cursor=invalid")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tampered_cursor(self):
+        cursors = [
+            cursor("not-a-date", 5),
+            cursor(1, 2),
+            cursor("2024-01-01T00:00:00", "abc"),
+            cursor("2024-01-01T00:00:00", True),
+            cursor("2024-01-01T00:00:00", [5]),
+        ]
+
+        for url in (POST_URL, MY_POSTS_URL, FOLLOWING_POSTS_URL):
+            for value in cursors:
+                with self.subTest(url=url, cursor=value):
+                    response = self.client.get(f"{url}?cursor={value}")
+                    self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(f"{TRENDING_URL}?cursor={cursor('high', 1)}")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(f"{TRENDING_URL}?cursor={cursor(1, 1)}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
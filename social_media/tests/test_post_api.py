@@ -1,13 +1,14 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 from social_media.models import Post, Like
+from social_media.relationships import Relationships
 from social_media.serializers import PostListSerializer, PostDetailSerializer
 
 POST_URL = reverse("social_media:post-list")
-POST_LIKE_URL = reverse("social_media:post-like-toggle", args=[1])
 
 
 class UnauthenticatedPostApiTests(TestCase):
@@ -21,6 +22,7 @@ class UnauthenticatedPostApiTests(TestCase):
 
 class AuthenticatedPostApiTest(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             "test@user.com", "testpassword"
@@ -32,10 +34,12 @@ class AuthenticatedPostApiTest(TestCase):
 
         response = self.client.get(POST_URL)
         posts = Post.objects.all()
-        serializer = PostListSerializer(posts, many=True)
+        serializer = PostListSerializer(
+            posts, many=True, context={"relationships": Relationships(self.user.id)}
+        )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data["results"], serializer.data)
 
     def test_post_retrieve(self):
         test_post = Post.objects.create(
@@ -76,15 +80,16 @@ class LikeToggleActionTest(TestCase):
         )
 
     def test_like_toggle(self):
-        response = self.client.get(POST_LIKE_URL)
+        url = reverse("social_media:post-like-toggle", args=[self.post.id])
 
-        updated_post = Post.objects.get(pk=self.post.id)
+        response = self.client.post(url)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["detail"], "Successfully liked the post.")
+        self.assertTrue(self.post.post_likes.filter(user=self.user).exists())
 
-        if Like.objects.filter(user=self.user, post=self.post).exists():
-            self.assertEqual(response.data["detail"], "Successfully liked the post.")
-            self.assertFalse(updated_post.likes.filter(user=self.user).exists())
-        else:
-            self.assertEqual(response.data["detail"], "Successfully unliked the post.")
-            self.assertTrue(updated_post.likes.filter(user=self.user).exists())
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["detail"], "Successfully unliked the post.")
+        self.assertFalse(self.post.post_likes.filter(user=self.user).exists())
@@ -0,0 +1,68 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from social_media.models import Post, Commentary
+
+
+def comments_url(post_id):
+    return reverse("social_media:post-comments", args=[post_id])
+
+
+class PostCommentsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.post = Post.objects.create(user=self.user, title="Title", content="Text")
+        self.quiet = Post.objects.create(user=self.user, title="Quiet", content="Text")
+        self.comments = [
+            Commentary.objects.create(user=self.user, post=self.post, content=f"{i}")
+            for i in range(5)
+        ]
+
+    def test_pages_newest_first(self):
+        first = self.client.get(comments_url(self.post.id), {"page_size": 3})
+        second = self.client.get(first.data["next"])
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [comment["content"] for comment in first.data["results"]],
+            ["4", "3", "2"],
+        )
+        self.assertEqual(
+            [comment["content"] for comment in second.data["results"]], ["1", "0"]
+        )
+        self.assertIsNone(second.data["next"])
+        self.assertEqual(
+            first.data["results"][0],
+            {
+                "id": self.comments[4].id,
+                "user": self.user.id,
+                "content": "4",
+                "created_at": first.data["results"][0]["created_at"],
+            },
+        )
+
+    def test_post_is_not_loaded(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(comments_url(self.post.id))
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn(Post._meta.db_table, queries[0]["sql"])
+
+    def test_post_without_comments(self):
+        response = self.client.get(comments_url(self.quiet.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [])
+
+    def test_missing_post(self):
+        response = self.client.get(comments_url(self.quiet.id + 1))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
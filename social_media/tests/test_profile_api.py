@@ -1,5 +1,9 @@
+from unittest import skipUnless
+
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -37,7 +41,7 @@ class AuthenticatedProfileApiTest(TestCase):
         serializer = ProfileListSerializer(profiles, many=True)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data["results"], serializer.data)
 
     def test_owner_required(self):
         other_user_profile = Profile.objects.create(
@@ -49,3 +53,55 @@ class AuthenticatedProfileApiTest(TestCase):
         response = self.client.put(url, {"bio": "Updated Bio"})
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_owner_can_update_profile(self):
+        profile = Profile.objects.create(user=self.user, bio="My bio")
+
+        url = reverse("social_media:profile-detail", args=[profile.id])
+
+        response = self.client.put(url, {"bio": "Updated Bio"})
+
+        profile.refresh_from_db()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(profile.bio, "Updated Bio")
+
+
+class ProfileFilterQueryTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.client.force_authenticate(self.user)
+
+        for i in range(5):
+            user = get_user_model().objects.create_user(
+                f"user{i}@mail.com", "testpassword"
+            )
+            Profile.objects.create(user=user, bio=f"Python developer {i}")
+
+    def test_filters_do_not_deduplicate(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                PROFILE_URL, {"bio": "python", "user_email": "mail"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertEqual(len(queries), 1)
+        for query in queries:
+            self.assertNotIn("DISTINCT", query["sql"].upper())
+
+    @skipUnless(connection.vendor == "postgresql", "Trigram indexes need PostgreSQL")
+    def test_filters_use_trigram_indexes(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+
+        plan = (
+            Profile.objects.filter(bio__icontains="python")
+            .filter(user__email__icontains="mail")
+            .explain()
+        )
+
+        self.assertIn("social_media_profile_bio_trgm", plan)
+        self.assertIn("users_user_email_trgm", plan)
@@ -0,0 +1,274 @@
+import json
+import os
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from social_media import search, suggestions, trending
+from social_media.models import (
+    Profile,
+    Follow,
+    Post,
+    Like,
+    Commentary,
+    TimelineEntry,
+    ScheduledPost,
+)
+
+BUDGETS_FILE = Path(__file__).with_name("query_budgets.json")
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class QueryBudgetTests(TestCase):
+    """
+    Every endpoint is measured on N and 10N seeded rows: the number of
+    queries must not grow with the data and must stay within the budget
+    recorded in query_budgets.json. Run with UPDATE_QUERY_BUDGETS=1 to
+    rewrite the baseline after an intended change.
+    """
+
+    N = 3
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "viewer@user.com", "testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.profile = Profile.objects.create(user=self.user, bio="Viewer")
+        self.author = get_user_model().objects.create_user(
+            "author@user.com", "testpassword"
+        )
+        self.author_profile = Profile.objects.create(user=self.author, bio="Author")
+        self.post = Post.objects.create(user=self.author, title="Title", content="Text")
+        search.index_post(self.post)
+        self.seeded = 0
+
+    def seed(self, count):
+        """Add `count` users that follow, like, comment and post around the viewer"""
+        for _ in range(count):
+            self.seeded += 1
+            user = get_user_model().objects.create_user(
+                f"user{self.seeded}@user.com", "testpassword"
+            )
+            profile = Profile.objects.create(user=user, bio=f"Bio {self.seeded}")
+            Follow.objects.create(user=user, following=self.profile)
+            Follow.objects.create(user=self.user, following=profile)
+            Follow.objects.create(user=user, following=self.author_profile)
+            Like.objects.create(user=user, post=self.post)
+            Commentary.objects.create(user=user, post=self.post, content="Comment")
+
+            post = Post.objects.create(user=user, title="Title", content="Text")
+            # PostgreSQL's trigger indexes the post already, so search finds rows
+            search.index_post(post)
+            TimelineEntry.objects.create(
+                owner=self.user, post=post, created_at=post.created_at
+            )
+            Like.objects.create(user=self.user, post=post)
+            Post.objects.create(user=self.user, title="Mine", content="Text")
+            self.new_scheduled_post()
+
+        with override_settings(TRENDING_SETTLE_TIME=0):
+            trending.update_scores(settings.TRENDING_BATCH_SIZE)
+        suggestions.refresh(workers=1)
+
+    def new_post(self, user=None):
+        return Post.objects.create(
+            user=user or self.author, title="Fresh", content="Text"
+        )
+
+    def new_scheduled_post(self):
+        return ScheduledPost.objects.create(
+            user=self.user,
+            title="Later",
+            content="Text",
+            publish_at=timezone.now() + timedelta(days=1),
+        )
+
+    def new_user(self):
+        self.seeded += 1
+        return get_user_model().objects.create_user(
+            f"user{self.seeded}@user.com", "testpassword"
+        )
+
+    def new_profile(self):
+        return Profile.objects.create(user=self.new_user(), bio="Fresh")
+
+    def new_comment(self):
+        return Commentary.objects.create(
+            user=self.user, post=self.post, content="Comment"
+        )
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def endpoints(self):
+        """Endpoint name -> preparation returning the request to measure"""
+        get, post, put = self.client.get, self.client.post, self.client.put
+        delete = self.client.delete
+
+        def url(name, *args):
+            return reverse(f"social_media:{name}", args=args)
+
+        return {
+            "post-list": lambda: partial(get, url("post-list")),
+            "post-search": lambda: partial(get, url("post-list"), {"q": "title"}),
+            "post-create": lambda: partial(
+                post, url("post-list"), {"title": "New", "content": "Text"}
+            ),
+            "post-detail": lambda: partial(get, url("post-detail", self.post.id)),
+            "post-update": lambda: partial(
+                put,
+                url("post-detail", self.new_post(self.user).id),
+                {"title": "Updated", "content": "Text"},
+            ),
+            "post-destroy": lambda: partial(
+                delete, url("post-detail", self.new_post(self.user).id)
+            ),
+            "post-my-posts": lambda: partial(get, url("post-my-posts")),
+            "post-following-posts": lambda: partial(get, url("post-following-posts")),
+            "post-like-toggle": lambda: partial(
+                post, url("post-like-toggle", self.new_post().id)
+            ),
+            "post-batch-like": lambda: partial(
+                post,
+                url("post-batch-like"),
+                {
+                    "operations": [
+                        {"post": self.new_post().id, "action": "like"}
+                        for _ in range(self.seeded)
+                    ]
+                },
+                format="json",
+            ),
+            "post-trending": lambda: partial(get, url("post-trending")),
+            "post-export-my-posts": lambda: partial(get, url("post-export-my-posts")),
+            "post-export-my-likes": lambda: partial(get, url("post-export-my-likes")),
+            "post-comments": lambda: partial(get, url("post-comments", self.post.id)),
+            "post-add-comment": lambda: partial(
+                post, url("post-add-comment", self.post.id), {"content": "Comment"}
+            ),
+            "post-schedule-post-creation": lambda: partial(
+                post,
+                url("post-schedule-post-creation"),
+                {
+                    "title": "Later",
+                    "content": "Text",
+                    "scheduled_time": "2100-01-01 00:00:00.000000+0000",
+                },
+            ),
+            "scheduled-post-list": lambda: partial(get, url("scheduled-post-list")),
+            "scheduled-post-detail": lambda: partial(
+                get, url("scheduled-post-detail", self.new_scheduled_post().id)
+            ),
+            "scheduled-post-cancel": lambda: partial(
+                post, url("scheduled-post-cancel", self.new_scheduled_post().id)
+            ),
+            "scheduled-post-reschedule": lambda: partial(
+                post,
+                url("scheduled-post-reschedule", self.new_scheduled_post().id),
+                {"publish_at": "2100-01-01 00:00:00.000000+0000"},
+            ),
+            "profile-list": lambda: partial(get, url("profile-list")),
+            "profile-create": lambda: partial(
+                self.client_for(self.new_user()).post,
+                url("profile-list"),
+                {"bio": "New"},
+            ),
+            "profile-detail": lambda: partial(
+                get, url("profile-detail", self.profile.id)
+            ),
+            "profile-update": lambda: partial(
+                put, url("profile-detail", self.profile.id), {"bio": "Updated"}
+            ),
+            "profile-destroy": lambda: partial(
+                self.client_for((profile := self.new_profile()).user).delete,
+                url("profile-detail", profile.id),
+            ),
+            "profile-followers": lambda: partial(
+                get, url("profile-followers", self.profile.id)
+            ),
+            "profile-following": lambda: partial(
+                get, url("profile-following", self.profile.id)
+            ),
+            "profile-export-followers": lambda: partial(
+                get, url("profile-export-followers", self.profile.id)
+            ),
+            "profile-export-following": lambda: partial(
+                get, url("profile-export-following", self.profile.id)
+            ),
+            "profile-suggestions": lambda: partial(get, url("profile-suggestions")),
+            "profile-follow-toggle": lambda: partial(
+                post, url("profile-follow-toggle", self.new_profile().id)
+            ),
+            "profile-batch-follow": lambda: partial(
+                post,
+                url("profile-batch-follow"),
+                {
+                    "operations": [
+                        {"profile": self.new_profile().id, "action": "follow"}
+                        for _ in range(self.seeded)
+                    ]
+                },
+                format="json",
+            ),
+            "relationships": lambda: partial(
+                get,
+                url("relationships"),
+                {
+                    "posts": list(Post.objects.values_list("id", flat=True)),
+                    "profiles": list(Profile.objects.values_list("id", flat=True)),
+                },
+            ),
+            "commentary-list": lambda: partial(get, url("commentary-list")),
+            "commentary-detail": lambda: partial(
+                get, url("commentary-detail", Commentary.objects.first().id)
+            ),
+            "commentary-destroy": lambda: partial(
+                delete, url("commentary-detail", self.new_comment().id)
+            ),
+        }
+
+    def measure(self):
+        counts = {}
+
+        for name, prepare in self.endpoints().items():
+            request = prepare()
+            cache.clear()
+
+            with CaptureQueriesContext(connection) as queries:
+                response = request()
+
+                # A streamed body runs its queries while it is consumed
+                if response.streaming:
+                    b"".join(response.streaming_content)
+
+            self.assertLess(response.status_code, 400, name)
+            counts[name] = len(queries)
+        return counts
+
+    def test_query_counts_are_constant_and_within_budget(self):
+        self.seed(self.N)
+        small = self.measure()
+        self.seed(9 * self.N)
+        large = self.measure()
+
+        if os.environ.get("UPDATE_QUERY_BUDGETS"):
+            BUDGETS_FILE.write_text(json.dumps(large, indent=2, sort_keys=True) + "\n")
+        budgets = json.loads(BUDGETS_FILE.read_text())
+
+        for name in large:
+            with self.subTest(endpoint=name):
+                self.assertEqual(small[name], large[name])
+                self.assertLessEqual(large[name], budgets[name])
@@ -0,0 +1,110 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from social_media import suggestions, trending
+from social_media.models import Profile, Post
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+def full_scans(sql):
+    """Tables the query reads in full, according to the database's EXPLAIN"""
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # Tiny test tables are cheaper to scan; only report missing indexes
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = cursor.fetchone()[0][0]["Plan"]
+            return [
+                node["Relation Name"]
+                for node in plan_nodes(plan)
+                if node["Node Type"] == "Seq Scan"
+            ]
+
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [
+            detail
+            for *_, detail in cursor.fetchall()
+            if detail.startswith("SCAN ")
+            and " USING " not in detail
+            and detail != "SCAN CONSTANT ROW"
+        ]
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    TIMELINE_FANOUT_LIMIT=5,
+)
+class QueryPlanTests(TestCase):
+    """
+    Hot read endpoints run on a seeded social graph; every query they
+    send must be served by indexes instead of a sequential scan.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            "seed_social_graph",
+            users=60,
+            posts_per_user=3,
+            follows_per_user=8,
+            seed=19,
+            with_timelines=True,
+            stdout=StringIO(),
+        )
+        cls.popular = Profile.objects.order_by("-followers_count").first()
+        cls.viewer = cls.popular.follows.first().user
+        cls.post = Post.objects.filter(comments_count__gt=0).first()
+        with override_settings(TRENDING_SETTLE_TIME=0):
+            trending.update_scores(10_000)
+        suggestions.refresh(workers=1)
+
+    def endpoints(self):
+        url = reverse
+        return {
+            "post-list": url("social_media:post-list"),
+            "post-detail": url("social_media:post-detail", args=[self.post.id]),
+            "post-my-posts": url("social_media:post-my-posts"),
+            "post-following-posts": url("social_media:post-following-posts"),
+            "post-trending": url("social_media:post-trending"),
+            "post-comments": url("social_media:post-comments", args=[self.post.id]),
+            "profile-list": url("social_media:profile-list"),
+            "profile-suggestions": url("social_media:profile-suggestions"),
+            "profile-detail": url(
+                "social_media:profile-detail", args=[self.popular.id]
+            ),
+            "profile-followers": url(
+                "social_media:profile-followers", args=[self.popular.id]
+            ),
+            "profile-following": url(
+                "social_media:profile-following", args=[self.popular.id]
+            ),
+            "commentary-list": url("social_media:commentary-list"),
+        }
+
+    def test_hot_queries_use_indexes(self):
+        client = APIClient()
+        client.force_authenticate(self.viewer)
+
+        for name, path in self.endpoints().items():
+            cache.clear()
+
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(path, {"page_size": 5})
+            self.assertEqual(response.status_code, 200, name)
+
+            for query in queries:
+                if not query["sql"].startswith("SELECT"):
+                    continue
+                with self.subTest(endpoint=name, sql=query["sql"]):
+                    self.assertEqual(full_scans(query["sql"]), [])
@@ -0,0 +1,146 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from social_media.models import Profile, Follow, Post, Like, TimelineEntry
+
+RELATIONSHIPS_URL = reverse("social_media:relationships")
+POST_URL = reverse("social_media:post-list")
+FOLLOWING_POSTS_URL = reverse("social_media:post-following-posts")
+
+
+@mock.patch("social_media.views.backfill_timeline.delay")
+@mock.patch("social_media.views.remove_from_timeline.delay")
+class RelationshipTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.author = get_user_model().objects.create_user(
+            "author@user.com", "testpassword"
+        )
+        self.profile = Profile.objects.create(
+            user=self.author, bio="Author", followers_count=1
+        )
+        self.other = Profile.objects.create(user=self.user, bio="Viewer")
+        self.posts = [
+            Post.objects.create(user=self.author, title=f"Title {i}", content="Text")
+            for i in range(3)
+        ]
+        Like.objects.create(user=self.user, post=self.posts[1])
+        Follow.objects.create(user=self.user, following=self.profile)
+
+        token = Token.objects.create(user=self.user)
+        self.headers = {"authorization": f"Token {token}"}
+
+    def lookup(self, **params):
+        return self.client.get(RELATIONSHIPS_URL, params, headers=self.headers)
+
+    def toggle(self, name, pk):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse(f"social_media:{name}", args=[pk]), headers=self.headers
+            )
+
+    def test_lookup_is_one_query_per_relation(self, *mocks):
+        posts = [post.id for post in self.posts]
+        profiles = [self.profile.id, self.other.id]
+
+        # One more query authenticates the token
+        with self.assertNumQueries(3):
+            response = self.lookup(posts=posts, profiles=profiles)
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.lookup(posts=posts, profiles=profiles).data, response.data
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["posts"],
+            [
+                {"id": self.posts[0].id, "is_liked": False},
+                {"id": self.posts[1].id, "is_liked": True},
+                {"id": self.posts[2].id, "is_liked": False},
+            ],
+        )
+        self.assertEqual(
+            response.data["profiles"],
+            [
+                {"id": self.profile.id, "is_following": True},
+                {"id": self.other.id, "is_following": False},
+            ],
+        )
+
+    def test_toggles_invalidate_the_cached_sets(self, *mocks):
+        self.lookup(posts=[self.posts[0].id], profiles=[self.profile.id])
+
+        self.toggle("post-like-toggle", self.posts[0].id)
+        self.toggle("profile-follow-toggle", self.profile.id)
+        response = self.lookup(posts=[self.posts[0].id], profiles=[self.profile.id])
+
+        self.assertTrue(response.data["posts"][0]["is_liked"])
+        self.assertFalse(response.data["profiles"][0]["is_following"])
+
+    def test_batch_like_invalidates_the_cached_set(self, *mocks):
+        self.lookup(posts=[self.posts[2].id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("social_media:post-batch-like"),
+                {"operations": [{"post": self.posts[2].id, "action": "like"}]},
+                content_type="application/json",
+                headers=self.headers,
+            )
+
+        self.assertTrue(
+            self.lookup(posts=[self.posts[2].id]).data["posts"][0]["is_liked"]
+        )
+
+    def test_invalid_ids(self, *mocks):
+        response = self.lookup(posts=["first"])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_post_list_flags(self, *mocks):
+        Post.objects.create(user=self.user, title="Own", content="Text")
+        self.client.get(POST_URL, headers=self.headers)
+
+        # The token and the page, whatever the number of posts
+        with self.assertNumQueries(2):
+            response = self.client.get(POST_URL, headers=self.headers)
+
+        flags = {
+            post["title"]: (post["is_liked"], post["is_following"])
+            for post in response.data["results"]
+        }
+        self.assertEqual(
+            flags,
+            {
+                "Own": (False, False),
+                "Title 0": (False, True),
+                "Title 1": (True, True),
+                "Title 2": (False, True),
+            },
+        )
+
+    def test_following_posts_poll_sees_new_like(self, *mocks):
+        TimelineEntry.objects.create(
+            owner=self.user, post=self.posts[0], created_at=self.posts[0].created_at
+        )
+        response = self.client.get(FOLLOWING_POSTS_URL, headers=self.headers)
+        headers = {**self.headers, "if-none-match": response["ETag"]}
+        self.assertFalse(response.json()["results"][0]["is_liked"])
+
+        polled = self.client.get(FOLLOWING_POSTS_URL, headers=headers)
+        self.assertEqual(polled.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.toggle("post-like-toggle", self.posts[0].id)
+        polled = self.client.get(FOLLOWING_POSTS_URL, headers=headers)
+
+        self.assertEqual(polled.status_code, status.HTTP_200_OK)
+        self.assertTrue(polled.json()["results"][0]["is_liked"])
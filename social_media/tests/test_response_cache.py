@@ -0,0 +1,100 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from social_media import response_cache
+from social_media.models import Profile, Post
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "test2@user.com", "testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.post = Post.objects.create(
+            user=self.other_user, title="Test Title", content="Test Content"
+        )
+        self.post_url = reverse("social_media:post-detail", args=[self.post.id])
+
+    def test_detail_is_served_from_cache(self):
+        self.client.get(self.post_url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.post_url)
+
+        self.assertEqual(response.data["title"], "Test Title")
+        self.assertEqual(len(queries), 0)
+
+    def test_like_toggle_invalidates_post_detail(self):
+        self.client.get(self.post_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("social_media:post-like-toggle", args=[self.post.id])
+            )
+        response = self.client.get(self.post_url)
+
+        self.assertEqual(len(response.data["likes"]), 1)
+
+    def test_follow_toggle_invalidates_profile_detail(self):
+        profile = Profile.objects.create(user=self.other_user, bio="Bio")
+        url = reverse("social_media:profile-detail", args=[profile.id])
+        self.client.get(url)
+
+        with mock.patch("social_media.views.backfill_timeline.delay"):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(
+                    reverse("social_media:profile-follow-toggle", args=[profile.id])
+                )
+        response = self.client.get(url)
+
+        self.assertEqual(response.data["followers"], [{"user": "test@user.com"}])
+
+    def test_stale_entry_is_served_while_locked(self):
+        compute_calls = []
+
+        async def compute():
+            compute_calls.append(1)
+            return len(compute_calls)
+
+        get = async_to_sync(response_cache.aget_versioned)
+        version, payload = get("post", 1, compute)
+        self.assertEqual(payload, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response_cache.bump_version("post", 1)
+        cache.add("post:1:lock", True)
+
+        self.assertEqual(get("post", 1, compute), (version, 1))
+
+        cache.delete("post:1:lock")
+        self.assertEqual(get("post", 1, compute)[1], 2)
+
+    def test_cold_miss_keeps_the_lock_of_another_worker(self):
+        async def compute():
+            return 1
+
+        cache.add("post:1:lock", True)
+
+        self.assertEqual(
+            async_to_sync(response_cache.aget_versioned)("post", 1, compute)[1], 1
+        )
+        self.assertTrue(cache.get("post:1:lock"))
+
+    @override_settings(RESPONSE_CACHE_VERSION_TIMEOUT=0)
+    def test_versions_expire(self):
+        response_cache.get_version("post", 1)
+
+        self.assertIsNone(cache.get("post:1:version"))
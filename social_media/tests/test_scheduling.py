@@ -0,0 +1,142 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from social_media import scheduling
+from social_media.models import Post, ScheduledPost
+from social_media.tasks import publish_scheduled_posts
+
+SCHEDULE_URL = reverse("social_media:post-schedule-post-creation")
+SCHEDULED_POSTS_URL = reverse("social_media:scheduled-post-list")
+
+
+def cancel_url(scheduled_post_id):
+    return reverse("social_media:scheduled-post-cancel", args=[scheduled_post_id])
+
+
+def reschedule_url(scheduled_post_id):
+    return reverse("social_media:scheduled-post-reschedule", args=[scheduled_post_id])
+
+
+class ScheduledPostTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.other = get_user_model().objects.create_user(
+            "other@user.com", "testpassword"
+        )
+
+    def schedule(self, user=None, delta=timedelta(hours=1), title="Title"):
+        return ScheduledPost.objects.create(
+            user=user or self.user,
+            title=title,
+            content="Text",
+            publish_at=timezone.now() + delta,
+        )
+
+    def test_publish_due_only(self):
+        due = self.schedule(delta=-timedelta(minutes=1), title="Due")
+        pending = self.schedule(title="Pending")
+
+        posts = scheduling.publish_due(10)
+
+        self.assertEqual([post.title for post in posts], ["Due"])
+        self.assertEqual(Post.objects.get().user, self.user)
+        self.assertFalse(ScheduledPost.objects.filter(id=due.id).exists())
+        self.assertTrue(ScheduledPost.objects.filter(id=pending.id).exists())
+
+    def test_publish_in_batches(self):
+        for i in range(5):
+            self.schedule(delta=-timedelta(minutes=5 - i), title=f"Title {i}")
+
+        self.assertEqual(len(scheduling.publish_due(2)), 2)
+        self.assertEqual(
+            list(Post.objects.order_by("id").values_list("title", flat=True)),
+            ["Title 0", "Title 1"],
+        )
+
+        with mock.patch("social_media.tasks.fan_out_post.delay") as delay:
+            self.assertEqual(publish_scheduled_posts(), 3)
+
+        self.assertEqual(delay.call_count, 3)
+        self.assertEqual(Post.objects.count(), 5)
+        self.assertFalse(ScheduledPost.objects.exists())
+
+    def test_schedule_post_creation(self):
+        response = self.client.post(
+            SCHEDULE_URL,
+            {
+                "title": "Title",
+                "content": "Text",
+                "scheduled_time": "2100-01-01 00:00:00.000000+0000",
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        scheduled_post = ScheduledPost.objects.get(id=response.data["id"])
+        self.assertEqual(scheduled_post.user, self.user)
+        self.assertEqual(scheduled_post.publish_at.year, 2100)
+        self.assertFalse(Post.objects.exists())
+
+    def test_schedule_in_the_past(self):
+        response = self.client.post(
+            SCHEDULE_URL,
+            {
+                "title": "Title",
+                "content": "Text",
+                "scheduled_time": "2000-01-01 00:00:00.000000+0000",
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ScheduledPost.objects.exists())
+
+    def test_list_own_scheduled_posts(self):
+        later = self.schedule(delta=timedelta(hours=2))
+        sooner = self.schedule(delta=timedelta(hours=1))
+        self.schedule(user=self.other)
+
+        response = self.client.get(SCHEDULED_POSTS_URL)
+
+        self.assertEqual(
+            [row["id"] for row in response.data["results"]], [sooner.id, later.id]
+        )
+
+    def test_cancel(self):
+        scheduled_post = self.schedule()
+        other = self.schedule(user=self.other)
+
+        response = self.client.post(cancel_url(scheduled_post.id))
+        missing = self.client.post(cancel_url(other.id))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(list(ScheduledPost.objects.all()), [other])
+
+    def test_reschedule(self):
+        scheduled_post = self.schedule()
+        other = self.schedule(user=self.other)
+        publish_at = (timezone.now() + timedelta(days=3)).replace(microsecond=0)
+
+        response = self.client.post(
+            reschedule_url(scheduled_post.id), {"publish_at": publish_at}
+        )
+        missing = self.client.post(reschedule_url(other.id), {"publish_at": publish_at})
+        past = self.client.post(
+            reschedule_url(scheduled_post.id),
+            {"publish_at": timezone.now() - timedelta(days=1)},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        scheduled_post.refresh_from_db()
+        self.assertEqual(scheduled_post.publish_at, publish_at)
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(past.status_code, status.HTTP_400_BAD_REQUEST)
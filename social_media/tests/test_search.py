@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from social_media import search
+from social_media.models import Post
+
+POST_URL = reverse("social_media:post-list")
+
+
+class PostSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.client.force_authenticate(self.user)
+
+    def search(self, query, **params):
+        response = self.client.get(POST_URL, {"q": query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_tokenize(self):
+        self.assertEqual(search.tokenize("War, and PEACE!"), ["war", "and", "peace"])
+
+    def test_search_ranks_title_matches_first(self):
+        in_content = Post.objects.create(
+            user=self.user, title="Novel", content="War is everywhere"
+        )
+        in_title = Post.objects.create(
+            user=self.user, title="War", content="A long novel"
+        )
+        Post.objects.create(user=self.user, title="Peace", content="Nothing here")
+
+        for post in Post.objects.all():
+            search.index_post(post)
+
+        response = self.search("war")
+
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            [in_title.id, in_content.id],
+        )
+
+    def test_search_matches_prefixes_of_every_word(self):
+        post = Post.objects.create(
+            user=self.user, title="Programming", content="Python tutorial"
+        )
+        Post.objects.create(user=self.user, title="Programming", content="Go")
+        search.index_post(post)
+
+        response = self.search("progr pyth")
+
+        self.assertEqual([item["id"] for item in response.data["results"]], [post.id])
+
+    def test_query_without_words_matches_nothing(self):
+        search.index_post(
+            Post.objects.create(user=self.user, title="Topic", content="Text")
+        )
+
+        for query in ("!!!", " "):
+            with self.subTest(query=query):
+                self.assertEqual(self.search(query).data["results"], [])
+
+    def test_created_and_updated_posts_are_indexed(self):
+        self.client.post(POST_URL, {"title": "Kyiv", "content": "City guide"})
+        post = Post.objects.get()
+
+        self.assertEqual(len(self.search("kyiv").data["results"]), 1)
+
+        url = reverse("social_media:post-detail", args=[post.id])
+        self.client.put(url, {"title": "Lviv", "content": "City guide"})
+
+        self.assertEqual(len(self.search("kyiv").data["results"]), 0)
+        self.assertEqual(len(self.search("lviv").data["results"]), 1)
+
+    def test_ranked_results_are_paginated(self):
+        for i in range(3):
+            search.index_post(
+                Post.objects.create(user=self.user, title="Topic", content=f"Text {i}")
+            )
+
+        first_page = self.search("topic", page_size=2)
+        second_page = self.client.get(first_page.data["next"])
+
+        ids = [item["id"] for item in first_page.data["results"]]
+        ids += [item["id"] for item in second_page.data["results"]]
+        self.assertEqual(sorted(ids), sorted(Post.objects.values_list("id", flat=True)))
+        self.assertIsNone(second_page.data["next"])
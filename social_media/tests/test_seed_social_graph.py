@@ -0,0 +1,49 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from social_media import counters
+from social_media.models import Profile, Follow, Post
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class SeedSocialGraphTests(TestCase):
+    def seed(self, **options):
+        call_command(
+            "seed_social_graph", users=30, chunk_size=7, stdout=StringIO(), **options
+        )
+
+    def test_counters_match_generated_rows(self):
+        self.seed()
+
+        self.assertEqual(Profile.objects.count(), 30)
+        self.assertTrue(Follow.objects.exists())
+        self.assertTrue(Post.objects.exists())
+        self.assertEqual(counters.recount(Post.objects.all()), 0)
+        self.assertEqual(counters.recount(Profile.objects.all()), 0)
+
+    def snapshot(self):
+        return (
+            list(
+                Follow.objects.order_by(
+                    "user__email", "following__user__email"
+                ).values_list("user__email", "following__user__email")
+            ),
+            list(Post.objects.order_by("id").values_list("user__email", "title")),
+        )
+
+    def test_same_seed_generates_same_graph(self):
+        self.seed(seed=1)
+        first = self.snapshot()
+        get_user_model().objects.all().delete()
+
+        self.seed(seed=1)
+
+        self.assertEqual(self.snapshot(), first)
+
+    def test_seed_cannot_be_reused(self):
+        self.seed(seed=1)
+
+        self.assertRaises(CommandError, self.seed, seed=1)
@@ -0,0 +1,132 @@
+import subprocess
+import sys
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from Social_Media_API.celery import app
+from social_media import suggestions
+from social_media.models import Profile, Follow, FollowSuggestions
+from social_media.tasks import refresh_follow_suggestions
+
+SUGGESTIONS_URL = reverse("social_media:profile-suggestions")
+
+
+@override_settings(SUGGESTIONS_WORKERS=1, SUGGESTIONS_CHUNK_SIZE=2)
+class FollowSuggestionTests(TestCase):
+    def setUp(self):
+        self.users = [
+            get_user_model().objects.create_user(f"user{i}@user.com", "testpassword")
+            for i in range(6)
+        ]
+        self.profiles = [
+            Profile.objects.create(user=user, bio=f"Bio {i}")
+            for i, user in enumerate(self.users)
+        ]
+        # user 0 follows 1 and 2; both follow 3, only 2 follows 4 and 5
+        for follower, followed in ((0, 1), (0, 2), (1, 3), (2, 3), (2, 4), (2, 5)):
+            self.follow(follower, followed)
+
+    def follow(self, follower, followed):
+        Follow.objects.create(
+            user=self.users[follower], following=self.profiles[followed]
+        )
+
+    def test_graph_is_compressed_sparse_rows(self):
+        graph = suggestions.FollowGraph.load()
+
+        self.assertEqual(list(graph.user_ids), [user.id for user in self.users])
+        self.assertEqual(list(graph.offsets), [0, 2, 3, 6, 6, 6, 6])
+        self.assertEqual(sorted(graph.followed(0)), [1, 2])
+        self.assertEqual(sorted(graph.followed(2)), [3, 4, 5])
+
+    def test_most_shared_first(self):
+        graph = suggestions.FollowGraph.load()
+
+        self.assertEqual(
+            graph.suggest(0, 2, 10), [self.profiles[3].id, self.profiles[4].id]
+        )
+        self.assertEqual(graph.suggest(3, 2, 10), [])
+
+    def test_workers_match_inline(self):
+        graph = suggestions.FollowGraph.load()
+
+        inline = sorted(row for chunk in suggestions.compute(graph, 1) for row in chunk)
+        forked = sorted(row for chunk in suggestions.compute(graph, 2) for row in chunk)
+
+        self.assertEqual(forked, inline)
+        self.assertEqual([user_id for user_id, _ in inline], [self.users[0].id])
+
+    def test_task_runs_on_its_own_queue(self):
+        route = app.amqp.router.route({}, refresh_follow_suggestions.name)
+
+        self.assertEqual(route["queue"].name, "suggestions")
+
+    def test_eventlet_worker_computes_inline(self):
+        script = (
+            "import eventlet; eventlet.monkey_patch()\n"
+            "import django; django.setup()\n"
+            "from social_media import suggestions\n"
+            "graph = suggestions.FollowGraph.build("
+            "[1, 2, 3], [(1, 1), (2, 2), (3, 3)], [(1, 2), (2, 3)])\n"
+            "print(list(suggestions.compute(graph, 2)))\n"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "[[(1, [3])]]")
+
+    def test_refresh_replaces_stale_rows(self):
+        self.assertEqual(refresh_follow_suggestions(), 1)
+        Follow.objects.all().delete()
+        self.follow(4, 1)
+        self.follow(1, 5)
+
+        self.assertEqual(suggestions.refresh(), 1)
+
+        self.assertEqual(
+            list(FollowSuggestions.objects.values_list("user_id", "profile_ids")),
+            [(self.users[4].id, [self.profiles[5].id])],
+        )
+
+    def test_suggestions_endpoint(self):
+        suggestions.refresh()
+        self.follow(0, 4)
+        client = APIClient()
+        client.force_authenticate(self.users[0])
+
+        response = client.get(SUGGESTIONS_URL)
+
+        self.assertEqual(
+            [profile["id"] for profile in response.data],
+            [self.profiles[3].id, self.profiles[5].id],
+        )
+        self.assertEqual(response.data[0]["user_email"], "user3@user.com")
+
+    def test_no_suggestions_yet(self):
+        client = APIClient()
+        client.force_authenticate(self.users[0])
+
+        self.assertEqual(client.get(SUGGESTIONS_URL).data, [])
+
+    def test_benchmark(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark_suggestions",
+            users=50,
+            follows_per_user=5,
+            workers=[1, 2],
+            stdout=out,
+        )
+
+        self.assertIn("2 workers", out.getvalue())
@@ -0,0 +1,174 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from social_media import timeline
+from social_media.models import (
+    Profile,
+    Follow,
+    Post,
+    TimelineEntry,
+    TimelineLength,
+)
+
+FOLLOWING_POSTS_URL = reverse("social_media:post-following-posts")
+
+
+class TimelineTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.author = get_user_model().objects.create_user(
+            "author@user.com", "testpassword"
+        )
+        self.profile = Profile.objects.create(user=self.author, bio="Author")
+        Follow.objects.create(user=self.user, following=self.profile)
+
+    def test_fan_out_adds_post_to_followers(self):
+        post = Post.objects.create(user=self.author, title="Title", content="Text")
+
+        timeline.fan_out(post)
+
+        self.assertTrue(
+            TimelineEntry.objects.filter(owner=self.user, post=post).exists()
+        )
+        self.assertEqual(timeline.read_timeline(self.user, 10), [post])
+
+    def test_remove_author_on_unfollow(self):
+        post = Post.objects.create(user=self.author, title="Title", content="Text")
+        timeline.fan_out(post)
+
+        Follow.objects.filter(user=self.user).delete()
+        timeline.remove_author(self.user.id, self.author.id)
+
+        self.assertEqual(timeline.read_timeline(self.user, 10), [])
+
+    def test_backfill_and_pagination(self):
+        posts = [
+            Post.objects.create(user=self.author, title=f"Title {i}", content="Text")
+            for i in range(3)
+        ]
+
+        timeline.backfill(self.user.id, self.author.id)
+        first_page = timeline.read_timeline(self.user, 2)
+        last = first_page[-1]
+        second_page = timeline.read_timeline(
+            self.user, 2, before=(last.created_at, last.id)
+        )
+
+        self.assertEqual(first_page, posts[:0:-1])
+        self.assertEqual(second_page, posts[:1])
+
+    @override_settings(TIMELINE_MAX_LENGTH=3, TIMELINE_TRIM_SLACK=1)
+    def test_fan_out_trims_grown_timelines(self):
+        posts = [
+            Post.objects.create(user=self.author, title=f"Title {i}", content="Text")
+            for i in range(5)
+        ]
+        for post in posts[:4]:
+            timeline.fan_out(post)
+
+        self.assertEqual(TimelineEntry.objects.filter(owner=self.user).count(), 4)
+
+        timeline.fan_out(posts[4])
+
+        self.assertEqual(timeline.read_timeline(self.user, 10), posts[:1:-1])
+        self.assertEqual(TimelineLength.objects.get(owner=self.user).length, 3)
+
+    @override_settings(TIMELINE_MAX_LENGTH=3, TIMELINE_TRIM_SLACK=0)
+    def test_trim_resets_the_tracked_length(self):
+        posts = [
+            Post.objects.create(user=self.author, title=f"Title {i}", content="Text")
+            for i in range(2)
+        ]
+        timeline.backfill(self.user.id, self.author.id)
+        TimelineLength.objects.filter(owner=self.user).update(length=10)
+
+        self.assertEqual(timeline.trim(self.user.id), 0)
+
+        self.assertEqual(timeline.read_timeline(self.user, 10), posts[::-1])
+        self.assertEqual(TimelineLength.objects.get(owner=self.user).length, 2)
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=1)
+    def test_popular_author_is_pulled(self):
+        Profile.objects.update(followers_count=1)
+        post = Post.objects.create(user=self.author, title="Title", content="Text")
+
+        self.assertEqual(timeline.fan_out(post), 0)
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(timeline.read_timeline(self.user, 10), [post])
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=2)
+    def test_followers_are_backfilled_below_the_fanout_limit(self):
+        Profile.objects.update(followers_count=2)
+        post = Post.objects.create(user=self.author, title="Title", content="Text")
+        timeline.fan_out(post)
+
+        self.assertEqual(timeline.backfill_followers(self.author.id), 0)
+
+        Profile.objects.update(followers_count=1)
+
+        self.assertEqual(timeline.backfill_followers(self.author.id), 1)
+        self.assertTrue(
+            TimelineEntry.objects.filter(owner=self.user, post=post).exists()
+        )
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=2)
+    def test_crosses_fanout_limit(self):
+        self.assertTrue(timeline.crosses_fanout_limit(2, 1))
+        self.assertFalse(timeline.crosses_fanout_limit(3, 1))
+        self.assertFalse(timeline.crosses_fanout_limit(1, 1))
+
+
+class FollowingPostsActionTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_post_creation_schedules_fan_out(self):
+        with mock.patch("social_media.views.fan_out_post.delay") as fan_out_post:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    reverse("social_media:post-list"),
+                    {"title": "Title", "content": "Text"},
+                )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        fan_out_post.assert_called_once_with(Post.objects.get().id)
+
+    def test_following_posts_reads_timeline(self):
+        author = get_user_model().objects.create_user("author@user.com", "testpassword")
+        post = Post.objects.create(user=author, title="Title", content="Text")
+        Post.objects.create(user=author, title="Not fanned out", content="Text")
+        TimelineEntry.objects.create(
+            owner=self.user, post=post, created_at=post.created_at
+        )
+
+        response = self.client.get(FOLLOWING_POSTS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.data["results"]], [post.id])
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=1)
+    def test_unfollow_below_the_fanout_limit_schedules_backfill(self):
+        author = get_user_model().objects.create_user("author@user.com", "testpassword")
+        profile = Profile.objects.create(user=author, bio="Author", followers_count=1)
+        Follow.objects.create(user=self.user, following=profile)
+
+        with mock.patch("social_media.views.remove_from_timeline.delay"), mock.patch(
+            "social_media.views.backfill_follower_timelines.delay"
+        ) as backfill_follower_timelines:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    reverse("social_media:profile-follow-toggle", args=[profile.id])
+                )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        backfill_follower_timelines.assert_called_once_with(author.id)
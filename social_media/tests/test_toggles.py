@@ -0,0 +1,118 @@
+import threading
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from social_media import toggles
+from social_media.models import Profile, Follow, Post, Like
+
+
+def like_url(post_id):
+    return reverse("social_media:post-like-toggle", args=[post_id])
+
+
+def follow_url(profile_id):
+    return reverse("social_media:profile-follow-toggle", args=[profile_id])
+
+
+class ToggleTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.post = Post.objects.create(user=self.user, title="Title", content="Text")
+
+    def test_toggle(self):
+        self.assertEqual(toggles.toggle(Like, user=self.user, post=self.post), 1)
+        self.assertEqual(toggles.toggle(Like, user=self.user, post=self.post), -1)
+        self.assertFalse(Like.objects.exists())
+
+    def test_lost_insert_race(self):
+        """A row inserted between the delete and the insert is left as is"""
+        Like.objects.create(user=self.user, post=self.post)
+
+        with mock.patch.object(
+            Like.objects, "filter", return_value=Like.objects.none()
+        ):
+            change = toggles.toggle(Like, user=self.user, post=self.post)
+
+        self.assertEqual(change, 0)
+        self.assertEqual(Like.objects.count(), 1)
+
+
+@skipUnless(
+    connection.vendor == "postgresql", "SQLite locks whole tables across threads"
+)
+@mock.patch("social_media.views.backfill_timeline.delay")
+@mock.patch("social_media.views.remove_from_timeline.delay")
+class ConcurrentToggleTests(TransactionTestCase):
+    THREADS = 8
+
+    def setUp(self):
+        self.author = get_user_model().objects.create_user(
+            "author@user.com", "testpassword"
+        )
+        self.profile = Profile.objects.create(user=self.author, bio="Author")
+        self.post = Post.objects.create(user=self.author, title="Title", content="Text")
+        self.users = [
+            get_user_model().objects.create_user(f"user{i}@user.com", "testpassword")
+            for i in range(self.THREADS)
+        ]
+
+    def run_concurrently(self, requests):
+        """Send (user, url) POST requests from threads released at once"""
+        barrier = threading.Barrier(len(requests))
+        statuses = []
+
+        def send(user, url):
+            client = APIClient()
+            client.force_authenticate(user)
+            try:
+                barrier.wait()
+                statuses.append(client.post(url).status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=send, args=request) for request in requests]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return statuses
+
+    def assertCountsMatchRows(self):
+        self.post.refresh_from_db()
+        self.profile.refresh_from_db()
+        self.assertEqual(
+            self.post.likes_count, Like.objects.filter(post=self.post).count()
+        )
+        self.assertEqual(
+            self.profile.followers_count,
+            Follow.objects.filter(following=self.profile).count(),
+        )
+
+    def test_concurrent_likes_and_follows(self, *mocks):
+        statuses = self.run_concurrently(
+            [(user, like_url(self.post.id)) for user in self.users]
+            + [(user, follow_url(self.profile.id)) for user in self.users]
+        )
+
+        self.assertEqual(statuses, [201] * 2 * self.THREADS)
+        self.assertEqual(Like.objects.count(), self.THREADS)
+        self.assertEqual(Follow.objects.count(), self.THREADS)
+        self.assertCountsMatchRows()
+
+    def test_double_taps_never_duplicate(self, *mocks):
+        user = self.users[0]
+
+        self.run_concurrently(
+            [(user, like_url(self.post.id))] * self.THREADS
+            + [(user, follow_url(self.profile.id))] * self.THREADS
+        )
+
+        self.assertLessEqual(Like.objects.filter(user=user).count(), 1)
+        self.assertLessEqual(Follow.objects.filter(user=user).count(), 1)
+        self.assertCountsMatchRows()
@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from social_media import trending
+from social_media.models import Post, Like, Commentary, TrendingScore
+from social_media.tasks import update_trending_scores
+
+TRENDING_URL = reverse("social_media:post-trending")
+
+
+@override_settings(TRENDING_SETTLE_TIME=0, TRENDING_HALF_LIFE=60 * 60)
+class TrendingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [
+            get_user_model().objects.create_user(f"user{i}@user.com", "testpassword")
+            for i in range(4)
+        ]
+        self.client.force_authenticate(self.users[0])
+        self.posts = [
+            Post.objects.create(user=self.users[0], title=f"Title {i}", content="Text")
+            for i in range(3)
+        ]
+
+    def engage(self, post, likes=0, comments=0, age=timedelta(seconds=1)):
+        for user in self.users[:likes]:
+            Like.objects.create(user=user, post=post)
+        for user in self.users[:comments]:
+            Commentary.objects.create(user=user, post=post, content="Text")
+        created_at = timezone.now() - age
+        Like.objects.filter(post=post).update(created_at=created_at)
+        Commentary.objects.filter(post=post).update(created_at=created_at)
+
+    def scores(self):
+        return dict(TrendingScore.objects.values_list("post_id", "score"))
+
+    def test_recent_engagement_ranks_first(self):
+        self.engage(self.posts[0], likes=4, age=timedelta(hours=3))
+        self.engage(self.posts[1], likes=1)
+        self.engage(self.posts[2], comments=1)
+
+        update_trending_scores()
+        response = self.client.get(TRENDING_URL)
+
+        self.assertEqual(
+            [post["title"] for post in response.data["results"]],
+            ["Title 2", "Title 1", "Title 0"],
+        )
+
+    def test_image_urls_are_absolute(self):
+        Post.objects.filter(pk=self.posts[0].pk).update(image="posts/photo.jpg")
+        self.engage(self.posts[0], likes=1)
+
+        update_trending_scores()
+        response = self.client.get(TRENDING_URL)
+
+        self.assertEqual(
+            response.data["results"][0]["image"],
+            "http://testserver/media/posts/photo.jpg",
+        )
+
+    def test_updates_are_incremental(self):
+        self.engage(self.posts[0], likes=2)
+        update_trending_scores()
+        before = self.scores()[self.posts[0].id]
+
+        self.assertEqual(trending.update_scores(10), 0)
+        self.assertEqual(self.scores()[self.posts[0].id], before)
+
+        Commentary.objects.create(user=self.users[1], post=self.posts[0], content="Hi")
+        self.assertEqual(trending.update_scores(10), 1)
+        self.assertGreater(self.scores()[self.posts[0].id], before)
+
+    def test_relikes_are_not_folded_again(self):
+        self.engage(self.posts[0], likes=1)
+        update_trending_scores()
+        before = self.scores()[self.posts[0].id]
+
+        Like.objects.filter(post=self.posts[0]).delete()
+        self.engage(self.posts[0], likes=1)
+
+        self.assertEqual(trending.update_scores(10), 1)
+        self.assertEqual(self.scores()[self.posts[0].id], before)
+
+    def test_batches_match_single_pass(self):
+        self.engage(self.posts[0], likes=4, comments=3)
+        self.engage(self.posts[1], likes=2, age=timedelta(minutes=30))
+
+        self.assertEqual(update_trending_scores(), 9)
+        expected = self.scores()
+        TrendingScore.objects.all().delete()
+        trending.TrendingState.objects.all().delete()
+
+        while trending.update_scores(2):
+            pass
+
+        for post_id, score in self.scores().items():
+            self.assertAlmostEqual(score, expected[post_id])
+
+    def test_faded_posts_are_pruned(self):
+        self.engage(self.posts[0], likes=1, age=timedelta(hours=10))
+        self.engage(self.posts[1], likes=1)
+
+        update_trending_scores()
+
+        self.assertEqual(list(self.scores()), [self.posts[1].id])
+
+    def test_pages_follow_score_order(self):
+        for post, likes in zip(self.posts, (1, 3, 2)):
+            self.engage(post, likes=likes)
+        update_trending_scores()
+
+        first = self.client.get(TRENDING_URL, {"page_size": 2})
+        second = self.client.get(first.data["next"])
+
+        self.assertEqual(
+            [post["title"] for post in first.data["results"]],
+            ["Title 1", "Title 2"],
+        )
+        self.assertEqual(
+            [post["title"] for post in second.data["results"]], ["Title 0"]
+        )
+        self.assertIsNone(second.data["next"])
@@ -0,0 +1,95 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+from social_media.models import Profile, Follow, Post, Commentary
+from social_media.serializers import (
+    ValuesSerializer,
+    ProfileListSerializer,
+    FollowProfileSerializer,
+    FollowingSerializer,
+    PostListSerializer,
+    CommentaryListSerializer,
+)
+
+
+class ValuesSerializerTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.other = get_user_model().objects.create_user(
+            "other@user.com", "testpassword"
+        )
+        self.profile = Profile.objects.create(
+            user=self.user,
+            bio="Bio",
+            profile_picture="uploads/profile.jpg",
+            profile_picture_variants={"thumbnail": "uploads/profile-thumbnail.jpg"},
+        )
+        self.other_profile = Profile.objects.create(user=self.other, bio="Other")
+        Follow.objects.create(user=self.other, following=self.profile)
+        Follow.objects.create(user=self.user, following=self.other_profile)
+        Post.objects.create(
+            user=self.user,
+            title="Title",
+            content="Text",
+            image="uploads/post.jpg",
+            image_variants={"medium_webp": "uploads/post-medium.webp"},
+        )
+        Post.objects.create(user=self.other, title="Other", content="Text")
+        Commentary.objects.create(
+            user=self.other, post=Post.objects.first(), content="Comment"
+        )
+
+    def assertSameOutput(self, serializer_class, queryset, context):
+        expected = serializer_class(queryset, many=True, context=context).data
+        serializer = ValuesSerializer(serializer_class, context)
+
+        self.assertEqual(serializer.serialize(serializer.values(queryset)), expected)
+
+    def test_output_matches_model_serializers(self):
+        request = Request(RequestFactory().get("/"))
+
+        for context in ({}, {"request": request}):
+            self.assertSameOutput(
+                PostListSerializer, Post.objects.order_by("id"), context
+            )
+            self.assertSameOutput(
+                ProfileListSerializer, Profile.objects.order_by("id"), context
+            )
+            self.assertSameOutput(
+                FollowProfileSerializer, Follow.objects.order_by("id"), context
+            )
+            self.assertSameOutput(
+                FollowingSerializer, Follow.objects.order_by("id"), context
+            )
+            self.assertSameOutput(
+                CommentaryListSerializer, Commentary.objects.order_by("id"), context
+            )
+
+    def test_list_pages_follow_cursor(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        first = client.get(reverse("social_media:post-list"), {"page_size": 1})
+        second = client.get(first.data["next"])
+
+        self.assertEqual(first.data["results"][0]["title"], "Other")
+        self.assertIsNone(first.data["results"][0]["image_variants"])
+        self.assertEqual(second.data["results"][0]["title"], "Title")
+        self.assertTrue(
+            second.data["results"][0]["image"].startswith("http://testserver/")
+        )
+
+    def test_benchmark_rolls_back(self):
+        out = StringIO()
+
+        call_command("benchmark_serializers", rows=[5], repeat=1, stdout=out)
+
+        self.assertIn("FollowingSerializer", out.getvalue())
+        self.assertEqual(Post.objects.count(), 2)
@@ -0,0 +1,239 @@
+from collections import Counter, defaultdict
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import F, Q
+
+from social_media.async_utils import alist
+from social_media.models import Profile, Follow, Post, TimelineEntry, TimelineLength
+
+
+def follower_ids(author_id):
+    """Ids of the users following any profile of the author"""
+    return (
+        Follow.objects.filter(following__user_id=author_id)
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+
+
+def is_popular(author_id):
+    """Popular authors are pulled at read time instead of fanned out"""
+    return Profile.objects.filter(
+        user_id=author_id, followers_count__gte=settings.TIMELINE_FANOUT_LIMIT
+    ).exists()
+
+
+def popular_followed_users(user):
+    """Users followed by the given user that are too popular to fan out"""
+    return Follow.objects.filter(
+        user=user, following__followers_count__gte=settings.TIMELINE_FANOUT_LIMIT
+    ).values_list("following__user", flat=True)
+
+
+def _bulk_insert(entries):
+    entries = iter(entries)
+    batch_size = settings.TIMELINE_FANOUT_BATCH_SIZE
+    inserted = 0
+
+    while batch := list(islice(entries, batch_size)):
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        _grow(Counter(entry.owner_id for entry in batch))
+        inserted += len(batch)
+    return inserted
+
+
+def _grow(added):
+    """
+    Add to the tracked lengths of the timelines, owner id -> added entries,
+    and trim those grown TIMELINE_TRIM_SLACK entries past the maximum
+    """
+    TimelineLength.objects.bulk_create(
+        [TimelineLength(owner_id=owner_id) for owner_id in added],
+        ignore_conflicts=True,
+    )
+    owners_by_count = defaultdict(list)
+
+    for owner_id, count in added.items():
+        owners_by_count[count].append(owner_id)
+    for count, owner_ids in owners_by_count.items():
+        TimelineLength.objects.filter(owner_id__in=owner_ids).update(
+            length=F("length") + count
+        )
+
+    overgrown = TimelineLength.objects.filter(
+        owner_id__in=list(added),
+        length__gt=settings.TIMELINE_MAX_LENGTH + settings.TIMELINE_TRIM_SLACK,
+    ).values_list("owner_id", flat=True)
+    for owner_id in overgrown:
+        trim(owner_id)
+
+
+def fan_out(post):
+    """Push the post id into the timeline of every follower of its author"""
+    if is_popular(post.user_id):
+        return 0
+
+    followers = follower_ids(post.user_id).iterator(
+        chunk_size=settings.TIMELINE_FANOUT_BATCH_SIZE
+    )
+    return _bulk_insert(
+        TimelineEntry(owner_id=user_id, post_id=post.id, created_at=post.created_at)
+        for user_id in followers
+    )
+
+
+def _recent_posts(author_id):
+    return (
+        Post.objects.filter(user_id=author_id)
+        .order_by("-created_at", "-id")
+        .values_list("id", "created_at")[: settings.TIMELINE_MAX_LENGTH]
+    )
+
+
+def backfill(user_id, author_id):
+    """Copy recent posts of a newly followed author into the user's timeline"""
+    if is_popular(author_id):
+        return 0
+
+    return _bulk_insert(
+        TimelineEntry(owner_id=user_id, post_id=post_id, created_at=created_at)
+        for post_id, created_at in _recent_posts(author_id)
+    )
+
+
+def crosses_fanout_limit(followers_count, removed):
+    """Whether losing `removed` followers takes a profile below the fan-out limit"""
+    return followers_count >= settings.TIMELINE_FANOUT_LIMIT > followers_count - removed
+
+
+def backfill_followers(author_id):
+    """
+    Copy recent posts of an author no longer popular into the timelines of
+    all their followers: the posts written while the author was pulled at
+    read time were never fanned out.
+    """
+    if is_popular(author_id):
+        return 0
+
+    posts = list(_recent_posts(author_id))
+    followers = follower_ids(author_id).iterator(
+        chunk_size=settings.TIMELINE_FANOUT_BATCH_SIZE
+    )
+    return _bulk_insert(
+        TimelineEntry(owner_id=user_id, post_id=post_id, created_at=created_at)
+        for user_id in followers
+        for post_id, created_at in posts
+    )
+
+
+def remove_author(user_id, author_id):
+    """Drop an unfollowed author's posts unless another profile is still followed"""
+    if Follow.objects.filter(user_id=user_id, following__user_id=author_id).exists():
+        return 0
+
+    deleted, _ = TimelineEntry.objects.filter(
+        owner_id=user_id, post__user_id=author_id
+    ).delete()
+    return deleted
+
+
+def rebuild(user_id):
+    """Recreate the whole timeline of a user from the follow graph"""
+    TimelineEntry.objects.filter(owner_id=user_id).delete()
+    TimelineLength.objects.filter(owner_id=user_id).update(length=0)
+    authors = (
+        Follow.objects.filter(user_id=user_id)
+        .values_list("following__user", flat=True)
+        .distinct()
+    )
+    return sum(backfill(user_id, author_id) for author_id in authors)
+
+
+def _before(created_at, pk, pk_field):
+    return Q(created_at__lt=created_at) | Q(created_at=created_at, **{pk_field: pk})
+
+
+def trim(owner_id):
+    """
+    Delete the entries past the TIMELINE_MAX_LENGTH newest of the owner's
+    timeline and reset its tracked length. Return the deleted count.
+    """
+    entries = TimelineEntry.objects.filter(owner_id=owner_id)
+    max_length = settings.TIMELINE_MAX_LENGTH
+    # Newest entry to drop, found by the timeline index
+    cutoff = entries.order_by("-created_at", "-post_id").values_list(
+        "created_at", "post_id"
+    )[max_length : max_length + 1]
+    deleted = 0
+
+    for created_at, post_id in cutoff:
+        deleted, _ = entries.filter(
+            _before(created_at, post_id, "post_id__lte")
+        ).delete()
+    TimelineLength.objects.filter(owner_id=owner_id).update(length=entries.count())
+    return deleted
+
+
+def _timeline_keys(user, before):
+    """(created_at, post id) queries of fanned-out and pulled posts"""
+    entries = TimelineEntry.objects.filter(owner=user)
+    pulled = Post.objects.filter(user__in=popular_followed_users(user))
+
+    if before:
+        created_at, pk = before
+        entries = entries.filter(_before(created_at, pk, "post_id__lt"))
+        pulled = pulled.filter(_before(created_at, pk, "id__lt"))
+
+    return (
+        entries.order_by("-created_at", "-post_id").values_list(
+            "created_at", "post_id"
+        ),
+        pulled.order_by("-created_at", "-id").values_list("created_at", "id"),
+    )
+
+
+def _row_id(row):
+    return row["id"] if isinstance(row, dict) else row.pk
+
+
+def _in_order(keys, rows):
+    rows = {_row_id(row): row for row in rows}
+    return [rows[pk] for _, pk in keys if pk in rows]
+
+
+def read_timeline(user, limit, before=None, posts=None):
+    """
+    Return up to `limit` posts of the user's home timeline, newest first.
+    `before` is an optional (created_at, post id) position to continue from.
+    `posts` is the queryset the posts are read from; a values() queryset
+    including "id" gives dict rows.
+    """
+    if posts is None:
+        posts = Post.objects.select_related("user")
+
+    entries, pulled = _timeline_keys(user, before)
+    keys = sorted(set(entries[:limit]) | set(pulled[:limit]), reverse=True)[:limit]
+
+    return _in_order(keys, posts.filter(id__in=[pk for _, pk in keys]))
+
+
+async def _akeys(user, limit, before=None):
+    entries, pulled = _timeline_keys(user, before)
+    entries, pulled = await alist(entries[:limit]), await alist(pulled[:limit])
+    return sorted(set(entries) | set(pulled), reverse=True)[:limit]
+
+
+async def aread_timeline(user, limit, before=None, posts=None):
+    """Async variant of read_timeline"""
+    if posts is None:
+        posts = Post.objects.select_related("user")
+
+    keys = await _akeys(user, limit, before)
+
+    return _in_order(keys, await alist(posts.filter(id__in=[pk for _, pk in keys])))
+
+
+async def afirst_page_ids(user, limit):
+    """Ids of the posts on the first page of the timeline, newest first"""
+    return [pk for _, pk in await _akeys(user, limit)]
@@ -0,0 +1,30 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+
+def toggle(model, **fields):
+    """
+    Delete the row matching `fields`, or insert it if there was none.
+    Return the change of the row count: -1, 1, or 0 when a concurrent
+    request inserted the row first. Both steps are single statements
+    arbitrated by a unique constraint, so no row is locked in between.
+    """
+    deleted, _ = model.objects.filter(**fields).delete()
+
+    if deleted:
+        return -1
+    try:
+        with transaction.atomic():
+            model.objects.create(**fields)
+    except IntegrityError:
+        return 0
+    return 1
+
+
+def shifted(field, change):
+    """
+    Counter column moved by `change`, floored at zero: a counter that has
+    drifted below its row count would otherwise fail its unsigned CHECK
+    """
+    return Greatest(F(field) + change, 0)
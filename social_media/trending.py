@@ -0,0 +1,119 @@
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from social_media.models import (
+    Like,
+    Commentary,
+    TrendingScore,
+    TrendingLike,
+    TrendingState,
+)
+
+# Scores are logs of weights grown from this instant, so they never need rescaling
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+LIKE_WEIGHT = 1.0
+COMMENT_WEIGHT = 2.0
+
+
+def log_weight(moment, weight=1.0):
+    """Log of `weight` at `moment`, in the units of TrendingScore.score"""
+    decay = math.log(2) / settings.TRENDING_HALF_LIFE
+    return math.log(weight) + decay * (moment - EPOCH).total_seconds()
+
+
+def logaddexp(a, b):
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+def new_events(model, after, until, batch_size, *extra):
+    return list(
+        model.objects.filter(id__gt=after, created_at__lt=until)
+        .order_by("id")
+        .values_list("id", "post_id", "created_at", *extra)[:batch_size]
+    )
+
+
+def first_likes(likes):
+    """
+    The likes whose (user, post) pair was never folded in: unliking and
+    liking again inserts a new row, which must not count as a new event
+    """
+    folded = set(
+        TrendingLike.objects.filter(
+            trending__in={post_id for _, post_id, _, _ in likes},
+            user__in={user_id for _, _, _, user_id in likes},
+        ).values_list("trending", "user")
+    )
+    first = []
+
+    for like in likes:
+        pair = (like[1], like[3])
+        if pair not in folded:
+            folded.add(pair)
+            first.append(like)
+    return first
+
+
+def update_scores(batch_size):
+    """
+    Fold up to `batch_size` likes and comments created since the last run
+    into the trending scores and return how many were folded. Rows younger
+    than TRENDING_SETTLE_TIME are left for the next run, so transactions
+    still in flight don't commit behind the watermark.
+    """
+    now = timezone.now()
+    until = now - timedelta(seconds=settings.TRENDING_SETTLE_TIME)
+
+    with transaction.atomic():
+        state, _ = TrendingState.objects.select_for_update().get_or_create(pk=1)
+        likes = new_events(Like, state.last_like_id, until, batch_size, "user_id")
+        comments = new_events(Commentary, state.last_commentary_id, until, batch_size)
+        first = first_likes(likes)
+
+        deltas = {}
+        for events, weight in ((first, LIKE_WEIGHT), (comments, COMMENT_WEIGHT)):
+            for _, post_id, created_at, *_ in events:
+                deltas[post_id] = logaddexp(
+                    deltas.get(post_id), log_weight(created_at, weight)
+                )
+
+        current = TrendingScore.objects.filter(post_id__in=deltas).values_list(
+            "post_id", "score"
+        )
+        for post_id, score in current:
+            deltas[post_id] = logaddexp(score, deltas[post_id])
+
+        TrendingScore.objects.bulk_create(
+            [
+                TrendingScore(post_id=post_id, score=score)
+                for post_id, score in deltas.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["post"],
+            update_fields=["score"],
+        )
+        TrendingLike.objects.bulk_create(
+            [
+                TrendingLike(trending_id=post_id, user_id=user_id)
+                for _, post_id, _, user_id in first
+            ],
+            ignore_conflicts=True,
+        )
+        # Their likers go too: a faded post counts new likes afresh
+        TrendingScore.objects.filter(
+            score__lt=log_weight(now, settings.TRENDING_MIN_SCORE)
+        ).delete()
+
+        if likes:
+            state.last_like_id = likes[-1][0]
+        if comments:
+            state.last_commentary_id = comments[-1][0]
+        state.save()
+    return len(likes) + len(comments)
@@ -1,12 +1,69 @@
+from django.urls import path
 from rest_framework import routers
+from rest_framework.urlpatterns import format_suffix_patterns
 
-from social_media.views import ProfileViewSet, PostViewSet, CommentaryViewSet
+from social_media import async_views
+from social_media.views import (
+    ProfileViewSet,
+    PostViewSet,
+    CommentaryViewSet,
+    ScheduledPostViewSet,
+    RelationshipLookupView,
+)
 
 router = routers.DefaultRouter()
 router.register("profiles", ProfileViewSet)
 router.register("posts", PostViewSet)
 router.register("comments", CommentaryViewSet)
+router.register("scheduled-posts", ScheduledPostViewSet, basename="scheduled-post")
 
-urlpatterns = router.urls
+# Read-heavy endpoints served by async views, with their format suffixes;
+# they take precedence over the router, which serves every other route.
+# The viewsets' detail routes match the same <int:pk> ids, so their
+# retrieve actions only document the async detail reads and are never reached.
+urlpatterns = format_suffix_patterns(
+    [
+        path(
+            "profiles/<int:pk>/",
+            async_views.profile_detail,
+            name="profile-detail",
+        ),
+        path(
+            "profiles/<int:pk>/followers/",
+            async_views.ProfileFollowersView.as_view(),
+            name="profile-followers",
+        ),
+        path(
+            "profiles/<int:pk>/following/",
+            async_views.ProfileFollowingView.as_view(),
+            name="profile-following",
+        ),
+        path(
+            "posts/<int:pk>/",
+            async_views.post_detail,
+            name="post-detail",
+        ),
+        path(
+            "posts/<int:pk>/comments/",
+            async_views.PostCommentsView.as_view(),
+            name="post-comments",
+        ),
+        path(
+            "posts/my-posts/",
+            async_views.MyPostsView.as_view(),
+            name="post-my-posts",
+        ),
+        path(
+            "posts/following-posts/",
+            async_views.FollowingPostsView.as_view(),
+            name="post-following-posts",
+        ),
+    ]
+)
+urlpatterns += router.urls
+
+urlpatterns += [
+    path("relationships/", RelationshipLookupView.as_view(), name="relationships"),
+]
 
 app_name = "social_media"
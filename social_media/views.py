@@ -1,40 +1,116 @@
 from datetime import datetime
 
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-
-from social_media.tasks import create_post
-from social_media.models import Profile, Follow, Post, Like, Commentary
+from rest_framework.views import APIView
+
+from social_media import (
+    batch,
+    export,
+    images,
+    relationships,
+    response_cache,
+    search,
+    timeline,
+    toggles,
+)
+from social_media.tasks import (
+    fan_out_post,
+    backfill_timeline,
+    backfill_follower_timelines,
+    remove_from_timeline,
+    process_post_image,
+    process_profile_picture,
+    delete_images,
+)
+from social_media.models import (
+    Profile,
+    Follow,
+    Post,
+    Like,
+    Commentary,
+    ScheduledPost,
+    FollowSuggestions,
+)
+from social_media.pagination import KeysetPagination
 from social_media.permissions import IsOwnerOrReadOnly
 from social_media.serializers import (
     ProfileSerializer,
     ProfileListSerializer,
     ProfileDetailSerializer,
-    FollowProfileSerializer,
-    FollowingSerializer,
     PostSerializer,
     PostListSerializer,
     PostDetailSerializer,
     CommentaryPostSerializer,
     CommentarySerializer,
+    BatchLikeSerializer,
+    BatchFollowSerializer,
+    ScheduledPostSerializer,
+    RescheduleSerializer,
+    RelationshipLookupSerializer,
+    ValuesSerializer,
 )
 
 
-class ProfileViewSet(viewsets.ModelViewSet):
-    queryset = Profile.objects.select_related("user").prefetch_related("followers")
+# List pages serialized from values() rows instead of model instances
+class ValuesListMixin:
+    def values_response(self, serializer, queryset):
+        keys = self.paginator.get_keys(self)
+        page = self.paginate_queryset(serializer.values(queryset, *keys))
+        return self.get_paginated_response(serializer.serialize(page))
+
+    def list(self, request, *args, **kwargs):
+        serializer = ValuesSerializer(
+            self.get_serializer_class(), self.get_serializer_context()
+        )
+        return self.values_response(
+            serializer, self.filter_queryset(self.get_queryset())
+        )
+
+
+class ProfileViewSet(ValuesListMixin, viewsets.ModelViewSet):
+    queryset = Profile.objects.select_related("user")
     serializer_class = ProfileSerializer
     permission_classes = (IsAuthenticated, IsOwnerOrReadOnly)
+    lookup_value_regex = "[0-9]+"
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        profile = serializer.save(user=self.request.user)
+        self.process_picture(profile)
+
+    def perform_update(self, serializer):
+        if "profile_picture" in serializer.validated_data:
+            replaced = images.stored_names(serializer.instance, "profile_picture")
+            profile = serializer.save(profile_picture_variants={})
+            self.process_picture(profile)
+            transaction.on_commit(lambda: delete_images.delay(replaced))
+        else:
+            profile = serializer.save()
+        response_cache.bump_version("profile", profile.pk)
+
+    @staticmethod
+    def process_picture(profile):
+        if profile.profile_picture:
+            name = profile.profile_picture.name
+            transaction.on_commit(
+                lambda: process_profile_picture.delay(profile.pk, name)
+            )
+
+    def perform_destroy(self, instance):
+        response_cache.bump_version("profile", instance.pk)
+        instance.delete()
 
     def get_queryset(self):
-        """Retrieve the profiles with filters"""
+        """Retrieve the profiles with filters, trigram-indexed on PostgreSQL"""
         queryset = self.queryset
 
         bio = self.request.query_params.get("bio")
@@ -49,7 +125,8 @@ class ProfileViewSet(viewsets.ModelViewSet):
 
         if user_email:
             queryset = queryset.filter(user__email__icontains=user_email)
-        return queryset.distinct()
+
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -96,74 +173,168 @@ class ProfileViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        follow_instance, created = Follow.objects.get_or_create(
-            user=follower, following=profile
-        )
+        with transaction.atomic():
+            change = toggles.toggle(Follow, user=follower, following=profile)
 
-        if not created:
-            follow_instance.delete()
+            if change:
+                Profile.objects.filter(pk=profile.pk).update(
+                    followers_count=toggles.shifted("followers_count", change)
+                )
+                response_cache.bump_version("profile", profile.pk)
+                relationships.invalidate(relationships.FOLLOWS, follower.id)
+
+        if change < 0:
+            transaction.on_commit(
+                lambda: remove_from_timeline.delay(follower.id, profile.user_id)
+            )
+            if timeline.crosses_fanout_limit(profile.followers_count, 1):
+                transaction.on_commit(
+                    lambda: backfill_follower_timelines.delay(profile.user_id)
+                )
             return Response(
                 {"detail": "Successfully unfollowed the profile."},
                 status=status.HTTP_200_OK,
             )
 
+        if change:
+            transaction.on_commit(
+                lambda: backfill_timeline.delay(follower.id, profile.user_id)
+            )
         return Response(
             {"detail": "Successfully followed the profile."},
             status=status.HTTP_201_CREATED,
         )
 
+    @extend_schema(request=BatchFollowSerializer)
     @action(
-        detail=True,
-        methods=["GET"],
-        url_path="followers",
+        detail=False,
+        methods=["POST"],
+        url_path="batch-follow",
         permission_classes=[IsAuthenticated],
     )
-    def followers(self, request, pk=None):
-        profile = self.get_object()
+    def batch_follow(self, request):
+        serializer = BatchFollowSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-        followers = Follow.objects.filter(following__user=profile.user).select_related(
-            "user", "following"
+        results = batch.apply_follows(
+            request.user, serializer.validated_data["operations"]
         )
-        serializer = FollowProfileSerializer(followers, many=True)
+        return Response({"results": results}, status=status.HTTP_200_OK)
 
-        return Response(serializer.data)
+    @extend_schema(responses=ProfileListSerializer(many=True))
+    @action(
+        detail=False,
+        methods=["GET"],
+        url_path="suggestions",
+        permission_classes=[IsAuthenticated],
+    )
+    def suggestions(self, request):
+        """Profiles followed by the people you follow, most shared first"""
+        profile_ids = (
+            FollowSuggestions.objects.filter(user=request.user)
+            .values_list("profile_ids", flat=True)
+            .first()
+        ) or []
+        rank = {profile_id: index for index, profile_id in enumerate(profile_ids)}
+
+        serializer = ValuesSerializer(
+            ProfileListSerializer, self.get_serializer_context()
+        )
+        profiles = serializer.values(
+            Profile.objects.filter(id__in=profile_ids).exclude(
+                follows__user=request.user
+            ),
+            "id",
+        )
+        return Response(
+            serializer.serialize(sorted(profiles, key=lambda row: rank[row["id"]]))
+        )
 
+    @extend_schema(responses={(200, "application/x-ndjson"): OpenApiTypes.STR})
     @action(
         detail=True,
         methods=["GET"],
-        url_path="following",
+        url_path="followers/export",
         permission_classes=[IsAuthenticated],
+        renderer_classes=[export.NDJSONRenderer, JSONRenderer],
     )
-    def following(self, request, pk=None):
-        profile = self.get_object()
-
-        following_profiles = Follow.objects.filter(user=profile.user).select_related(
-            "user", "following"
-        )
-        serializer = FollowingSerializer(following_profiles, many=True)
+    def export_followers(self, request, pk=None):
+        """Stream all followers of the profile as NDJSON"""
+        return export.followers(request, self.get_object())
 
-        return Response(serializer.data)
+    @extend_schema(responses={(200, "application/x-ndjson"): OpenApiTypes.STR})
+    @action(
+        detail=True,
+        methods=["GET"],
+        url_path="following/export",
+        permission_classes=[IsAuthenticated],
+        renderer_classes=[export.NDJSONRenderer, JSONRenderer],
+    )
+    def export_following(self, request, pk=None):
+        """Stream all profiles followed by the profile owner as NDJSON"""
+        return export.following(request, self.get_object())
 
 
-class PostViewSet(viewsets.ModelViewSet):
-    queryset = Post.objects.prefetch_related(
-        "likes__user", "commentaries__user"
-    ).select_related("user")
+class PostViewSet(ValuesListMixin, viewsets.ModelViewSet):
+    queryset = Post.objects.select_related("user")
     serializer_class = PostSerializer
     permission_classes = (IsAuthenticated, IsOwnerOrReadOnly)
+    lookup_value_regex = "[0-9]+"
+
+    @property
+    def keyset_ordering(self):
+        if self.action == "list" and self.request.query_params.get("q"):
+            return ("-rank", "-id")
+        if self.action == "trending":
+            return ("-trending__score", "-trending__post")
+        return KeysetPagination.ordering
+
+    def get_serializer_context(self):
+        return {
+            **super().get_serializer_context(),
+            "relationships": relationships.Relationships(self.request.user.id),
+        }
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        post = serializer.save(user=self.request.user)
+        search.index_post(post)
+        self.process_image(post)
+        transaction.on_commit(lambda: fan_out_post.delay(post.id))
+
+    def perform_update(self, serializer):
+        if "image" in serializer.validated_data:
+            replaced = images.stored_names(serializer.instance, "image")
+            post = serializer.save(image_variants={})
+            self.process_image(post)
+            transaction.on_commit(lambda: delete_images.delay(replaced))
+        else:
+            post = serializer.save()
+        search.index_post(post)
+        response_cache.bump_version("post", post.pk)
+
+    @staticmethod
+    def process_image(post):
+        if post.image:
+            name = post.image.name
+            transaction.on_commit(lambda: process_post_image.delay(post.pk, name))
+
+    def perform_destroy(self, instance):
+        response_cache.bump_version("post", instance.pk)
+        instance.delete()
 
     def get_queryset(self):
         """Retrieve the posts with filters"""
         queryset = self.queryset
 
+        query = self.request.query_params.get("q")
         owner = self.request.query_params.get("owner")
         title = self.request.query_params.get("title")
         created_at = self.request.query_params.get("created_at")
         content = self.request.query_params.get("user_email")
 
+        if query:
+            queryset = search.search_posts(queryset, query)
+
         if owner:
             queryset = queryset.filter(owner__icontains=owner)
 
@@ -175,6 +346,7 @@ class PostViewSet(viewsets.ModelViewSet):
 
         if content:
             queryset = queryset.filter(content__icontains=content)
+
         return queryset.distinct()
 
     def get_serializer_class(self):
@@ -186,6 +358,12 @@ class PostViewSet(viewsets.ModelViewSet):
 
     @extend_schema(
         parameters=[
+            OpenApiParameter(
+                "q",
+                type=OpenApiTypes.STR,
+                description="Full-text search in post title and content, "
+                "ordered by relevance (ex. ?q=war peace)",
+            ),
             OpenApiParameter(
                 "title",
                 type=OpenApiTypes.STR,
@@ -211,38 +389,44 @@ class PostViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(responses={(200, "application/x-ndjson"): OpenApiTypes.STR})
     @action(
         detail=False,
         methods=["GET"],
-        url_path="my-posts",
+        url_path="my-posts/export",
         permission_classes=[IsAuthenticated],
+        renderer_classes=[export.NDJSONRenderer, JSONRenderer],
     )
-    def my_posts(self, request):
-        user = request.user
+    def export_my_posts(self, request):
+        """Stream all posts of the current user as NDJSON"""
+        return export.posts(request, request.user)
 
-        posts = Post.objects.filter(user=user)
-        serializer = PostListSerializer(posts, many=True)
-
-        return Response(serializer.data)
+    @extend_schema(responses={(200, "application/x-ndjson"): OpenApiTypes.STR})
+    @action(
+        detail=False,
+        methods=["GET"],
+        url_path="my-likes/export",
+        permission_classes=[IsAuthenticated],
+        renderer_classes=[export.NDJSONRenderer, JSONRenderer],
+    )
+    def export_my_likes(self, request):
+        """Stream all likes of the current user as NDJSON"""
+        return export.likes(request, request.user)
 
     @action(
         detail=False,
         methods=["GET"],
-        url_path="following-posts",
+        url_path="trending",
         permission_classes=[IsAuthenticated],
     )
-    def following_posts(self, request):
-        user = request.user
+    def trending(self, request):
+        """Posts ranked by recent, time-decayed likes and comments"""
+        posts = Post.objects.filter(trending__isnull=False)
 
-        following_users = Follow.objects.filter(user=user).values_list(
-            "following__user", flat=True
+        return self.values_response(
+            ValuesSerializer(PostListSerializer, self.get_serializer_context()), posts
         )
 
-        posts = Post.objects.filter(user__in=following_users)
-        serializer = PostListSerializer(posts, many=True)
-
-        return Response(serializer.data)
-
     @action(
         detail=True,
         methods=["POST"],
@@ -253,10 +437,17 @@ class PostViewSet(viewsets.ModelViewSet):
         post = self.get_object()
         user = request.user
 
-        like_instance, created = Like.objects.get_or_create(user=user, post=post)
+        with transaction.atomic():
+            change = toggles.toggle(Like, user=user, post=post)
+
+            if change:
+                Post.objects.filter(pk=post.pk).update(
+                    likes_count=toggles.shifted("likes_count", change)
+                )
+                response_cache.bump_version("post", post.pk)
+                relationships.invalidate(relationships.LIKES, user.id)
 
-        if not created:
-            like_instance.delete()
+        if change < 0:
             return Response(
                 {"detail": "Successfully unliked the post."}, status=status.HTTP_200_OK
             )
@@ -265,6 +456,22 @@ class PostViewSet(viewsets.ModelViewSet):
             {"detail": "Successfully liked the post."}, status=status.HTTP_201_CREATED
         )
 
+    @extend_schema(request=BatchLikeSerializer)
+    @action(
+        detail=False,
+        methods=["POST"],
+        url_path="batch-like",
+        permission_classes=[IsAuthenticated],
+    )
+    def batch_like(self, request):
+        serializer = BatchLikeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = batch.apply_likes(
+            request.user, serializer.validated_data["operations"]
+        )
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
     @action(
         detail=True,
         methods=["POST"],
@@ -279,9 +486,16 @@ class PostViewSet(viewsets.ModelViewSet):
         serializer = CommentaryPostSerializer(data=data)
         serializer.is_valid(raise_exception=True)
 
-        Commentary.objects.create(
-            user=request.user, post=post, content=serializer.validated_data["content"]
-        )
+        with transaction.atomic():
+            Commentary.objects.create(
+                user=request.user,
+                post=post,
+                content=serializer.validated_data["content"],
+            )
+            Post.objects.filter(pk=post.pk).update(
+                comments_count=F("comments_count") + 1
+            )
+            response_cache.bump_version("post", post.pk)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @action(
@@ -306,31 +520,66 @@ class PostViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        create_post.apply_async(
-            args=[
-                serializer.validated_data.get("user"),
-                serializer.validated_data.get("title"),
-                serializer.validated_data.get("content"),
-                scheduled_time,
-            ],
-            eta=scheduled_time,
+        scheduled_post = ScheduledPost.objects.create(
+            user=request.user,
+            title=serializer.validated_data.get("title"),
+            content=serializer.validated_data.get("content"),
+            publish_at=scheduled_time,
         )
 
         return Response(
             {
-                "message": f'Post "{serializer.validated_data.get("title")}" scheduled for {scheduled_time}'
+                "id": scheduled_post.id,
+                "message": f'Post "{serializer.validated_data.get("title")}" scheduled for {scheduled_time}',
             },
             status=status.HTTP_200_OK,
         )
 
 
+class ScheduledPostViewSet(
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    serializer_class = ScheduledPostSerializer
+    permission_classes = (IsAuthenticated,)
+    keyset_ordering = ("publish_at", "id")
+
+    def get_queryset(self):
+        """Retrieve the pending scheduled posts of the current user"""
+        return ScheduledPost.objects.filter(user=self.request.user)
+
+    @action(detail=True, methods=["POST"], url_path="cancel")
+    def cancel(self, request, pk=None):
+        """Cancel a scheduled post unless it is already being published"""
+        deleted, _ = self.get_queryset().filter(pk=pk).delete()
+
+        if not deleted:
+            raise NotFound
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @extend_schema(request=RescheduleSerializer)
+    @action(detail=True, methods=["POST"], url_path="reschedule")
+    def reschedule(self, request, pk=None):
+        serializer = RescheduleSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        if not self.get_queryset().filter(pk=pk).update(**serializer.validated_data):
+            raise NotFound
+        return Response(
+            ScheduledPostSerializer(self.get_queryset().get(pk=pk)).data,
+            status=status.HTTP_200_OK,
+        )
+
+
 class CommentaryViewSet(
+    ValuesListMixin,
     mixins.ListModelMixin,
     mixins.DestroyModelMixin,
     mixins.RetrieveModelMixin,
     viewsets.GenericViewSet,
 ):
-    queryset = Commentary.objects.select_related("user", "post")
+    queryset = Commentary.objects.select_related("user")
     serializer_class = CommentarySerializer
     permission_classes = (IsAuthenticated, IsOwnerOrReadOnly)
 
@@ -338,3 +587,58 @@ class CommentaryViewSet(
         if self.action in ("list", "retrieve"):
             return CommentaryPostSerializer
         return self.serializer_class
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        deleted, _ = instance.delete()
+
+        # A concurrent delete of the same comment already moved the counter
+        if deleted:
+            Post.objects.filter(pk=instance.post_id).update(
+                comments_count=toggles.shifted("comments_count", -1)
+            )
+            response_cache.bump_version("post", instance.post_id)
+
+
+class RelationshipLookupView(APIView):
+    """Whether the current user likes the given posts and follows the given profiles"""
+
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "posts",
+                type={"type": "array", "items": {"type": "integer"}},
+                description="Post ids, repeated (ex. ?posts=1&posts=2)",
+            ),
+            OpenApiParameter(
+                "profiles",
+                type={"type": "array", "items": {"type": "integer"}},
+                description="Profile ids, repeated (ex. ?profiles=1&profiles=2)",
+            ),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    def get(self, request):
+        serializer = RelationshipLookupSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        user = relationships.Relationships(request.user.id)
+        post_ids = dict.fromkeys(serializer.validated_data.get("posts", ()))
+        profile_ids = dict.fromkeys(serializer.validated_data.get("profiles", ()))
+
+        return Response(
+            {
+                "posts": [
+                    {"id": post_id, "is_liked": post_id in user.liked_post_ids}
+                    for post_id in post_ids
+                ],
+                "profiles": [
+                    {
+                        "id": profile_id,
+                        "is_following": profile_id in user.followed_profiles,
+                    }
+                    for profile_id in profile_ids
+                ],
+            }
+        )
@@ -0,0 +1,43 @@
+from django.core import signing
+from django.utils.translation import gettext as _
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from users import tokens
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    Authenticate "Bearer <access token>" headers from the signature alone,
+    without a database query. request.auth holds the token claims.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            msg = _("Invalid token header.")
+            raise exceptions.AuthenticationFailed(msg)
+
+        try:
+            claims = tokens.verify(tokens.ACCESS, auth[1].decode())
+        except (signing.BadSignature, UnicodeError):
+            msg = _("Invalid or expired token.")
+            raise exceptions.AuthenticationFailed(msg)
+        return tokens.user_from_claims(claims), claims
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+class SignedTokenScheme(OpenApiAuthenticationExtension):
+    target_class = "users.authentication.SignedTokenAuthentication"
+    name = "signedTokenAuth"
+
+    def get_security_definition(self, auto_schema):
+        return {"type": "http", "scheme": "bearer"}
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.1 on 2026-10-18 18:02
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+def create_email_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX users_user_email_trgm ON users_user "
+            "USING gin ((UPPER(email::text)) gin_trgm_ops)"
+        )
+
+
+def drop_email_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS users_user_email_trgm")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_email_trigram_index, drop_email_trigram_index),
+    ]
@@ -1,7 +1,10 @@
 from django.contrib.auth import get_user_model, authenticate
+from django.core import signing
 from rest_framework import serializers, exceptions
 from django.utils.translation import gettext as _
 
+from users import tokens
+
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -38,3 +41,15 @@ class AuthTokenSerializer(serializers.Serializer):
 
         data["user"] = user
         return data
+
+
+class RefreshTokenSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
+
+    def validate(self, data):
+        try:
+            data["tokens"] = tokens.refresh(data["refresh"])
+        except signing.BadSignature:
+            msg = _("Invalid or expired refresh token.")
+            raise exceptions.ValidationError(msg)
+        return data
@@ -1,3 +1,141 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from social_media.models import Post
+from users import tokens
+
+TOKEN_URL = reverse("users:token")
+REFRESH_URL = reverse("users:token-refresh")
+LOGOUT_URL = reverse("users:logout")
+MY_POSTS_URL = reverse("social_media:post-my-posts")
+
+
+class SignedTokenTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+
+    def login(self):
+        response = self.client.post(
+            TOKEN_URL, {"email": "test@user.com", "password": "testpassword"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def bearer(self, token):
+        return {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def test_login_returns_both_kinds_of_token(self):
+        data = self.login()
+
+        self.assertEqual(set(data), {"token", "access", "refresh"})
+        response = self.client.get(
+            MY_POSTS_URL, HTTP_AUTHORIZATION=f"Token {data['token']}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_access_token_needs_no_query(self):
+        access = self.login()["access"]
+        # Warm the cached likes and follows of the user
+        self.client.get(MY_POSTS_URL, **self.bearer(access))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(MY_POSTS_URL, **self.bearer(access))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_tampered_and_refresh_tokens_are_rejected(self):
+        data = self.login()
+
+        for token in (data["access"][:-1] + "x", data["refresh"]):
+            response = self.client.get(MY_POSTS_URL, **self.bearer(token))
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tokens_do_not_expose_the_email_or_password_hash(self):
+        data = self.login()
+        access = tokens.verify(tokens.ACCESS, data["access"])
+        refresh = tokens.verify(tokens.REFRESH, data["refresh"])
+
+        self.assertNotIn("email", access)
+        self.assertNotIn("password", refresh)
+        self.assertNotIn(self.user.get_session_auth_hash(), data["refresh"])
+        self.assertEqual(tokens.user_from_claims(access).email, "test@user.com")
+
+    def test_expired_access_token_is_refreshed(self):
+        data = self.login()
+
+        with override_settings(ACCESS_TOKEN_LIFETIME=-1):
+            expired = self.client.post(REFRESH_URL, {"refresh": data["refresh"]})
+        response = self.client.get(MY_POSTS_URL, **self.bearer(expired.data["access"]))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        refreshed = self.client.post(REFRESH_URL, {"refresh": data["refresh"]})
+        response = self.client.get(
+            MY_POSTS_URL, **self.bearer(refreshed.data["access"])
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        invalid = self.client.post(REFRESH_URL, {"refresh": data["access"]})
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_refresh_reads_the_current_user(self):
+        data = self.login()
+        self.user.is_staff = True
+        self.user.save()
+
+        refreshed = self.client.post(REFRESH_URL, {"refresh": data["refresh"]})
+        self.assertTrue(tokens.verify(tokens.ACCESS, refreshed.data["access"])["staff"])
+
+        self.user.set_password("newpassword")
+        self.user.save()
+        refreshed = self.client.post(REFRESH_URL, {"refresh": data["refresh"]})
+        self.assertEqual(refreshed.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.user.set_password("testpassword")
+        self.user.save()
+        data = self.login()
+        self.user.is_active = False
+        self.user.save()
+        refreshed = self.client.post(REFRESH_URL, {"refresh": data["refresh"]})
+        self.assertEqual(refreshed.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.user.delete()
+        refreshed = self.client.post(REFRESH_URL, {"refresh": data["refresh"]})
+        self.assertEqual(refreshed.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_logout_revokes_the_session(self):
+        data = self.login()
+        other = self.login()
+
+        response = self.client.get(LOGOUT_URL, **self.bearer(data["access"]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(MY_POSTS_URL, **self.bearer(data["access"]))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        refreshed = self.client.post(REFRESH_URL, {"refresh": data["refresh"]})
+        self.assertEqual(refreshed.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(MY_POSTS_URL, **self.bearer(other["access"]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_signed_token_user_owns_created_posts(self):
+        access = self.login()["access"]
+
+        with mock.patch(
+            "social_media.views.fan_out_post.delay"
+        ), self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("social_media:post-list"),
+                {"title": "Title", "content": "Text"},
+                **self.bearer(access),
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Post.objects.get().user, self.user)
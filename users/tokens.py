@@ -0,0 +1,114 @@
+import hashlib
+import secrets
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+
+ACCESS = "access"
+REFRESH = "refresh"
+
+
+def _salt(kind):
+    return f"users.tokens.{kind}"
+
+
+def _revoked_key(session):
+    return f"token-session:{session}:revoked"
+
+
+def _lifetime(kind):
+    if kind == ACCESS:
+        return settings.ACCESS_TOKEN_LIFETIME
+    return settings.REFRESH_TOKEN_LIFETIME
+
+
+def _sign(kind, claims):
+    claims = {**claims, "exp": int(time.time()) + _lifetime(kind)}
+    return signing.dumps(claims, salt=_salt(kind))
+
+
+def _claims(user, session):
+    return {
+        "user": user.pk,
+        "staff": user.is_staff,
+        "session": session,
+    }
+
+
+def _session_version(user):
+    """Short digest of the session hash: the claims are signed, not encrypted"""
+    return hashlib.blake2b(
+        user.get_session_auth_hash().encode(), digest_size=8
+    ).hexdigest()
+
+
+def issue(user):
+    """
+    Return a short-lived access token and a refresh token for the user.
+    Both carry the same session id, which is what logout revokes.
+    The refresh token also carries a digest of the password hash, so
+    changing the password ends the session.
+    """
+    claims = _claims(user, secrets.token_urlsafe(12))
+    return {
+        ACCESS: _sign(ACCESS, claims),
+        REFRESH: _sign(REFRESH, {**claims, "sv": _session_version(user)}),
+    }
+
+
+def refresh(token):
+    """
+    Return a new access token for a valid refresh token, with the claims
+    read again from the user row. Raise signing.BadSignature if the user
+    is gone, inactive or changed their password since the login.
+    """
+    claims = verify(REFRESH, token)
+    user = get_user_model().objects.filter(pk=claims["user"], is_active=True).first()
+
+    if user is None or not constant_time_compare(
+        claims.get("sv", ""), _session_version(user)
+    ):
+        raise signing.BadSignature("User changed since the login")
+    return {ACCESS: _sign(ACCESS, _claims(user, claims["session"]))}
+
+
+def verify(kind, token):
+    """
+    Return the claims of a token, checked with the HMAC signature, the
+    expiry and the deny-list only. Raise signing.BadSignature otherwise.
+    """
+    claims = signing.loads(token, salt=_salt(kind))
+
+    if claims["exp"] < time.time():
+        raise signing.SignatureExpired("Token expired")
+    if cache.get(_revoked_key(claims["session"])):
+        raise signing.BadSignature("Token revoked")
+    return claims
+
+
+def revoke(claims):
+    """Deny the session until its last refresh token expires"""
+    cache.set(
+        _revoked_key(claims["session"]), True, timeout=settings.REFRESH_TOKEN_LIFETIME
+    )
+
+
+def user_from_claims(claims):
+    """
+    The user the claims stand for, enough for ownership checks.
+    Its other fields, such as the email, are deferred and loaded on access.
+    """
+    model = get_user_model()
+    known = {
+        model._meta.pk.attname: claims["user"],
+        "is_staff": claims["staff"],
+        "is_active": True,
+    }
+    field_names = [
+        field.attname for field in model._meta.concrete_fields if field.attname in known
+    ]
+    return model.from_db(None, field_names, [known[name] for name in field_names])
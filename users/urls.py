@@ -1,9 +1,15 @@
 from django.urls import path
-from users.views import CreateTokenView, CreateUserView, LogoutView
+from users.views import (
+    CreateTokenView,
+    CreateUserView,
+    LogoutView,
+    RefreshTokenView,
+)
 
 urlpatterns = [
     path("register/", CreateUserView.as_view(), name="register"),
     path("login/", CreateTokenView.as_view(), name="token"),
+    path("token/refresh/", RefreshTokenView.as_view(), name="token-refresh"),
     path("logout/", LogoutView.as_view(), name="logout"),
 ]
 
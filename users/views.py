@@ -1,10 +1,16 @@
 from rest_framework import generics, status
+from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 
-from users.serializers import UserSerializer, AuthTokenSerializer
+from users import tokens
+from users.serializers import (
+    UserSerializer,
+    AuthTokenSerializer,
+    RefreshTokenSerializer,
+)
 
 
 class CreateUserView(generics.CreateAPIView):
@@ -15,11 +21,32 @@ class CreateTokenView(ObtainAuthToken):
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
     serializer_class = AuthTokenSerializer
 
+    def post(self, request, *args, **kwargs):
+        """Return the stored token along with a signed access/refresh pair"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.validated_data["user"]
+        token, created = Token.objects.get_or_create(user=user)
+        return Response({"token": token.key, **tokens.issue(user)})
+
+
+class RefreshTokenView(generics.GenericAPIView):
+    serializer_class = RefreshTokenSerializer
+    authentication_classes = ()
+
+    def post(self, request, format=None):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.validated_data["tokens"])
+
 
 class LogoutView(generics.GenericAPIView):
     permission_classes = (IsAuthenticated,)
     serializer_class = UserSerializer
 
     def get(self, request, format=None):
-        request.user.auth_token.delete()
+        if isinstance(request.auth, dict):
+            tokens.revoke(request.auth)
+        else:
+            request.user.auth_token.delete()
         return Response(status=status.HTTP_200_OK)